@@ -45,7 +45,113 @@ NuageVsdGroup = [
                help='nuage vsd organization name'),
     cfg.StrOpt('nuage_cms_id', default=None,
                help=('ID of a Cloud Management System on the VSD which '
-                     'identifies this OpenStack instance'))
+                     'identifies this OpenStack instance')),
+    cfg.IntOpt('nuage_vsd_conn_pool_size',
+               default=4,
+               help='Maximum number of idle keep-alive connections kept '
+                    'per VSD server'),
+    cfg.IntOpt('nuage_vsd_conn_pool_idle_timeout',
+               default=30,
+               help='Seconds after which an idle keep-alive connection to '
+                    'the VSD is dropped rather than reused'),
+    cfg.FloatOpt('nuage_vsd_retry_base_delay',
+                 default=0.5,
+                 help='Base delay in seconds of the exponential backoff '
+                      'applied when the VSD is unavailable'),
+    cfg.FloatOpt('nuage_vsd_retry_max_delay',
+                 default=8,
+                 help='Upper bound in seconds of a single backoff delay'),
+    cfg.FloatOpt('nuage_vsd_request_deadline',
+                 default=60,
+                 help='Maximum time in seconds spent on a single VSD request '
+                      'including retries; 0 means no deadline'),
+    cfg.IntOpt('nuage_vsd_async_concurrency',
+               default=16,
+               help='Maximum number of VSD requests AsyncNuageRestClient '
+                    'has in flight at once'),
+    cfg.StrOpt('nuage_vsd_api_key_cache_file',
+               default='',
+               help='File through which concurrent test workers share VSD '
+                    'API keys, so that they log in once, e.g. '
+                    'vsd_api_keys.json. A relative path is taken in a '
+                    'directory of the temporary directory only the user '
+                    'running the tests can access. The file is only read '
+                    'when owned by that user and not accessible to others. '
+                    'Empty only shares keys within a process'),
+    cfg.IntOpt('nuage_vsd_api_key_refresh_margin',
+               default=300,
+               help='Seconds before its expiry at which a VSD API key is '
+                    'renewed'),
+    cfg.IntOpt('nuage_vsd_log_body_maxlen',
+               default=5000,
+               help='Number of characters of a VSD request or response body '
+                    'included in the debug log'),
+    cfg.IntOpt('nuage_vsd_log_large_body_sample_rate',
+               default=10,
+               help='Only 1 out of that many VSD response bodies exceeding '
+                    'nuage_vsd_log_body_maxlen is logged; 1 logs them all'),
+    cfg.StrOpt('nuage_vsd_cassette_mode',
+               default='off',
+               choices=['off', 'record', 'replay'],
+               help='Record all VSD REST traffic to nuage_vsd_cassette, or '
+                    'replay it from there without contacting the VSD'),
+    cfg.StrOpt('nuage_vsd_cassette',
+               default='vsd_cassette.json.gz',
+               help='Cassette file used by nuage_vsd_cassette_mode. When '
+                    'recording, run a single test worker as the file is '
+                    'written by one process'),
+    cfg.IntOpt('nuage_vsd_bulk_chunk_size',
+               default=100,
+               help='Maximum number of objects sent to the VSD in a single '
+                    'bulk create, update or delete request'),
+    cfg.StrOpt('nuage_vsd_metrics_dir',
+               default='',
+               help='Directory in which the call counts and latencies of VSD '
+                    'requests per resource are written as JSON, at the end '
+                    'of each test class and of each test worker; empty '
+                    'disables the dumps'),
+    cfg.BoolOpt('nuage_vsd_get_cache',
+                default=False,
+                help='Serve repeated VSD GETs made through NuageRestClient '
+                     'from a cache, which writes through NuageRestClient '
+                     'invalidate. Objects which Neutron changes on the VSD '
+                     'may be seen stale for up to their TTL'),
+    cfg.IntOpt('nuage_vsd_get_cache_max_bytes',
+               default=64 * 1024 * 1024,
+               help='Size bound of the VSD GET cache'),
+    cfg.IntOpt('nuage_vsd_get_cache_ttl',
+               default=5,
+               help='Seconds a cached VSD GET response stays valid, unless '
+                    'set otherwise for its resource type'),
+    cfg.DictOpt('nuage_vsd_get_cache_ttls',
+                default={'enterprises': '300',
+                         'domaintemplates': '60',
+                         'l2domaintemplates': '60',
+                         'zonetemplates': '60',
+                         'domains': '30',
+                         'l2domains': '30',
+                         'zones': '30'},
+                help='Cached VSD GET response TTL in seconds per resource '
+                     'type, 0 disables caching of that type'),
+    cfg.IntOpt('nuage_vsd_filter_max_len',
+               default=4000,
+               help='Longest X-Nuage-Filter header sent to the VSD; batched '
+                    'lookups are split into as many requests as needed'),
+    cfg.BoolOpt('nuage_vsd_push_notifications',
+                default=False,
+                help='Listen on the VSD push notification channel, so that '
+                     'waits on VSD state end as soon as it holds. The '
+                     'listener holds a long poll connection and a thread per '
+                     'worker, from the first such wait on.'),
+    cfg.FloatOpt('nuage_vsd_wait_poll_interval',
+                 default=1.0,
+                 help='Seconds between checks of a waited for VSD state, '
+                      'in absence of push notifications'),
+    cfg.IntOpt('nuage_vsd_ancestor_cache_size',
+               default=10000,
+               help='Number of VSD objects whose place in the object tree '
+                    'is remembered, so that their ancestors can be found '
+                    'without VSD requests; 0 disables this'),
 ]
 
 nuage_sut_group = cfg.OptGroup(name='nuage_sut',
@@ -89,4 +195,13 @@ NuageSutGroup = [
                 help='Set to true to enable driver to complete port '
                      'binding on a flat network, when corresponding'
                      'GW port has vlan 0 provisioned by external entity'),
+    cfg.IntOpt('server_ready_timeout',
+               default=120,
+               help='Seconds to wait for a booted server to answer over SSH '
+                    'or to show a console marker; the test goes on anyhow '
+                    'after that, leaving it to SSH access to find out'),
+    cfg.ListOpt('server_ready_console_markers',
+                default=[r'login:\s*$', r'Cloud-init v\. \S+ finished'],
+                help='Regular expressions of which any found in the '
+                     'console log of a server tells it is ready'),
 ]
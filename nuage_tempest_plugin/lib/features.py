@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 from nuage_tempest_plugin.lib.topology import Topology
 
 CONF = Topology.get_conf()
@@ -97,4 +99,22 @@ class NuageFeatures(object):
         self._log_features()
 
 
-NUAGE_FEATURES = NuageFeatures()
+class LazyNuageFeatures(object):
+    """NuageFeatures, only computed (and logged) when first consulted
+
+    So that merely importing a test module doesn't.
+    """
+
+    def __init__(self):
+        self._features = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._features is None:
+            with self._lock:
+                if self._features is None:
+                    self._features = NuageFeatures()
+        return getattr(self._features, name)
+
+
+NUAGE_FEATURES = LazyNuageFeatures()
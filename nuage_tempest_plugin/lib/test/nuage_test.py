@@ -1,6 +1,8 @@
 # Copyright 2017 Alcatel-Lucent
 # All Rights Reserved.
 
+import collections
+from concurrent import futures
 import copy
 import functools
 import inspect
@@ -9,6 +11,7 @@ from six import iteritems
 import socket
 import subprocess
 import testtools
+import threading
 import time
 import yaml
 
@@ -29,17 +32,36 @@ from tempest.services import orchestration
 from testtools.matchers import ContainsDict
 from testtools.matchers import Equals
 
+from nuage_tempest_plugin.lib.test import server_waiters
 from nuage_tempest_plugin.lib.test import tags as test_tags
 from nuage_tempest_plugin.lib.test.tenant_server import TenantServer
 from nuage_tempest_plugin.lib.test import vsd_helper
 from nuage_tempest_plugin.lib.topology import Topology
+from nuage_tempest_plugin.lib.utils import connectivity_matrix
 from nuage_tempest_plugin.lib.utils import data_utils as utils
+from nuage_tempest_plugin.lib.utils import readiness
+from nuage_tempest_plugin.lib.utils import request_logging
+from nuage_tempest_plugin.lib.utils import shared_resource
+from nuage_tempest_plugin.lib.utils import vsd_metrics
 from nuage_tempest_plugin.services.nuage_network_client \
     import NuageNetworkClientJSON
 
 CONF = Topology.get_conf()
 LOG = Topology.get_logger(__name__)
 
+# shared by all tests of the process, for its readiness time statistics
+server_readiness = readiness.ReadinessProber(
+    Topology.server_ready_console_markers, Topology.server_ready_timeout)
+vsd_metrics.register_counters('server_readiness', server_readiness.stats)
+
+# the rules tempest makes a security group loginable with, each of them being
+# added in both directions
+LOGINABLE_SECURITY_GROUP_RULES = [
+    dict(protocol='tcp', port_range_min=22, port_range_max=22),  # ssh
+    dict(protocol='icmp'),  # ping
+    dict(protocol='icmp', ethertype='IPv6')  # ping6
+]
+
 
 def skip_because(*args, **kwargs):
     """A decorator useful to skip tests hitting known bugs
@@ -163,6 +185,10 @@ class NuageBaseTest(manager.NetworkScenarioTest):
     ssh_security_group = None
     ssh_keypair = None
 
+    # by client ID, see acquire_l3_access_topology
+    _l3_access_topologies = None
+    _l3_access_lock = threading.Lock()
+
     @classmethod
     def setup_clients(cls):
         super(NuageBaseTest, cls).setup_clients()
@@ -180,10 +206,33 @@ class NuageBaseTest(manager.NetworkScenarioTest):
 
     @classmethod
     def setup_credentials(cls):
+        # name the caller in request logs once, rather than per request
+        request_logging.set_test_caller(cls.__name__ + ':setUpClass')
         # Create no network resources for these tests.
         cls.set_network_resources()
         super(NuageBaseTest, cls).setup_credentials()
 
+    @classmethod
+    def resource_cleanup(cls):
+        request_logging.set_test_caller(cls.__name__ + ':tearDownClass')
+        try:
+            super(NuageBaseTest, cls).resource_cleanup()
+        finally:
+            request_logging.set_test_caller(None)
+            vsd_metrics.dump_class_metrics(Topology.vsd_metrics_dir,
+                                           cls.__name__)
+
+    def setUp(self):
+        super(NuageBaseTest, self).setUp()
+        request_logging.set_test_caller(
+            self.__class__.__name__ + ':' + self._testMethodName)
+        self.addCleanup(request_logging.set_test_caller, None)
+
+    def tearDown(self):
+        request_logging.set_test_caller(
+            self.__class__.__name__ + ':_run_cleanups')
+        super(NuageBaseTest, self).tearDown()
+
     @classmethod
     def skip_checks(cls):
         super(NuageBaseTest, cls).skip_checks()
@@ -677,10 +726,38 @@ class NuageBaseTest(manager.NetworkScenarioTest):
                                    by_port_id=port['id'])
         self.assertEqual(port['id'], vport.name)
 
+    @classmethod
+    def create_cls_open_ssh_security_group(cls, client, sg_name=None,
+                                           cleanup=True):
+        """Creates a security group allowing SSH and ping, both directions"""
+        security_group = client.security_groups_client.create_security_group(
+            name=data_utils.rand_name(sg_name or 'tempest-open-ssh')
+        )['security_group']
+        if cleanup:
+            cls.addClassResourceCleanup(
+                test_utils.call_and_ignore_notfound_exc,
+                client.security_groups_client.delete_security_group,
+                security_group['id'])
+        for rule in LOGINABLE_SECURITY_GROUP_RULES:
+            for direction in ('ingress', 'egress'):
+                try:
+                    client.security_group_rules_client.\
+                        create_security_group_rule(
+                            security_group_id=security_group['id'],
+                            direction=direction, **rule)
+                except lib_exc.Conflict as e:
+                    if 'Security group rule already exists' not in str(e):
+                        raise
+        return security_group
+
     def create_open_ssh_security_group(self, sg_name=None):
         if not self.ssh_security_group:
-            self.ssh_security_group = self._create_security_group(
-                namestart=sg_name or 'tempest-open-ssh')
+            self.ssh_security_group = self.create_cls_open_ssh_security_group(
+                self.manager, sg_name, cleanup=False)
+            self.addCleanup(
+                test_utils.call_and_ignore_notfound_exc,
+                self.manager.security_groups_client.delete_security_group,
+                self.ssh_security_group['id'])
         return self.ssh_security_group
 
     def create_security_group_rule(self, security_group=None, **kwargs):
@@ -694,29 +771,35 @@ class NuageBaseTest(manager.NetworkScenarioTest):
 
         return self._create_security_group_rule(security_group, **kwargs)
 
-    def create_test_router(self, client=None):
+    @classmethod
+    def create_cls_test_router(cls, client, cleanup=True, **kwargs):
         if Topology.access_to_l2_supported():
-            return self.create_router(client=client)  # can be isolated router
+            external_network_id = None  # can be isolated router
         else:
-            return self.create_public_router(client=client)  # needs FIP access
+            external_network_id = CONF.network.public_network_id  # needs FIP
+        return cls.create_cls_router(
+            client, external_network_id=external_network_id, cleanup=cleanup,
+            **kwargs)
+
+    def create_test_router(self, client=None):
+        client = client or self.manager
+        router = self.create_cls_test_router(client, cleanup=False)
+        self.addCleanup(self.delete_router, router, client)
+        return router
 
     def create_public_router(self, client=None):
         return self.create_router(
             external_network_id=CONF.network.public_network_id, client=client)
 
-    def create_router(self, router_name=None, admin_state_up=True,
-                      external_network_id=None, enable_snat=None,
-                      external_gateway_info_on=True,
-                      client=None, cleanup=True,
-                      no_net_partition=False,
-                      **kwargs):
-        """Wrapper utility that creates a router."""
+    @classmethod
+    def create_cls_router(cls, client, router_name=None, admin_state_up=True,
+                          external_network_id=None, enable_snat=None,
+                          external_gateway_info_on=True, cleanup=True,
+                          no_net_partition=False, **kwargs):
         ext_gw_info = {}
         router_name = router_name or data_utils.rand_name('test-router-')
-        if not client:
-            client = self.manager
         if not no_net_partition and 'net_partition' not in kwargs:
-            kwargs['net_partition'] = self.default_netpartition_name
+            kwargs['net_partition'] = cls.default_netpartition_name
         if external_gateway_info_on:
             if external_network_id:
                 ext_gw_info['network_id'] = external_network_id
@@ -730,6 +813,24 @@ class NuageBaseTest(manager.NetworkScenarioTest):
                 name=router_name, admin_state_up=admin_state_up, **kwargs)
 
         router = body['router']
+        if cleanup:
+            cls.addClassResourceCleanup(client.routers_client.delete_router,
+                                        router['id'])
+        return router
+
+    def create_router(self, router_name=None, admin_state_up=True,
+                      external_network_id=None, enable_snat=None,
+                      external_gateway_info_on=True,
+                      client=None, cleanup=True,
+                      no_net_partition=False,
+                      **kwargs):
+        """Wrapper utility that creates a router."""
+        if not client:
+            client = self.manager
+        router = self.create_cls_router(
+            client, router_name, admin_state_up, external_network_id,
+            enable_snat, external_gateway_info_on, cleanup=False,
+            no_net_partition=no_net_partition, **kwargs)
         if cleanup:
             self.addCleanup(self.delete_router, router, client)
         return router
@@ -1057,6 +1158,114 @@ class NuageBaseTest(manager.NetworkScenarioTest):
         if not client:
             client = self.manager
 
+        request = self._osc_server_request(
+            client, tenant_networks, ports, security_groups, volume_backed,
+            name, flavor, image_id, keypair, **kwargs)
+        name = request['name']
+        vm = self._osc_create_server(client, request)
+
+        error = None
+        if wait_until:
+
+            LOG.info("Waiting for server %s to be %s", name, wait_until)
+            try:
+                waiters.wait_for_server_status(client.servers_client,
+                                               vm['id'], wait_until)
+
+            except Exception as e:
+                error = e
+
+        vm, failure = self._osc_deployed_server(
+            client, vm, name, error, cleanup,
+            kwargs.get('preserve_server_on_error', False) is not False)
+        if failure:
+            if return_none_on_failure:
+                LOG.error(failure)
+                return None
+            else:
+                self.fail(failure)
+        return vm
+
+    def osc_create_test_servers(self, specs, wait_until='ACTIVE',
+                                return_none_on_failure=False):
+        """Creates test servers all at once.
+
+        All servers are requested from nova concurrently before waiting
+        for any of them, and a single list_servers poll loop per client
+        waits for all of them to reach wait_until.
+
+        :param specs: per server, the osc_create_test_server keyword
+        arguments, except for wait_until and return_none_on_failure
+        :param wait_until: Server status to wait for the servers to reach
+        :param return_none_on_failure: if True, return None for servers
+        which failed to deploy instead of failing the test case
+        :returns: the servers, in the order of specs
+        """
+        prepared = []
+        for spec in specs:
+            spec = dict(spec)
+            client = spec.pop('client', None) or self.manager
+            cleanup = spec.pop('cleanup', True)
+            preserve = spec.get('preserve_server_on_error', False)
+            request = self._osc_server_request(client, **spec)
+            prepared.append((client, request, cleanup,
+                             preserve is not False))
+
+        vms = [None] * len(prepared)
+        errors = [None] * len(prepared)
+        executor = futures.ThreadPoolExecutor(max_workers=len(prepared) or 1)
+        try:
+            created = [executor.submit(self._osc_create_server,
+                                       client, request)
+                       for client, request, _, _ in prepared]
+            for i, result in enumerate(created):
+                try:
+                    vms[i] = result.result()
+                except Exception as e:
+                    LOG.error("Creating server %s failed (%s)",
+                              prepared[i][1]['name'], str(e))
+                    errors[i] = e
+        finally:
+            executor.shutdown(wait=True)
+
+        if wait_until:
+            per_client = {}
+            for i, (client, request, _, _) in enumerate(prepared):
+                if vms[i]:
+                    per_client.setdefault(client.servers_client, []).append(i)
+            for servers_client, indices in per_client.items():
+                failed = server_waiters.wait_for_servers_status(
+                    servers_client, [vms[i]['id'] for i in indices],
+                    wait_until)
+                for i in indices:
+                    errors[i] = failed.get(vms[i]['id'])
+
+        # all servers are dealt with (e.g. get their cleanup) before
+        # failing the test case on any of them
+        failures = []
+        for i, (client, request, cleanup, preserve) in enumerate(prepared):
+            if vms[i] is None:
+                failures.append('Deploying server %s failed' %
+                                request['name'])
+                continue
+            vms[i], failure = self._osc_deployed_server(
+                client, vms[i], request['name'], errors[i], cleanup,
+                preserve)
+            if failure:
+                failures.append(failure)
+        if failures:
+            if return_none_on_failure:
+                for failure in failures:
+                    LOG.error(failure)
+            else:
+                self.fail('; '.join(failures))
+        return vms
+
+    def _osc_server_request(self, client, tenant_networks=None, ports=None,
+                            security_groups=None, volume_backed=False,
+                            name=None, flavor=None, image_id=None,
+                            keypair=None, **kwargs):
+        """Returns the create_server arguments for a test server"""
         if name is None:
             name = data_utils.rand_name(__name__ + "-instance")
         if flavor is None:
@@ -1139,68 +1348,57 @@ class NuageBaseTest(manager.NetworkScenarioTest):
         if keypair:
             kwargs['key_name'] = keypair['name']
 
-        vm = None
-
-        def cleanup_server():
-            client.servers_client.delete_server(vm['id'])
-            waiters.wait_for_server_termination(
-                client.servers_client, vm['id'])
+        kwargs.update(name=name, imageRef=image_id, flavorRef=flavor)
+        return kwargs
 
-        body = client.servers_client.create_server(name=name,
-                                                   imageRef=image_id,
-                                                   flavorRef=flavor,
-                                                   **kwargs)
+    @staticmethod
+    def _osc_create_server(client, request):
+        body = client.servers_client.create_server(**request)
 
         vm = rest_client.ResponseBody(body.response, body['server'])
         LOG.info("Id of vm %s", vm['id'])
+        return vm
 
-        if wait_until:
+    def _osc_deployed_server(self, client, vm, name, error, cleanup,
+                             preserve_server_on_error):
+        """Returns the server, or None along with why it failed to deploy
 
-            LOG.info("Waiting for server %s to be %s", name, wait_until)
-            try:
-                waiters.wait_for_server_status(client.servers_client,
-                                               vm['id'], wait_until)
+        A server which failed to deploy is destroyed, unless preserved.
+        """
+        server_id = vm['id']
 
-            except Exception as e:
+        def cleanup_server():
+            client.servers_client.delete_server(server_id)
+            waiters.wait_for_server_termination(
+                client.servers_client, server_id)
 
-                if ('preserve_server_on_error' not in kwargs or
-                        kwargs['preserve_server_on_error'] is False):
+        if error is not None and not preserve_server_on_error:
 
-                    LOG.error("Deploying server %s failed (%s). "
-                              "Destroying.", name, str(e))
+            LOG.error("Deploying server %s failed (%s). "
+                      "Destroying.", name, str(error))
 
-                    try:
-                        cleanup_server()
-                        vm = None  # mark deletion success
+            try:
+                cleanup_server()
+                vm = None  # mark deletion success
 
-                    except Exception as e:
-                        LOG.exception(
-                            'Destroying server %s failed (%s)',
-                            name, str(e))
+            except Exception as e:
+                LOG.exception(
+                    'Destroying server %s failed (%s)',
+                    name, str(e))
 
-                    if vm is not None:
-                        if return_none_on_failure:
-                            LOG.error('Destroying server %s failed', name)
-                            return None
-                        else:
-                            self.fail('Destroying server %s failed' % name)
+            if vm is not None:
+                return None, 'Destroying server %s failed' % name
 
         if vm:
             if cleanup:
                 self.addCleanup(cleanup_server)
 
-            return vm
+            return vm, None
 
         else:
 
             # FAILED TO DEPLOY SERVER
-
-            if return_none_on_failure:
-                LOG.error('Deploying server %s failed', name)
-                return None
-
-            else:
-                self.fail('Deploying server %s failed' % name)
+            return None, 'Deploying server %s failed' % name
 
     def osc_create_floatingip(self, external_network_id=None, client=None):
         if not external_network_id:
@@ -1226,6 +1424,83 @@ class NuageBaseTest(manager.NetworkScenarioTest):
                              wait_until_initialized=True,
                              **kwargs):
 
+        server, data_interface = self._prepare_tenant_server(
+            client, networks, ports, security_groups, wait_until,
+            volume_backed, name, flavor, make_reachable,
+            configure_dualstack_itf, wait_until_initialized)
+
+        server.boot(wait_until, cleanup, True, **kwargs)
+
+        assert server.did_deploy()
+
+        LOG.info("create_tenant_server %s: server is %s",
+                 server.name, wait_until)
+
+        return self._complete_tenant_server(
+            server, data_interface, client, make_reachable,
+            configure_dualstack_itf, wait_until_initialized)
+
+    def create_tenant_servers(self, specs, wait_until='ACTIVE',
+                              return_none_on_failure=False):
+        """Creates tenant servers all at once
+
+        All servers are booted concurrently and waited for together, after
+        which they are made reachable, waited for to initialize and
+        configured one by one.
+
+        :param specs: per server, the create_tenant_server keyword arguments,
+        except for wait_until
+        :param wait_until: Server status to wait for the servers to reach
+        :param return_none_on_failure: if True, return None for servers
+        which failed to deploy instead of failing the test case
+        :returns: the TenantServers, in the order of specs
+        """
+        prepared = []
+        for spec in specs:
+            spec = dict(spec)
+            make_reachable = spec.pop('make_reachable', False)
+            configure_dualstack_itf = spec.pop('configure_dualstack_itf',
+                                               False)
+            wait_until_initialized = spec.pop('wait_until_initialized', True)
+            server, data_interface = self._prepare_tenant_server(
+                spec.pop('client', None), spec.pop('networks', None),
+                spec.pop('ports', None), spec.pop('security_groups', None),
+                wait_until, spec.pop('volume_backed', False),
+                spec.pop('name', None), spec.pop('flavor', None),
+                make_reachable, configure_dualstack_itf,
+                wait_until_initialized)
+            cleanup = spec.pop('cleanup', True)
+            boot_spec = server.boot_spec(**spec)
+            boot_spec['cleanup'] = cleanup
+            prepared.append((server, data_interface, boot_spec,
+                             make_reachable, configure_dualstack_itf,
+                             wait_until_initialized))
+
+        deployed = self.osc_create_test_servers(
+            [p[2] for p in prepared], wait_until, return_none_on_failure)
+
+        for p, openstack_data in zip(prepared, deployed):
+            p[0].openstack_data = openstack_data
+        LOG.info("create_tenant_servers %s: servers are %s",
+                 ', '.join(p[0].name for p in prepared), wait_until)
+
+        servers = []
+        for (server, data_interface, _, make_reachable,
+             configure_dualstack_itf, wait_until_initialized) in prepared:
+            if server.did_deploy():
+                servers.append(self._complete_tenant_server(
+                    server, data_interface, server.client, make_reachable,
+                    configure_dualstack_itf, wait_until_initialized))
+            else:
+                servers.append(None)
+        return servers
+
+    def _prepare_tenant_server(self, client, networks, ports,
+                               security_groups, wait_until, volume_backed,
+                               name, flavor, make_reachable,
+                               configure_dualstack_itf,
+                               wait_until_initialized):
+        """Returns a TenantServer ready to boot, and its data interface"""
         assert not (wait_until_initialized and wait_until != 'ACTIVE')
         assert not (networks and ports)  # one of both, not both
         assert networks or ports  # but one at least
@@ -1253,16 +1528,15 @@ class NuageBaseTest(manager.NetworkScenarioTest):
             server.security_groups = None
             data_interface = 'eth1'
 
-        if server.boot(wait_until, cleanup, True, **kwargs):
-            networks = server.networks
-            ports = server.ports
-
-        assert server.did_deploy()
-
-        LOG.info("create_tenant_server %s: server is %s", name, wait_until)
+        return server, data_interface
 
-        if wait_until_initialized:
-            self.sleep(5, 'Give time for server to initialize')
+    def _complete_tenant_server(self, server, data_interface, client,
+                                make_reachable, configure_dualstack_itf,
+                                wait_until_initialized):
+        """Makes a booted TenantServer reachable and configures it"""
+        name = server.name
+        networks = server.networks
+        ports = server.ports
 
         if make_reachable:
             LOG.info("create_tenant_server %s: make reachable", name)
@@ -1282,6 +1556,9 @@ class NuageBaseTest(manager.NetworkScenarioTest):
                 # os mgd or vsd managed l2
                 self.create_fip_to_server(server, first_port)
 
+        if wait_until_initialized:
+            self.wait_for_server_ready(server)
+
         if configure_dualstack_itf:
             LOG.info("create_tenant_server %s: configure dualstack", name)
 
@@ -1308,9 +1585,81 @@ class NuageBaseTest(manager.NetworkScenarioTest):
         LOG.info("create_tenant_server %s: DONE!", name)
         return server
 
+    def wait_for_server_ready(self, server, timeout=None):
+        """Waits for a booted TenantServer to be usable
+
+        Over SSH on its FIP when it has one, else by its console log.
+        :returns: the seconds it took, None when not found ready
+        """
+        LOG.info("wait_for_server_ready %s", server.name)
+        return server_readiness.wait(
+            self.admin_manager.servers_client, server.id(), server.image_id,
+            server.associated_fip, timeout)
+
+    @classmethod
+    def _create_l3_access_topology(cls, client, add_cleanup):
+        """Creates the FIP network, subnet, router and open SSH SG"""
+        network = cls.create_cls_network(
+            data_utils.rand_name('l3-access-network'),
+            client.networks_client, cleanup=False)
+        add_cleanup(client.networks_client.delete_network, network['id'])
+        subnet = cls.create_cls_subnet(
+            network, cidr=IPNetwork("192.168.0.0/24"), client=client,
+            cleanup=False)
+        add_cleanup(client.subnets_client.delete_subnet, subnet['id'])
+
+        router = cls.create_cls_test_router(
+            client, cleanup=False,
+            router_name=data_utils.rand_name('l3-access-router'))
+        add_cleanup(client.routers_client.delete_router, router['id'])
+        client.routers_client.add_router_interface(
+            router['id'], subnet_id=subnet['id'])
+        add_cleanup(client.routers_client.remove_router_interface,
+                    router['id'], subnet_id=subnet['id'])
+        cls.set_network_as_l3_connected(network)
+
+        security_group = cls.create_cls_open_ssh_security_group(
+            client, 'l3-access-open-ssh', cleanup=False)
+        add_cleanup(client.security_groups_client.delete_security_group,
+                    security_group['id'])
+
+        return {'network': network, 'subnet': subnet, 'router': router,
+                'security_group': security_group}
+
+    def acquire_l3_access_topology(self, client=None):
+        """Returns the L3 topology giving L2 servers of the class FIP access
+
+        Its network, subnet, router and open SSH security group are created
+        on first use and shared by all tests of the class. Every acquire is
+        released at cleanup of the test; the class holds a use of its own
+        till its resource cleanup, after which the last release deletes it.
+        """
+        cls = self.__class__
+        client = client or self.manager
+        with cls._l3_access_lock:
+            if cls.__dict__.get('_l3_access_topologies') is None:
+                cls._l3_access_topologies = {}
+            shared = cls._l3_access_topologies.get(id(client))
+            if shared is None:
+                shared = shared_resource.SharedResource(
+                    functools.partial(cls._create_l3_access_topology,
+                                      client),
+                    '%s L3 access topology' % cls.__name__)
+                cls._l3_access_topologies[id(client)] = shared
+            if not shared.users:
+                # the class' own use
+                shared.acquire()
+                cls.addClassResourceCleanup(shared.release)
+        topology = shared.acquire()
+        self.addCleanup(shared.release)
+        return topology
+
     def prepare_l3_topology_for_l2_network(
             self, networks, ports, security_groups=None, client=None):
 
+        # L3 (shared), released after the ports below are deleted
+        topology = self.acquire_l3_access_topology(client)
+
         # L2 (existing)
         l2_network = (networks[0] if networks
                       else ports[0]['parent_network'])
@@ -1323,18 +1672,10 @@ class NuageBaseTest(manager.NetworkScenarioTest):
         else:
             l2_port = self.create_port(l2_network, client)
 
-        # L3 (new)
-        fip_network = self.create_network(client=client)
-        subnet = self.create_subnet(
-            fip_network, cidr=IPNetwork("192.168.0.0/24"),
-            client=client)
-        router = self.create_test_router(client=client)
-        self.router_attach(router, subnet, client=client)
-
         # l3 port
-        open_ssh_sg = self.create_open_ssh_security_group()
-        l3_port = self.create_port(fip_network, client,
-                                   security_groups=[open_ssh_sg['id']])
+        l3_port = self.create_port(
+            topology['network'], client,
+            security_groups=[topology['security_group']['id']])
         return [l3_port, l2_port]
 
     def create_fip_to_server(self, server, port=None, validate_access=False,
@@ -1426,47 +1767,54 @@ class NuageBaseTest(manager.NetworkScenarioTest):
         :raises: SSHExecCommandFailed if command returns nonzero
                  status. The exception contains command status stderr content.
         """
-        def ping(source, dest, ping_count, ping_size, nic=None):
-            count = ping_count or CONF.validation.ping_count
-            size = ping_size or CONF.validation.ping_size
-
-            # Use 'ping6' for IPv6 addresses, 'ping' for IPv4 and hostnames
-            ip_version = (
-                6 if valid_ipv6(dest) else 4)
-            cmd = (
-                'ping6' if ip_version == 6 else 'ping')
-            if nic:
-                cmd = 'sudo {cmd} -I {nic}'.format(cmd=cmd, nic=interface)
-
-            cmd += ' -c{0} -w{0} -s{1} {2}'.format(count, size, dest)
-            return source.console().exec_command(cmd)
-
         def ping_address():
-            try:
-                result = ping(server, dest, ping_count,
-                              ping_size, nic=interface)
-
-            except lib_exc.SSHExecCommandFailed:
-                LOG.warning('Failed to ping IP: %s via a ssh connection '
-                            'from: %s.', dest,
-                            server.associated_fip)
-                if should_pass:
-                    LOG.debug('will clear arp cache for : %s', dest)
-                    cmd = 'sudo arp -d {dest}'.format(dest=dest)
-                    # following may fail
-                    try:
-                        server.console().exec_command(cmd)
-                    except lib_exc.SSHExecCommandFailed:
-                        LOG.debug('Failed to execute command on %s.',
-                                  server.id())
-                return not should_pass
-            LOG.debug('ping result: %s', result)
-
-            return should_pass
+            reached, _ = self._ping(server, dest, should_pass, interface,
+                                    ping_count, ping_size)
+            return reached == should_pass
 
         return test_utils.call_until_true(
             ping_address, timeout, 1)
 
+    @staticmethod
+    def _ping(server, dest, should_pass=True, interface=None,
+              ping_count=None, ping_size=None):
+        """Pings once from server to dest
+
+        :returns: whether dest was reached, and the ping output
+        """
+        count = ping_count or CONF.validation.ping_count
+        size = ping_size or CONF.validation.ping_size
+
+        # Use 'ping6' for IPv6 addresses, 'ping' for IPv4 and hostnames
+        ip_version = (
+            6 if valid_ipv6(dest) else 4)
+        cmd = (
+            'ping6' if ip_version == 6 else 'ping')
+        if interface:
+            cmd = 'sudo {cmd} -I {nic}'.format(cmd=cmd, nic=interface)
+
+        cmd += ' -c{0} -w{0} -s{1} {2}'.format(count, size, dest)
+        try:
+            result = server.console().exec_command(cmd)
+
+        except lib_exc.SSHExecCommandFailed:
+            LOG.warning('Failed to ping IP: %s via a ssh connection '
+                        'from: %s.', dest,
+                        server.associated_fip)
+            if should_pass:
+                LOG.debug('will clear arp cache for : %s', dest)
+                cmd = 'sudo arp -d {dest}'.format(dest=dest)
+                # following may fail
+                try:
+                    server.console().exec_command(cmd)
+                except lib_exc.SSHExecCommandFailed:
+                    LOG.debug('Failed to execute command on %s.',
+                              server.id())
+            return False, None
+        LOG.debug('ping result: %s', result)
+
+        return True, result
+
     def assert_ping(self, server1, server2, network, ip_type=4,
                     should_pass=True, interface=None, address=None,
                     ping_count=3, servers=None, timeout=None):
@@ -1488,6 +1836,74 @@ class NuageBaseTest(manager.NetworkScenarioTest):
             self._log_console_output(servers)
             raise
 
+    def check_connectivity_matrix(self, servers, destinations, expected=True,
+                                  network=None, ip_type=4, interface=None,
+                                  ping_count=None, timeout=None,
+                                  workers=connectivity_matrix.WORKERS):
+        """Pings from all servers to all destinations, all at once
+
+        Each pair is retried on its own till it gives the expected outcome
+        or timeout expires, with at most workers pings going on at a time.
+
+        :param servers: TenantServers to ping from
+        :param destinations: TenantServers, pinged at their address in
+        network, or addresses
+        :param expected: whether pings should pass, or a dict of that by
+        (server, destination); pairs not in it, as well as those of a
+        server with itself, are not probed
+        :param network: the network TenantServer destinations are pinged in,
+        required when there are such
+        :returns: MatrixResult, with per pair the outcome, its latency and
+        whether it was as expected
+        """
+        if network is None and any(isinstance(destination, TenantServer)
+                                   for destination in destinations):
+            raise ValueError('The network to ping TenantServer destinations '
+                             'in is required.')
+        for server in servers:
+            if not server.console():
+                self.skipTest('This test cannot complete the connectivity '
+                              'check as %s has no console access.' %
+                              server.name)
+
+        addresses = {}
+        for destination in destinations:
+            if isinstance(destination, TenantServer):
+                addresses[destination] = destination.get_server_ip_in_network(
+                    network['name'], ip_type)
+        pairs = collections.OrderedDict()
+        for server in servers:
+            for destination in destinations:
+                if destination is server:
+                    continue
+                if isinstance(expected, dict):
+                    if (server, destination) in expected:
+                        pairs[(server, destination)] = expected[
+                            (server, destination)]
+                else:
+                    pairs[(server, destination)] = expected
+
+        def probe(server, destination, should_pass):
+            return self._ping(server, addresses.get(destination, destination),
+                              should_pass, interface, ping_count)
+
+        matrix = connectivity_matrix.ConnectivityMatrix(
+            probe, workers, timeout or CONF.validation.ping_timeout)
+        result = matrix.run(pairs)
+        LOG.info('Connectivity matrix:\n%s', result.report())
+        return result
+
+    def assert_connectivity_matrix(self, servers, destinations, expected=True,
+                                   **kwargs):
+        """As check_connectivity_matrix, failing on any unexpected pair"""
+        result = self.check_connectivity_matrix(servers, destinations,
+                                                expected, **kwargs)
+        if not result.ok:
+            self._log_console_output()
+            self.fail('Unexpected connectivity:\n' + '\n'.join(
+                str(pair) for pair in result.diff()))
+        return result
+
     def assertDictEqual(self, d1, d2, ignore, msg):
         for k in d1:
             if k in ignore:
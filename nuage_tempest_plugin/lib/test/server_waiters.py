@@ -0,0 +1,56 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+
+import time
+
+from tempest import exceptions
+from tempest.lib import exceptions as lib_exc
+
+from nuage_tempest_plugin.lib.topology import Topology
+
+CONF = Topology.get_conf()
+
+
+def wait_for_servers_status(servers_client, server_ids, status):
+    """Waits for servers to reach a status, polling all at once
+
+    A server which is not listed (any longer) failed, as one in ERROR does
+    unless that is the status waited for.
+
+    :returns: dict of the ID of servers which didn't, to the error
+    """
+    errors = {}
+    pending = set(server_ids)
+    start = int(time.time())
+    while True:
+        servers = dict(
+            (server['id'], server)
+            for server in servers_client.list_servers(detail=True)['servers'])
+        for server_id in list(pending):
+            server = servers.get(server_id)
+            if server is None:
+                errors[server_id] = lib_exc.NotFound(
+                    'Server %s is gone while waiting for %s status' %
+                    (server_id, status))
+                pending.discard(server_id)
+            elif server['status'] == 'ERROR' and status != 'ERROR':
+                details = ('Fault: %s.' % server['fault']
+                           if 'fault' in server else '')
+                errors[server_id] = exceptions.BuildErrorException(
+                    details, server_id=server_id)
+                pending.discard(server_id)
+            elif (server['status'] == status and
+                    not server.get('OS-EXT-STS:task_state')):
+                pending.discard(server_id)
+        if not pending:
+            # as tempest's wait_for_server_status does, but once for all
+            time.sleep(CONF.compute.ready_wait)
+            return errors
+        if int(time.time()) - start >= servers_client.build_timeout:
+            for server_id in pending:
+                errors[server_id] = lib_exc.TimeoutException(
+                    'Server %s failed to reach %s status within the '
+                    'required time (%s s).' %
+                    (server_id, status, servers_client.build_timeout))
+            return errors
+        time.sleep(servers_client.build_interval)
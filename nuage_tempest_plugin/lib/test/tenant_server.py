@@ -12,10 +12,14 @@ from tempest.lib.common.utils import test_utils
 from tempest.lib import exceptions as lib_exc
 
 from nuage_tempest_plugin.lib.topology import Topology
+from nuage_tempest_plugin.lib.utils import persistent_ssh
+from nuage_tempest_plugin.lib.utils import vsd_metrics
 
 CONF = Topology.get_conf()
 LOG = Topology.get_logger(__name__)
 
+vsd_metrics.register_counters('ssh_sessions', persistent_ssh.stats)
+
 
 class FipAccessConsole(RemoteClient):
 
@@ -27,6 +31,12 @@ class FipAccessConsole(RemoteClient):
             pkey=tenant_server.keypair['private_key'],
             servers_client=tenant_server.admin_client)
         self.tenant_server = tenant_server
+        # one authenticated connection for all commands to the server
+        self.ssh_client = persistent_ssh.PersistentSSHClient.from_client(
+            self.ssh_client)
+
+    def close(self):
+        self.ssh_client.close()
 
     def send(self, cmd, timeout=CONF.validation.ssh_timeout):
         output = {'output': None}
@@ -105,7 +115,17 @@ class TenantServer(object):
 
     def boot(self, wait_until='ACTIVE', cleanup=True,
              return_none_on_failure=False, **kwargs):
+        self.openstack_data = self.parent_test.osc_create_test_server(
+            wait_until=wait_until, cleanup=cleanup,
+            return_none_on_failure=return_none_on_failure,
+            **self.boot_spec(**kwargs))
+        return self.openstack_data
 
+    def boot_spec(self, **kwargs):
+        """Returns the osc_create_test_server arguments booting this server
+
+        Apart from wait_until and return_none_on_failure.
+        """
         assert not ("user_data" in kwargs and self.get_user_data_for_nic_prep(
             dhcp_client=CONF.scenario.dhcp_client))  # one of both, not both
 
@@ -121,12 +141,12 @@ class TenantServer(object):
                 kwargs['user_data']).lstrip().encode('utf8'))
             LOG.info('user_data:\n---\n{}---'.format(kwargs['user_data']))
 
-        self.openstack_data = self.parent_test.osc_create_test_server(
-            self.client, self.networks, self.ports, self.security_groups,
-            wait_until, self.volume_backed, self.name, self.flavor,
-            self.image_id, self.keypair, cleanup,
-            return_none_on_failure=return_none_on_failure, **kwargs)
-        return self.openstack_data
+        kwargs.update(client=self.client, tenant_networks=self.networks,
+                      ports=self.ports, security_groups=self.security_groups,
+                      volume_backed=self.volume_backed, name=self.name,
+                      flavor=self.flavor, image_id=self.image_id,
+                      keypair=self.keypair)
+        return kwargs
 
     def did_deploy(self):
         return bool(self.openstack_data)
@@ -147,6 +167,7 @@ class TenantServer(object):
         # now is the time to init the fip-access console also
         if not self.vm_console:
             self.vm_console = FipAccessConsole(self)
+            self.parent_test.addCleanup(self.vm_console.close)
 
     def get_server_ip_in_network(self, network_name, ip_type=4):
         server = self.get_server_details()
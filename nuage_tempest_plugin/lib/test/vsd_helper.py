@@ -1,15 +1,21 @@
 # Copyright 2017 - Nokia
 # All Rights Reserved.
 
+from concurrent import futures
 import importlib
 from netaddr import IPAddress
 import re
+import six
 from six import iteritems
+import threading
 
 from tempest.lib.common.utils import data_utils
 
-from bambou.exceptions import BambouHTTPError
 from nuage_tempest_plugin.lib.topology import Topology
+from nuage_tempest_plugin.lib.utils import vsd_ancestry
+from nuage_tempest_plugin.lib.utils import vsd_filter
+from nuage_tempest_plugin.lib.utils import vsd_metrics
+from nuage_tempest_plugin.lib.utils import vsd_snapshot
 from nuage_tempest_plugin.services.nuage_client import NuageRestClient
 
 LOG = Topology.get_logger(__name__)
@@ -23,6 +29,98 @@ def get_by_name(fetcher, name):
     return fetcher.get(filter='name is "{}"'.format(name))[0]
 
 
+class PooledSession(object):
+    """A vspk session along with what is looked up through it once"""
+
+    def __init__(self):
+        self.session = None
+        self.enterprises = {}  # name -> NUEnterprise
+        self.default_enterprise = None
+
+
+class VSDSessionPool(object):
+    """vspk sessions shared by all VsdHelpers of the process
+
+    There is one session per (server, user, enterprise, API version), so
+    a test class no longer logs in and looks up its enterprises anew.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.logins = 0
+        self.reused = 0
+        self.api_keys_reused = 0
+
+    def get(self, key):
+        with self._lock:
+            pooled = self._sessions.get(key)
+            if pooled is None:
+                pooled = self._sessions[key] = PooledSession()
+            elif pooled.session:
+                self.reused += 1
+            return pooled
+
+    def record_login(self, api_key_reused):
+        with self._lock:
+            if api_key_reused:
+                self.api_keys_reused += 1
+            else:
+                self.logins += 1
+
+    def stats(self):
+        return {'sessions': len(self._sessions), 'logins': self.logins,
+                'reused': self.reused,
+                'api_keys_reused': self.api_keys_reused}
+
+
+vsd_sessions = VSDSessionPool()
+vsd_metrics.register_counters('vsd_sessions', vsd_sessions.stats)
+
+_session_classes = {}  # vspk version module -> session class
+
+
+def vsd_session_class(vspk):
+    """Returns the NUVSDSession subclass of vspk which VsdHelpers use
+
+    Given an API key, it starts without logging in (GET /me): bambou only
+    does so when the session has no root object yet. On expiry of the key
+    it logs in anyhow.
+    """
+    session_class = _session_classes.get(vspk)
+    if session_class is None:
+        class VSDSession(vspk.NUVSDSession):
+
+            def __init__(self, api_key=None, **kwargs):
+                super(VSDSession, self).__init__(**kwargs)
+                self.api_key = api_key
+
+            def _authenticate(self):
+                if self.api_key and self.root_object is None:
+                    self._root_object = self.create_root_object()
+                    self._root_object.api_key = self.api_key
+                super(VSDSession, self)._authenticate()
+
+        session_class = _session_classes.setdefault(vspk, VSDSession)
+    return session_class
+
+
+# where the VSD objects which passed through a VsdHelper are in the tree
+vsd_ancestors = vsd_ancestry.AncestorIndex(Topology.vsd_ancestor_cache_size)
+vsd_metrics.register_counters('vsd_ancestors', vsd_ancestors.stats)
+
+
+class PortResources(object):
+    """The VSD objects of a Neutron port, see VsdHelper.resolve_ports"""
+
+    def __init__(self, port_id):
+        self.port_id = port_id
+        self.vport = None
+        self.vm_interface = None
+        self.policy_decision = None
+        self.dhcp_options = None
+
+
 class VsdHelper(object):
     """VsdHelper
 
@@ -43,15 +141,26 @@ class VsdHelper(object):
         self.user = user
         self.password = password
         self.enterprise = enterprise
-        self.vspk = importlib.import_module('vspk.' + str(
-            version or self.base_uri_to_version(Topology.base_uri)))
-        self._session = None
-        self.default_enterprise = None
+        self.version = str(
+            version or self.base_uri_to_version(Topology.base_uri))
+        self._vspk = None
+        self._pooled = vsd_sessions.get(
+            (self.vsd, self.user, self.enterprise, self.version))
+        self._session = self._pooled.session
+        self.default_enterprise = self._pooled.default_enterprise
 
         # temporarily reusing RESTClient for missing ops
         self.nuage_rest_client = NuageRestClient()
 
-        self.enterprise_name_to_enterprise = {}
+        # shared by all helpers of the same session
+        self.enterprise_name_to_enterprise = self._pooled.enterprises
+
+    @property
+    def vspk(self):
+        # several MB of generated code, only loaded once really needed
+        if self._vspk is None:
+            self._vspk = importlib.import_module('vspk.' + self.version)
+        return self._vspk
 
     @staticmethod
     def base_uri_to_version(base_uri):
@@ -77,25 +186,48 @@ class VsdHelper(object):
         'vspk.NUVSDSession` object.
         Note that this object is also exposed as `self()`
         """
-        self._session = self.vspk.NUVSDSession(
+        api_key = self._rest_client_api_key()
+        self._session = vsd_session_class(self.vspk)(
+            api_key=api_key,
             username=self.user,
             password=self.password,
             enterprise=self.enterprise,
             api_url=self.uri)
-
+        vsd_sessions.record_login(api_key_reused=bool(api_key))
         self._session.start()
+        self._pooled.session = self._session
         if not self.default_enterprise:
             self.default_enterprise = self.get_enterprise_by_name(
                 self.default_netpartition_name)
+            self._pooled.default_enterprise = self.default_enterprise
 
         if not self.default_enterprise:
             assert "Should have a default enterprise for Nuage plugin"
 
         return self._session
 
+    def _rest_client_api_key(self):
+        """Returns the API key of nuage_rest_client, if it is ours too"""
+        proxy = self.nuage_rest_client.restproxy
+        server = proxy.server + (':%s' % proxy.port if proxy.port else '')
+        if (server == self.vsd and
+                proxy.serverauth.split(':')[0] == self.user and
+                proxy.organization == self.enterprise and
+                proxy.base_uri.endswith('/' + self.version)):
+            return proxy.api_key
+        return None
+
     def session(self):
+        if not self._session and self._pooled.session:
+            # started by another helper since this one was created
+            self._session = self._pooled.session
+            self.default_enterprise = self._pooled.default_enterprise
         if not self._session:
             self._session = self.new_session()
+        elif not self._session.is_current_session():
+            # objects created without a session use the current one;
+            # starting a session again does not log in anew
+            self._session.start()
         return self._session
 
     def get_default_enterprise(self):
@@ -106,6 +238,19 @@ class VsdHelper(object):
     def external_id(self, id):
         return id + '@' + self.cms_id
 
+    @staticmethod
+    def remember(obj):
+        """Records where the vspk object obj is in the tree, returns it"""
+        if obj is not None:
+            vsd_ancestors.add(obj.id, obj.rest_name,
+                              obj.parent_id, obj.parent_type)
+        return obj
+
+    @staticmethod
+    def forget(obj_id):
+        """Drops what is known of a deleted object and its descendants"""
+        vsd_ancestors.invalidate(obj_id)
+
     @staticmethod
     def filter_str(key, value):
         return key + '  IS "{}"'.format(value)
@@ -189,9 +334,11 @@ class VsdHelper(object):
             name=name,
             template=template)
 
-        return enterprise.instantiate_child(l2domain, template)[0]
+        return self.remember(
+            enterprise.instantiate_child(l2domain, template)[0])
 
     def delete_l2domain(self, l2dom_id):
+        self.forget(l2dom_id)
         return self.nuage_rest_client.delete_l2domain(l2dom_id)
 
     def get_l2domain(self, enterprise=None,
@@ -228,7 +375,7 @@ class VsdHelper(object):
         if not l2_domain:
             LOG.warning('could not fetch the l2 domain '
                         'matching the filter "{}"'.format(vspk_filter))
-        return l2_domain
+        return self.remember(l2_domain)
 
     ###
     # l3 domain
@@ -274,12 +421,13 @@ class VsdHelper(object):
             name=name,
             template_id=template_id)
 
-        return enterprise.create_child(l3domain_data)[0]
+        return self.remember(enterprise.create_child(l3domain_data)[0])
 
     def delete_domain(self, l3dom_id):
         return self.delete_l3domain(l3dom_id)
 
     def delete_l3domain(self, l3dom_id):
+        self.forget(l3dom_id)
         return self.nuage_rest_client.delete_domain(l3dom_id)
 
     def get_l3_domain_by_subnet_id(self, by_subnet_id):
@@ -288,25 +436,23 @@ class VsdHelper(object):
         if not subnet:
             return None
 
-        # get the parent, which is the zone
+        # the domain is the parent of the zone, which is the parent of the
+        # subnet; known without fetching the zone once visited before
+        from bambou.exceptions import BambouHTTPError
+        domain_id = vsd_ancestors.ancestor(subnet.id, 'domain')
         try:
-            zone, _ = self.vspk.NUZone(id=subnet.parent_id).fetch()
-        except BambouHTTPError as exc:
-            if exc.connection.response.status_code == 404:
-                return None
-            else:
-                raise
+            if not domain_id:
+                zone, _ = self.vspk.NUZone(id=subnet.parent_id).fetch()
+                domain_id = self.remember(zone).parent_id
 
-        # get the parent, which is the domain
-        try:
-            domain, _ = self.vspk.NUDomain(id=zone.parent_id).fetch()
+            domain, _ = self.vspk.NUDomain(id=domain_id).fetch()
         except BambouHTTPError as exc:
             if exc.connection.response.status_code == 404:
                 return None
             else:
                 raise
 
-        return domain
+        return self.remember(domain)
 
     def get_domain(self, enterprise=None, vspk_filter=None, by_router_id=None):
         return self.get_l3domain(enterprise, vspk_filter, by_router_id)
@@ -345,7 +491,7 @@ class VsdHelper(object):
         if not domain:
             LOG.warning('could not fetch the domain matching the filter "{}"'
                         .format(vspk_filter))
-        return domain
+        return self.remember(domain)
 
     def create_zone(self, name=None, domain=None, **kwargs):
         zone_name = name or data_utils.rand_name('test-zone')
@@ -360,7 +506,7 @@ class VsdHelper(object):
             **params)
 
         zone_tuple = domain.create_child(zone_data)
-        return zone_tuple[0]
+        return self.remember(zone_tuple[0])
 
     def create_subnet(self, name=None, zone=None,
                       ip_type="IPV4",
@@ -399,9 +545,10 @@ class VsdHelper(object):
             ip_type=ip_type,
             **params)
 
-        return zone.create_child(subnet_data)[0]
+        return self.remember(zone.create_child(subnet_data)[0])
 
     def delete_subnet(self, subnet_id):
+        self.forget(subnet_id)
         return self.nuage_rest_client.delete_domain_subnet(subnet_id)
 
     ###
@@ -648,7 +795,7 @@ class VsdHelper(object):
         if not zone:
             LOG.warning('could not fetch the zone matching the filter "{}"'
                         .format(vspk_filter))
-        return zone
+        return self.remember(zone)
 
     def get_subnet(self, zone=None, vspk_filter=None, by_subnet_id=None):
         """get_subnet
@@ -681,7 +828,7 @@ class VsdHelper(object):
         if not subnet:
             LOG.warning('could not fetch the subnet matching the filter "{}"'
                         .format(filter))
-        return subnet
+        return self.remember(subnet)
 
     def get_subnet_from_domain(self, domain=None, vspk_filter=None,
                                by_subnet_id=None):
@@ -715,7 +862,7 @@ class VsdHelper(object):
         if not subnet:
             LOG.warning('could not fetch the subnet matching the filter "{}"'
                         .format(filter))
-        return subnet
+        return self.remember(subnet)
 
     def get_vm(self, subnet=None, vspk_filter=None, by_device_id=None):
         """get_vm
@@ -842,7 +989,38 @@ class VsdHelper(object):
         if not vport:
             LOG.warning('could not fetch the vport from the l2domain/subnet '
                         'matching the filter "{}"'.format(filter))
-        return vport
+        return self.remember(vport)
+
+    def get_vports(self, l2domain=None, subnet=None, by_port_ids=()):
+        """get_vports
+
+        Batched get_vport(by_port_id=...), using as few requests as the
+        filter length allows.
+        @params: l2domain object
+                 subnet object
+                 port IDs
+        @return: dict of vport objects keyed by port ID
+        """
+        parent = l2domain if l2domain else subnet
+        if not parent:
+            LOG.error('a parent is required')
+            return None
+        return self._get_by_port_ids(parent.vports, by_port_ids)
+
+    def _get_by_port_ids(self, fetcher, port_ids):
+        by_external_id = dict((self.external_id(port_id), port_id)
+                              for port_id in port_ids)
+        found = {}
+        if not by_external_id:
+            return found
+        expression = vsd_filter.In('externalID', sorted(by_external_id))
+        for chunk in expression.split(Topology.vsd_filter_max_len):
+            for obj in fetcher.get(filter=str(chunk), page=0,
+                                   page_size=len(chunk.values),
+                                   commit=False) or []:
+                if obj.external_id in by_external_id:
+                    found[by_external_id[obj.external_id]] = obj
+        return found
 
     def get_vm_interface(self, vspk_filter):
         """get_vm_interface
@@ -860,6 +1038,16 @@ class VsdHelper(object):
                         'matching the filter "{}"'.format(vspk_filter))
         return vm_interface
 
+    def get_vm_interfaces(self, by_port_ids):
+        """get_vm_interfaces
+
+        Batched get_vm_interface on the external ID of ports.
+        @params: port IDs
+        @return: dict of vm interface objects keyed by port ID
+        """
+        return self._get_by_port_ids(self.session().user.vm_interfaces,
+                                     by_port_ids)
+
     def get_vm_interface_policy_decisions(self, vm_interface=None,
                                           vspk_filter=None):
         """get_vm_interface_policy_decisions
@@ -923,6 +1111,104 @@ class VsdHelper(object):
                           'on the vm interface')
         return dhcp_options
 
+    def resolve_ports(self, port_ids, l2domain=None, subnet=None,
+                      policy_decisions=False, dhcp_options=False,
+                      workers=8):
+        """resolve_ports
+
+        Bulk get_vport, get_vm_interface, get_vm_interface_policy_decisions
+        and get_vm_interface_dhcp_options for many ports at once.
+        VM interfaces are fetched with batched externalID filters, one GET
+        per filter-sized chunk of ports. The vports are fetched the same way,
+        from the l2domain or L3 domain the VM interfaces are in, so all the
+        vports of a domain come in one chunked lookup; ports without VM
+        interface are looked up in the given l2domain or subnet. Policy
+        decisions and DHCP options exist per VM interface only, no VSD
+        collection lists them for many, so they are fetched concurrently.
+        @params: port IDs
+                 l2domain object
+                 subnet object
+                 whether to fetch the policy decisions and dhcp options
+        @return: dict of PortResources keyed by port ID
+        """
+        port_ids = list(port_ids)
+        resolved = dict((port_id, PortResources(port_id))
+                        for port_id in port_ids)
+        vm_interfaces = self.get_vm_interfaces(by_port_ids=port_ids)
+
+        # merge the vport lookups in the same domain
+        parents = {}
+        by_parent = {}
+        for port_id in port_ids:
+            vm_interface = vm_interfaces.get(port_id)
+            resolved[port_id].vm_interface = vm_interface
+            if vm_interface and vm_interface.domain_id:
+                key = vm_interface.domain_id
+                if key not in parents:
+                    parents[key] = (
+                        self.vspk.NUL2Domain(id=key)
+                        if vm_interface.attached_network_type == 'L2DOMAIN'
+                        else self.vspk.NUDomain(id=key))
+            elif l2domain or subnet:
+                parent = l2domain or subnet
+                key = parent.id
+                parents.setdefault(key, parent)
+            else:
+                continue
+            by_parent.setdefault(key, []).append(port_id)
+        for key, parent_port_ids in iteritems(by_parent):
+            vports = self._get_by_port_ids(parents[key].vports,
+                                           parent_port_ids)
+            for port_id, vport in iteritems(vports):
+                resolved[port_id].vport = self.remember(vport)
+
+        def fetch_policy_decision(vm_interface):
+            return self.vspk.NUPolicyDecision(
+                id=vm_interface.policy_decision_id).fetch()[0]
+
+        def fetch_dhcp_options(vm_interface):
+            return vm_interface.dhcp_options.get()
+
+        fetches = []  # (port ID, attribute, fetch, vm interface)
+        for port_id, vm_interface in iteritems(vm_interfaces):
+            if policy_decisions and vm_interface.policy_decision_id:
+                fetches.append((port_id, 'policy_decision',
+                                fetch_policy_decision, vm_interface))
+            if dhcp_options:
+                fetches.append((port_id, 'dhcp_options',
+                                fetch_dhcp_options, vm_interface))
+        if fetches:
+            executor = futures.ThreadPoolExecutor(
+                max_workers=min(workers, len(fetches)))
+            try:
+                results = [executor.submit(fetch, vm_interface)
+                           for _, _, fetch, vm_interface in fetches]
+                for fetched, result in zip(fetches, results):
+                    port_id, attribute = fetched[:2]
+                    setattr(resolved[port_id], attribute, result.result())
+            finally:
+                executor.shutdown(wait=False)
+        return resolved
+
+    def snapshot_domain(self, domain, l2=None):
+        """snapshot_domain
+
+        @params: L3 or L2 domain, or its ID, l2 telling which it is when
+                 given an ID
+        @return: DomainSnapshot of the domain, loaded
+        @Example:
+        snapshot = self.vsd.snapshot_domain(l3domain)
+        vports = snapshot.find('vports', externalID=ext_id)
+        """
+        if isinstance(domain, six.string_types):
+            domain_id = domain
+        else:
+            domain_id = domain.id
+            l2 = isinstance(domain, self.vspk.NUL2Domain)
+        return vsd_snapshot.DomainSnapshot(
+            self.nuage_rest_client, 'l2domains' if l2 else 'domains',
+            domain_id).load()
+
     def get_ingress_acl_entry(self, vspk_filter):
         """get_ingress_acl_entry
 
@@ -17,6 +17,8 @@ class Topology(Singleton):
     is_ml2 = True
     api_workers = int(CONF.nuage_sut.api_workers)
     nuage_baremetal_driver = CONF.nuage_sut.nuage_baremetal_driver
+    server_ready_timeout = CONF.nuage_sut.server_ready_timeout
+    server_ready_console_markers = CONF.nuage_sut.server_ready_console_markers
 
     vsd_server = CONF.nuage.nuage_vsd_server
     vsd_org = CONF.nuage.nuage_vsd_org
@@ -26,6 +28,31 @@ class Topology(Singleton):
                    CONF.nuage.nuage_vsd_password)
     def_netpartition = CONF.nuage.nuage_default_netpartition
     cms_id = CONF.nuage.nuage_cms_id
+    vsd_conn_pool_size = CONF.nuage.nuage_vsd_conn_pool_size
+    vsd_conn_pool_idle_timeout = CONF.nuage.nuage_vsd_conn_pool_idle_timeout
+    vsd_retry_base_delay = CONF.nuage.nuage_vsd_retry_base_delay
+    vsd_retry_max_delay = CONF.nuage.nuage_vsd_retry_max_delay
+    vsd_request_deadline = CONF.nuage.nuage_vsd_request_deadline or None
+    vsd_async_concurrency = CONF.nuage.nuage_vsd_async_concurrency
+    vsd_api_key_cache_file = CONF.nuage.nuage_vsd_api_key_cache_file or None
+    vsd_api_key_refresh_margin = CONF.nuage.nuage_vsd_api_key_refresh_margin
+    vsd_log_body_maxlen = CONF.nuage.nuage_vsd_log_body_maxlen
+    vsd_log_large_body_sample_rate = (
+        CONF.nuage.nuage_vsd_log_large_body_sample_rate)
+    vsd_cassette_mode = CONF.nuage.nuage_vsd_cassette_mode
+    vsd_cassette = CONF.nuage.nuage_vsd_cassette
+    vsd_bulk_chunk_size = CONF.nuage.nuage_vsd_bulk_chunk_size
+    vsd_metrics_dir = CONF.nuage.nuage_vsd_metrics_dir or None
+    vsd_get_cache = CONF.nuage.nuage_vsd_get_cache
+    vsd_get_cache_max_bytes = CONF.nuage.nuage_vsd_get_cache_max_bytes
+    vsd_get_cache_ttl = CONF.nuage.nuage_vsd_get_cache_ttl
+    vsd_get_cache_ttls = dict(
+        (resource, int(ttl)) for resource, ttl in
+        CONF.nuage.nuage_vsd_get_cache_ttls.items())
+    vsd_filter_max_len = CONF.nuage.nuage_vsd_filter_max_len
+    vsd_push_notifications = CONF.nuage.nuage_vsd_push_notifications
+    vsd_wait_poll_interval = CONF.nuage.nuage_vsd_wait_poll_interval
+    vsd_ancestor_cache_size = CONF.nuage.nuage_vsd_ancestor_cache_size
 
     # - - - - - -
 
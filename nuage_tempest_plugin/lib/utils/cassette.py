@@ -0,0 +1,208 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import random
+import re
+import threading
+import uuid
+
+import six
+
+LOG = logging.getLogger(__name__)
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# request headers which select what the VSD returns
+MATCHED_HEADERS = ('X-Nuage-Filter', 'X-Nuage-FilterType', 'X-Nuage-Page',
+                   'X-Nuage-PageSize', 'X-Nuage-OrderBy')
+
+
+_UUID = re.compile(r'[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}')
+# the random number data_utils.rand_name appends
+_RAND_SUFFIX = re.compile(r'(?<=\w-)\d{5,10}\b')
+_PLACEHOLDER = re.compile(r'<(uuid|rand)-(\d+)>')
+
+
+class CassetteMiss(Exception):
+    """No recorded interaction matches a replayed request"""
+
+
+class _Normalizer(object):
+    """Swaps the values which differ from run to run for placeholders
+
+    UUIDs (Neutron and VSD IDs) and rand_name suffixes become <uuid-N> and
+    <rand-N>, N counting distinct values in order of first appearance. As a
+    test issues its requests in the same order on every run, a value gets
+    the same placeholder in the recording and in the replay. A placeholder
+    of a response which is new to the replay, e.g. the ID of a created
+    object, is given a fresh value of its kind.
+    """
+
+    def __init__(self):
+        self._placeholders = {}  # value -> placeholder
+        self._values = {}  # placeholder -> value
+
+    def _bind(self, placeholder, value):
+        self._placeholders[value] = placeholder
+        self._values[placeholder] = value
+
+    def _placeholder(self, kind, value):
+        placeholder = self._placeholders.get(value)
+        if placeholder is None:
+            placeholder = '<%s-%d>' % (kind, len(self._values))
+            self._bind(placeholder, value)
+        return placeholder
+
+    def _value(self, match):
+        placeholder = match.group(0)
+        value = self._values.get(placeholder)
+        if value is None:
+            value = (str(uuid.uuid4()) if match.group(1) == 'uuid'
+                     else str(random.randint(10000, 0x7fffffff)))
+            self._bind(placeholder, value)
+        return value
+
+    def _normalize_text(self, text):
+        text = _UUID.sub(
+            lambda m: self._placeholder('uuid', m.group(0)), text)
+        return _RAND_SUFFIX.sub(
+            lambda m: self._placeholder('rand', m.group(0)), text)
+
+    def _denormalize_text(self, text):
+        return _PLACEHOLDER.sub(self._value, text)
+
+    def normalize(self, obj):
+        return self._apply(obj, self._normalize_text)
+
+    def denormalize(self, obj):
+        return self._apply(obj, self._denormalize_text)
+
+    def _apply(self, obj, substitute):
+        if isinstance(obj, six.string_types):
+            return substitute(obj)
+        if isinstance(obj, dict):
+            return dict((self._apply(k, substitute),
+                         self._apply(v, substitute))
+                        for k, v in obj.items())
+        if isinstance(obj, list):
+            return [self._apply(item, substitute) for item in obj]
+        return obj
+
+
+class Cassette(object):
+    """Recorded VSD REST interactions
+
+    In record mode, every request/response pair passed to `record()` is kept
+    and written as gzipped JSON on `save()` (and at process exit). In replay
+    mode the file is loaded once and `play()` serves responses from memory.
+
+    Requests are matched on method, resource path, the filtering and paging
+    headers and the JSON body, once normalized: the IDs and random names
+    which differ from run to run are swapped for placeholders, in requests
+    as well as in the recorded responses. Identical requests are answered
+    in the order they were recorded; once exhausted, the last response is
+    repeated.
+    """
+
+    def __init__(self, path, mode):
+        assert mode in (RECORD, REPLAY)
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._interactions = []
+        self._responses = {}
+        self._played = {}
+        self._normalizer = _Normalizer()
+        self._unsaved = False
+        if mode == REPLAY:
+            self._load()
+        else:
+            atexit.register(self.save)
+
+    @property
+    def replaying(self):
+        return self.mode == REPLAY
+
+    @staticmethod
+    def match_key(action, resource, data, extra_headers=None):
+        headers = dict((k.lower(), v) for k, v in (extra_headers or {})
+                       .items())
+        matched = [(h, headers[h.lower()]) for h in MATCHED_HEADERS
+                   if headers.get(h.lower()) is not None]
+        return json.dumps([action.upper(), resource, matched,
+                           data or None], sort_keys=True)
+
+    def _load(self):
+        with gzip.open(self.path, 'rb') as f:
+            self._interactions = json.loads(
+                f.read().decode('utf8'))['interactions']
+        for interaction in self._interactions:
+            self._responses.setdefault(interaction['key'], []).append(
+                interaction['response'])
+        LOG.info('Cassette %s: loaded %d interactions',
+                 self.path, len(self._interactions))
+
+    def record(self, action, resource, data, extra_headers, response):
+        headers = dict((k, v) for k, v in (response.headers or {}).items()
+                       if k.lower().startswith('x-nuage-') or
+                       k.lower() in ('content-type', 'retry-after'))
+        body = response.data
+        if isinstance(body, six.binary_type):
+            body = body.decode('utf8', 'replace')
+        key = self.match_key(action, resource, data, extra_headers)
+        with self._lock:
+            normalize = self._normalizer.normalize
+            self._interactions.append({
+                'key': normalize(key),
+                'response': {'status': response.status,
+                             'reason': response.reason,
+                             'headers': normalize(headers),
+                             'data': normalize(body)}})
+            self._unsaved = True
+
+    def play(self, action, resource, data, extra_headers=None):
+        """Returns a (status, reason, data, headers) tuple"""
+        key = self.match_key(action, resource, data, extra_headers)
+        with self._lock:
+            key = self._normalizer.normalize(key)
+            responses = self._responses.get(key)
+            if not responses:
+                raise CassetteMiss('No recorded response for %s' % key)
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+            response = self._normalizer.denormalize(
+                responses[min(index, len(responses) - 1)])
+        return (response['status'], response['reason'], response['data'],
+                dict(response['headers']))
+
+    def save(self):
+        with self._lock:
+            if not self._unsaved:
+                return
+            interactions = list(self._interactions)
+            self._unsaved = False
+        tmp = '%s.%d' % (self.path, os.getpid())
+        with gzip.open(tmp, 'wb') as f:
+            f.write(json.dumps({'version': 2, 'interactions': interactions},
+                               separators=(',', ':')).encode('utf8'))
+        os.rename(tmp, self.path)
+
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path, mode):
+    """Returns the process-wide cassette for path"""
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = Cassette(path, mode)
+            _cassettes[path] = cassette
+        return cassette
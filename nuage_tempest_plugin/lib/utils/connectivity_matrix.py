@@ -0,0 +1,152 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# Checks many source -> destination connectivity expectations at once, e.g.
+#
+#     matrix = ConnectivityMatrix(probe, workers=8, timeout=60)
+#     result = matrix.run({(vm1, vm2): True, (vm1, vm3): False, ...})
+#     if not result.ok:
+#         fail(result.report())
+#
+# probe(source, destination, should_pass) tries once and returns whether
+# destination was reached, along with the probe output. All pairs are
+# probed concurrently, by at most workers at a time, each pair being retried
+# on its own till it gives the expected outcome or timeout expires.
+# A probe raising is an error rather than an unreachable destination, and
+# never as expected, so that a broken console does not pass for isolation.
+
+import collections
+from concurrent import futures
+import re
+import time
+
+WORKERS = 8
+TIMEOUT = 60
+INTERVAL = 1
+
+# rtt min/avg/max/mdev = 0.301/0.412/0.520/0.089 ms (round-trip on busybox)
+_RTT = re.compile(r'(?:rtt|round-trip) min/avg/max\S* = '
+                  r'[\d.]+/([\d.]+)/[\d.]+')
+
+
+def name_of(endpoint):
+    return getattr(endpoint, 'name', None) or str(endpoint)
+
+
+def rtt_of(output):
+    """Returns the average round trip time in ms a ping output tells"""
+    match = _RTT.search(output or '')
+    return float(match.group(1)) if match else None
+
+
+class PairResult(object):
+    """Outcome of probing one source -> destination pair
+
+    :ivar reachable: whether the final probe reached the destination, None
+                     if it raised
+    :ivar error: what the final probe raised, if it did
+    :ivar elapsed: seconds till the final outcome
+    :ivar rtt: average round trip time in ms of the final probe, when it
+               passed and told
+    """
+
+    def __init__(self, source, destination, expected):
+        self.source = source
+        self.destination = destination
+        self.expected = bool(expected)
+        self.reachable = None
+        self.attempts = 0
+        self.elapsed = None
+        self.rtt = None
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.reachable == self.expected
+
+    def __str__(self):
+        def verdict(reachable):
+            return 'pass' if reachable else 'fail'
+        text = '%s -> %s: expected %s, got %s after %d attempt(s) in %.1fs' % (
+            name_of(self.source), name_of(self.destination),
+            verdict(self.expected),
+            'error' if self.error else verdict(self.reachable),
+            self.attempts, self.elapsed or 0)
+        if self.rtt is not None:
+            text += ', rtt %.3f ms' % self.rtt
+        if self.error:
+            text += ' (%s)' % self.error
+        return text
+
+
+class MatrixResult(object):
+    """PairResults by (source, destination), in the order requested"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def __getitem__(self, pair):
+        return self.results[pair]
+
+    @property
+    def ok(self):
+        return all(r.ok for r in self.results.values())
+
+    def diff(self):
+        """Returns the PairResults which differ from the expectation"""
+        return [r for r in self.results.values() if not r.ok]
+
+    def report(self):
+        lines = ['%d of %d pairs as expected' % (
+            len(self.results) - len(self.diff()), len(self.results))]
+        lines.extend(('  ' if r.ok else '! ') + str(r)
+                     for r in self.results.values())
+        return '\n'.join(lines)
+
+
+class ConnectivityMatrix(object):
+
+    def __init__(self, probe, workers=WORKERS, timeout=TIMEOUT,
+                 interval=INTERVAL):
+        self.probe = probe
+        self.workers = workers
+        self.timeout = timeout
+        self.interval = interval
+
+    def _check(self, result):
+        start = time.time()
+        while True:
+            result.attempts += 1
+            try:
+                reachable, output = self.probe(
+                    result.source, result.destination, result.expected)
+                result.reachable = bool(reachable)
+                result.error = None
+            except Exception as e:
+                reachable, output = None, None
+                result.reachable = None
+                result.error = e
+            result.elapsed = time.time() - start
+            if result.ok or result.elapsed >= self.timeout:
+                result.rtt = rtt_of(output) if reachable else None
+                return result
+            time.sleep(min(self.interval, self.timeout - result.elapsed))
+
+    def run(self, expected):
+        """Probes all pairs of expected, a {(source, destination): bool}
+
+        :returns: MatrixResult
+        """
+        pairs = list(expected.items())
+        results = [PairResult(source, destination, should_pass)
+                   for (source, destination), should_pass in pairs]
+        executor = futures.ThreadPoolExecutor(
+            max_workers=max(1, min(self.workers, len(results))))
+        try:
+            for checked in [executor.submit(self._check, result)
+                            for result in results]:
+                checked.result()
+        finally:
+            executor.shutdown(wait=True)
+        return MatrixResult(collections.OrderedDict(
+            ((r.source, r.destination), r) for r in results))
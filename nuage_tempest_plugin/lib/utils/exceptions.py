@@ -71,3 +71,16 @@ class InvalidHTTPResponseBody(NuageRestClientException):
 
 class UnexpectedResponseCode(NuageRestClientException):
     message = "Unexpected response code received"
+
+
+class BulkError(NuageRestClientException):
+    message = "%(failed)d out of %(total)d bulk operations failed"
+
+    def __init__(self, results, errors):
+        super(BulkError, self).__init__(
+            *['item %d: %s' % (index, error) for index, error in errors],
+            failed=len(errors), total=len(results))
+        # per item, in request order: the result or the exception raised
+        self.results = results
+        # (index, exception) tuples for the failed items
+        self.errors = errors
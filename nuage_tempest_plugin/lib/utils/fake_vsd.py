@@ -0,0 +1,591 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# In-process stand-in for the VSD REST API, to load-test and profile the
+# plugin's VSD client stack (NuageRestClient, VsdHelper, vspk) without a real
+# VSD. Objects of any resource type live in memory; the parent/child layout
+# follows the REST paths, e.g. POST /enterprises/<id>/domains creates a domain
+# under that enterprise and GET /domains/<id>/vports lists its vports.
+#
+#     with FakeVSD(latency=0.005, error_rate=0.01) as vsd:
+#         proxy = RESTProxyServer(vsd.address, vsd.base_uri, False, ...)
+#
+# Supported: the /me authentication resource, predicate filters
+# (X-Nuage-Filter with IS, ==, !=, LIKE, BEGINSWITH, <, >, AND, OR and
+# parentheses), paging (X-Nuage-Page / X-Nuage-PageSize / X-Nuage-Count),
+# HEAD for counting, bulk create/update/delete through a list body, conflicts
+# on creating an object under an ID in use, and "<entity> is in use"
+# conflicts when deleting an object with vports below it unless
+# ?responseChoice=1 is given, and the /events push notification long poll.
+
+import collections
+import datetime
+import json
+import os
+import random
+import re
+import shutil
+import ssl
+import tempfile
+import threading
+import time
+import uuid
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib import parse as urlparse
+
+from nuage_tempest_plugin.lib.utils import vsd_events
+
+try:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+except ImportError:
+    x509 = None  # https not available
+
+BASE_URI = '/nuage/api/v5_0'
+AUTH_RESOURCE = 'me'
+EVENTS_RESOURCE = 'events'
+
+# deleting an object is refused while any of these is below it
+IN_USE_TYPES = ('vports',)
+
+# listing a collection below one of these lists all of it in there, e.g. the
+# vports of all subnets of a domain
+AGGREGATING = ('domains', 'l2domains')
+
+
+class FilterError(ValueError):
+    pass
+
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<lparen>\()|(?P<rparen>\))|
+    (?P<op>==|!=|<=|>=|<|>)|
+    (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")|
+    (?P<word>[^\s()'"=!<>]+))""", re.VERBOSE)
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match:
+            raise FilterError('Invalid filter near: %s' % text[pos:])
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = re.sub(r'\\(.)', r'\1', value[1:-1])
+        elif kind == 'word':
+            upper = value.upper()
+            if upper in ('AND', 'OR', 'IS', 'NOT', 'ISNOT', 'LIKE',
+                         'BEGINSWITH', 'ENDSWITH'):
+                kind, value = 'keyword', upper
+            elif upper in ('TRUE', 'FALSE'):
+                kind, value = 'literal', upper == 'TRUE'
+            elif upper == 'NULL':
+                kind, value = 'literal', None
+            elif re.match(r'^-?\d+$', value) and tokens and \
+                    tokens[-1][0] in ('op', 'keyword'):
+                kind, value = 'literal', int(value)
+        tokens.append((kind, value))
+    return tokens
+
+
+def _equals(actual, expected):
+    if isinstance(actual, bool) or isinstance(expected, bool):
+        return actual is expected or str(actual).lower() == \
+            str(expected).lower()
+    if type(actual) is not type(expected) and None not in (actual, expected):
+        return str(actual) == str(expected)
+    return actual == expected
+
+
+def _compare(actual, op, expected):
+    if op in ('IS', '=='):
+        return _equals(actual, expected)
+    if op in ('ISNOT', '!='):
+        return not _equals(actual, expected)
+    if actual is None:
+        return False
+    if op == 'LIKE':
+        return str(expected).lower() in str(actual).lower()
+    if op == 'BEGINSWITH':
+        return str(actual).startswith(str(expected))
+    if op == 'ENDSWITH':
+        return str(actual).endswith(str(expected))
+    try:
+        actual, expected = float(actual), float(expected)
+    except (TypeError, ValueError):
+        actual, expected = str(actual), str(expected)
+    return {'<': actual < expected, '>': actual > expected,
+            '<=': actual <= expected, '>=': actual >= expected}[op]
+
+
+class Predicate(object):
+    """Compiled VSD predicate filter"""
+
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.tree = self._expression()
+        if self.pos != len(self.tokens):
+            raise FilterError('Unexpected %s in filter' %
+                              (self.tokens[self.pos][1],))
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else \
+            (None, None)
+
+    def _next(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def _expression(self):
+        node = self._term()
+        while self._peek() == ('keyword', 'OR'):
+            self._next()
+            node = ('OR', node, self._term())
+        return node
+
+    def _term(self):
+        node = self._factor()
+        while self._peek() == ('keyword', 'AND'):
+            self._next()
+            node = ('AND', node, self._factor())
+        return node
+
+    def _factor(self):
+        kind, value = self._next()
+        if kind == 'lparen':
+            node = self._expression()
+            if self._next()[0] != 'rparen':
+                raise FilterError('Missing closing parenthesis')
+            return node
+        if kind != 'word':
+            raise FilterError('Attribute expected, got %s' % (value,))
+        attribute = value
+        kind, op = self._next()
+        if kind not in ('op', 'keyword'):
+            raise FilterError('Operator expected after %s' % attribute)
+        if op == 'IS' and self._peek() == ('keyword', 'NOT'):
+            self._next()
+            op = 'ISNOT'
+        kind, operand = self._next()
+        if kind not in ('string', 'literal', 'word'):
+            raise FilterError('Value expected after %s %s' % (attribute, op))
+        return ('CMP', attribute, op, operand)
+
+    def _evaluate(self, node, obj):
+        if node[0] == 'OR':
+            return self._evaluate(node[1], obj) or self._evaluate(node[2], obj)
+        if node[0] == 'AND':
+            return (self._evaluate(node[1], obj) and
+                    self._evaluate(node[2], obj))
+        _, attribute, op, operand = node
+        return _compare(obj.get(attribute), op, operand)
+
+    def __call__(self, obj):
+        return self._evaluate(self.tree, obj)
+
+
+class FakeVSDError(Exception):
+    def __init__(self, status, description):
+        super(FakeVSDError, self).__init__(description)
+        self.status = status
+        self.description = description
+
+    def body(self):
+        return {'errors': [{'property': '',
+                            'descriptions': [{'title': self.description,
+                                              'description':
+                                                  self.description}]}],
+                'internalErrorCode': self.status}
+
+
+class FakeVSDStore(object):
+    """Thread-safe in-memory VSD object tree"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # all in creation order, which is the order objects are listed in
+        self.objects = collections.OrderedDict()   # ID -> object dict
+        self.types = collections.OrderedDict()     # ID -> resource name
+        self.children = {}  # ID -> OrderedDict of child IDs
+        self.events = []
+        self._events_cond = threading.Condition(self._lock)
+
+    def _notify(self, event_type, resource, obj):
+        # with the lock held
+        self.events.append({'type': event_type,
+                            'entityType': vsd_events.entity_type(resource),
+                            'entities': [dict(obj)]})
+        self._events_cond.notify_all()
+
+    def wait_events(self, after, timeout):
+        """Returns the events past the first after ones
+
+        Waits up to timeout seconds for one when there is none yet.
+        """
+        with self._lock:
+            if len(self.events) <= after:
+                self._events_cond.wait(timeout)
+            return self.events[after:]
+
+    def create(self, resource, attributes, parent_resource=None,
+               parent_id=None):
+        with self._lock:
+            if parent_id is not None and parent_id not in self.objects:
+                raise FakeVSDError(404, 'Parent %s not found' % parent_id)
+            if attributes.get('ID') in self.objects:
+                raise FakeVSDError(
+                    409, 'Object %s already exists' % attributes['ID'])
+            now = int(time.time() * 1000)
+            obj = dict(attributes)
+            obj.update({
+                'ID': obj.get('ID') or str(uuid.uuid4()),
+                'parentID': parent_id,
+                'parentType': (vsd_events.entity_type(parent_resource)
+                               if parent_resource else None),
+                'creationDate': now,
+                'lastUpdatedDate': now,
+                'entityScope': 'ENTERPRISE'})
+            obj.setdefault('externalID', None)
+            self.objects[obj['ID']] = obj
+            self.types[obj['ID']] = resource
+            if parent_id is not None:
+                self.children.setdefault(
+                    parent_id, collections.OrderedDict())[obj['ID']] = None
+            self._notify('CREATE', resource, obj)
+            return dict(obj)
+
+    def get(self, resource, obj_id):
+        with self._lock:
+            if self.types.get(obj_id) != resource:
+                raise FakeVSDError(404, 'Object %s not found' % obj_id)
+            return dict(self.objects[obj_id])
+
+    def update(self, resource, obj_id, attributes):
+        with self._lock:
+            obj = self.objects.get(obj_id)
+            if obj is None or self.types[obj_id] != resource:
+                raise FakeVSDError(404, 'Object %s not found' % obj_id)
+            for protected in ('ID', 'parentID', 'parentType'):
+                attributes.pop(protected, None)
+            obj.update(attributes)
+            obj['lastUpdatedDate'] = int(time.time() * 1000)
+            self._notify('UPDATE', resource, obj)
+
+    def _subtree(self, obj_id):
+        stack = [obj_id]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(self.children.get(current, ()))
+
+    def delete(self, resource, obj_id, cascade=False):
+        with self._lock:
+            if self.types.get(obj_id) != resource:
+                raise FakeVSDError(404, 'Object %s not found' % obj_id)
+            subtree = list(self._subtree(obj_id))
+            if not cascade and any(self.types[i] in IN_USE_TYPES
+                                   for i in subtree[1:]):
+                raise FakeVSDError(
+                    409, '%s is in use' % vsd_events.entity_type(resource))
+            parent_id = self.objects[obj_id]['parentID']
+            if parent_id in self.children:
+                self.children[parent_id].pop(obj_id, None)
+            for i in subtree:
+                self._notify('DELETE', self.types[i], self.objects[i])
+                del self.objects[i]
+                del self.types[i]
+                self.children.pop(i, None)
+
+    def list(self, resource, parent_id=None):
+        with self._lock:
+            if parent_id is None:
+                ids = [i for i, t in self.types.items() if t == resource]
+            else:
+                if parent_id not in self.objects:
+                    raise FakeVSDError(404, 'Object %s not found' % parent_id)
+                ids = [i for i in self._below(parent_id)
+                       if self.types[i] == resource]
+            return [dict(self.objects[i]) for i in ids]
+
+    def _below(self, parent_id):
+        """The children of parent_id, or all descendants of a domain"""
+        if self.types.get(parent_id) not in AGGREGATING:
+            return list(self.children.get(parent_id, ()))
+        below = []
+        pending = list(self.children.get(parent_id, ()))
+        while pending:
+            obj_id = pending.pop(0)
+            below.append(obj_id)
+            pending.extend(self.children.get(obj_id, ()))
+        return below
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    # headers and body are written separately, don't let Nagle delay them
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _handle(self):
+        self.server.fake_vsd.handle(self)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _handle
+
+
+class _HTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class FakeVSD(object):
+    """Local fake VSD REST server
+
+    :param latency: seconds added to every request, or a callable returning
+                    them
+    :param error_rate: fraction of requests answered by a 503
+    :param seed: seed of the random picking of those, for reproducible runs
+    :param retry_after: Retry-After header value sent along with the 503s
+    :param use_ssl: serve https with a throw-away self-signed certificate
+    :param enterprises: names of the enterprises which exist from the start
+    :param event_timeout: seconds an /events long poll is held when nothing
+                          happens
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, base_uri=BASE_URI,
+                 latency=0, error_rate=0, seed=None, retry_after=None,
+                 use_ssl=False,
+                 enterprises=('OpenStackDefaultNetPartition',),
+                 event_timeout=5):
+        self.base_uri = base_uri
+        self.event_timeout = event_timeout
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.retry_after = retry_after
+        self.store = FakeVSDStore()
+        self.requests = {}  # (method, resource) -> count
+        self.injected_errors = 0
+        self._stats_lock = threading.Lock()
+        self.csp = self.store.create('enterprises', {'name': 'csp'})
+        for name in enterprises:
+            self.store.create('enterprises', {'name': name})
+        self._server = _HTTPServer((host, port), _Handler)
+        self._server.fake_vsd = self
+        self._cert_dir = None
+        if use_ssl:
+            self._wrap_ssl()
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return '%s:%s' % (host, port)
+
+    def _wrap_ssl(self):
+        if x509 is None:
+            raise RuntimeError('https requires the cryptography package')
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME,
+                                             u'fake-vsd')])
+        now = datetime.datetime.utcnow()
+        cert = (x509.CertificateBuilder()
+                .subject_name(name).issuer_name(name)
+                .public_key(key.public_key())
+                .serial_number(x509.random_serial_number())
+                .not_valid_before(now)
+                .not_valid_after(now + datetime.timedelta(days=1))
+                .sign(key, hashes.SHA256()))
+        self._cert_dir = tempfile.mkdtemp()
+        cert_file = os.path.join(self._cert_dir, 'cert.pem')
+        with open(cert_file, 'wb') as f:
+            f.write(key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.TraditionalOpenSSL,
+                serialization.NoEncryption()))
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file)
+        self._server.socket = context.wrap_socket(self._server.socket,
+                                                  server_side=True)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._cert_dir:
+            shutil.rmtree(self._cert_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # - - - - - -
+
+    @staticmethod
+    def _respond(request, status, body=None, headers=None):
+        payload = b''
+        if body is not None:
+            payload = json.dumps(body).encode('utf8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        for header, value in (headers or {}).items():
+            request.send_header(header, str(value))
+        request.send_header('Content-Length',
+                            0 if request.command == 'HEAD' else len(payload))
+        request.end_headers()
+        if request.command != 'HEAD' and payload:
+            request.wfile.write(payload)
+
+    def _count(self, method, resource):
+        with self._stats_lock:
+            key = (method, resource)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def handle(self, request):
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+        length = int(request.headers.get('Content-Length') or 0)
+        raw_body = request.rfile.read(length) if length else b''
+        if self.error_rate and self.random.random() < self.error_rate:
+            with self._stats_lock:
+                self.injected_errors += 1
+            headers = ({'Retry-After': self.retry_after}
+                       if self.retry_after is not None else None)
+            return self._respond(request, 503, headers=headers)
+
+        url = urlparse.urlparse(request.path)
+        path = url.path
+        if path.startswith(self.base_uri):
+            path = path[len(self.base_uri):]
+        segments = [s for s in path.split('/') if s]
+        cascade = 'responseChoice=1' in (url.query or '')
+        try:
+            body = json.loads(raw_body.decode('utf8')) if raw_body else None
+        except ValueError:
+            body = None
+        if segments:
+            self._count(request.command,
+                        segments[-1] if len(segments) % 2 else segments[-2])
+        try:
+            if segments == [EVENTS_RESOURCE]:
+                return self._respond(request, 200, self._events(url.query))
+            status, result, headers = self._dispatch(
+                request, segments, body, cascade)
+        except FakeVSDError as e:
+            return self._respond(request, e.status, e.body())
+        except FilterError as e:
+            return self._respond(request, 400,
+                                 FakeVSDError(400, str(e)).body())
+        return self._respond(request, status, result, headers)
+
+    def _dispatch(self, request, segments, body, cascade):
+        method = request.command
+        if segments == [AUTH_RESOURCE]:
+            return 200, [{'ID': str(uuid.uuid4()),
+                          'APIKey': str(uuid.uuid4()),
+                          'APIKeyExpiry': int((time.time() + 3600) * 1000),
+                          'enterpriseID': self.csp['ID'],
+                          'enterpriseName': 'csp',
+                          'userName': 'csproot',
+                          'role': 'CSPROOT'}], None
+        if len(segments) == 2:
+            resource, obj_id = segments
+            if method in ('GET', 'HEAD'):
+                return 200, [self.store.get(resource, obj_id)], None
+            if method == 'PUT':
+                self.store.update(resource, obj_id, body or {})
+                return 204, None, None
+            if method == 'DELETE':
+                self.store.delete(resource, obj_id, cascade)
+                return 204, None, None
+            raise FakeVSDError(405, 'Method not allowed')
+
+        if len(segments) == 1:
+            parent_resource, parent_id, resource = None, None, segments[0]
+        elif len(segments) == 3:
+            parent_resource, parent_id, resource = segments
+        else:
+            raise FakeVSDError(404, 'Unknown resource')
+
+        if method in ('GET', 'HEAD'):
+            return self._list(request, resource, parent_id)
+        if method == 'POST':
+            return self._create(resource, body, parent_resource, parent_id)
+        if method in ('PUT', 'DELETE') and isinstance(body, list):
+            return self._bulk(method, resource, body, cascade)
+        raise FakeVSDError(405, 'Method not allowed')
+
+    def _events(self, query):
+        # the uuid handed out is the number of events seen so far
+        seen = urlparse.parse_qs(query or '').get('uuid')
+        if not seen:
+            return {'uuid': str(len(self.store.events)), 'events': []}
+        seen = int(seen[0])
+        events = self.store.wait_events(seen, self.event_timeout)
+        return {'uuid': str(seen + len(events)), 'events': events}
+
+    def _list(self, request, resource, parent_id):
+        objs = self.store.list(resource, parent_id)
+        predicate = request.headers.get('X-Nuage-Filter')
+        if predicate:
+            matches = Predicate(predicate)
+            objs = [o for o in objs if matches(o)]
+        count = len(objs)
+        headers = {'X-Nuage-Count': count}
+        page_size = request.headers.get('X-Nuage-PageSize')
+        if page_size is not None:
+            page = int(request.headers.get('X-Nuage-Page') or 0)
+            page_size = int(page_size)
+            objs = objs[page * page_size:(page + 1) * page_size]
+            headers.update({'X-Nuage-Page': page,
+                            'X-Nuage-PageSize': page_size})
+        return 200, objs if request.command == 'GET' else None, headers
+
+    def _create(self, resource, body, parent_resource, parent_id):
+        if isinstance(body, list):
+            results = []
+            for attributes in body:
+                try:
+                    results.append({'status': 201, 'data': self.store.create(
+                        resource, attributes, parent_resource, parent_id)})
+                except FakeVSDError as e:
+                    results.append({'status': e.status, 'data': e.body()})
+            return 207, results, None
+        return 201, [self.store.create(resource, body or {},
+                                       parent_resource, parent_id)], None
+
+    def _bulk(self, method, resource, body, cascade):
+        results = []
+        for item in body:
+            obj_id = item.get('ID') if isinstance(item, dict) else item
+            try:
+                if method == 'PUT':
+                    self.store.update(resource, obj_id, dict(item))
+                else:
+                    self.store.delete(resource, obj_id, cascade)
+                results.append({'status': 204, 'ID': obj_id})
+            except FakeVSDError as e:
+                results.append({'status': e.status, 'ID': obj_id,
+                                'data': e.body()})
+        return 207, results, None
@@ -0,0 +1,151 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# SSH client keeping its authenticated connection open across commands,
+# e.g.
+#
+#     client = PersistentSSHClient.from_client(remote_client.ssh_client)
+#     client.exec_command('ip a')  # connects
+#     client.exec_command('ip r')  # new channel on the same connection
+#     client.close()
+#
+# tempest's ssh.Client connects, exchanges keys and authenticates for every
+# single command. Here every command gets its own channel on one transport,
+# which concurrent callers share; a broken connection is set up again.
+# A command is only sent again when the connection broke before the command
+# itself could be sent, i.e. before its channel was opened, as running it
+# twice may not be harmless.
+
+import logging
+import socket
+import threading
+
+import paramiko
+
+from tempest.lib.common import ssh
+
+LOG = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_counters = {'handshakes': 0, 'commands': 0, 'reconnects': 0}
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+def stats():
+    with _lock:
+        counters = dict(_counters)
+    counters['handshakes_avoided'] = max(
+        0, counters['commands'] - counters['handshakes'])
+    return counters
+
+
+class _Transport(object):
+    """Transport calling on_session once a session channel is open"""
+
+    def __init__(self, transport, on_session):
+        self._transport = transport
+        self._on_session = on_session
+
+    def open_session(self, *args, **kwargs):
+        channel = self._transport.open_session(*args, **kwargs)
+        self._on_session()
+        return channel
+
+    def __getattr__(self, name):
+        return getattr(self._transport, name)
+
+
+class _SharedConnection(object):
+    """The connection as handed to ssh.Client, which closes it after use"""
+
+    def __init__(self, connection, on_session):
+        self._connection = connection
+        self._on_session = on_session
+
+    def get_transport(self):
+        return _Transport(self._connection.get_transport(), self._on_session)
+
+    def close(self):
+        pass
+
+
+class PersistentSSHClient(ssh.Client):
+
+    def __init__(self, *args, **kwargs):
+        super(PersistentSSHClient, self).__init__(*args, **kwargs)
+        self._connection = None
+        self._connect_lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def from_client(cls, client):
+        """Returns a PersistentSSHClient to where client connects"""
+        kwargs = {}
+        if getattr(client, 'proxy_client', None):
+            kwargs['proxy_client'] = client.proxy_client
+        persistent = cls(client.host, client.username, client.password,
+                         client.timeout, pkey=client.pkey,
+                         channel_timeout=client.channel_timeout,
+                         look_for_keys=client.look_for_keys,
+                         key_filename=client.key_filename, port=client.port,
+                         **kwargs)
+        if hasattr(client, 'ssh_allow_agent'):
+            persistent.ssh_allow_agent = client.ssh_allow_agent
+        return persistent
+
+    def _get_ssh_connection(self, *args, **kwargs):
+        with self._connect_lock:
+            transport = (self._connection and
+                         self._connection.get_transport())
+            if not transport or not transport.is_active():
+                if self._connection:
+                    self._connection.close()
+                self._connection = super(
+                    PersistentSSHClient, self)._get_ssh_connection(
+                    *args, **kwargs)
+                _count('handshakes')
+            return _SharedConnection(self._connection, self._session_opened)
+
+    def _session_opened(self):
+        self._local.session_opened = True
+
+    def _drop(self, connection):
+        with self._connect_lock:
+            if self._connection is connection:
+                self._connection.close()
+                self._connection = None
+
+    def exec_command(self, cmd, *args, **kwargs):
+        _count('commands')
+        connection = self._connection
+        self._local.session_opened = False
+        try:
+            return super(PersistentSSHClient, self).exec_command(
+                cmd, *args, **kwargs)
+        except (EOFError, socket.error, paramiko.SSHException) as e:
+            if connection is None:
+                # it was a new connection already
+                raise
+            if self._local.session_opened:
+                # the command may have run already
+                self._drop(connection)
+                raise
+            LOG.info('SSH connection to %s@%s broke (%s), reconnecting',
+                     self.username, self.host, e)
+            _count('reconnects')
+            self._drop(connection)
+            return super(PersistentSSHClient, self).exec_command(
+                cmd, *args, **kwargs)
+
+    def test_connection_auth(self):
+        self._get_ssh_connection()
+
+    def close(self):
+        with self._connect_lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,173 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# Waits for a booted server to be usable, rather than for a fixed time, e.g.
+#
+#     prober = ReadinessProber()
+#     prober.wait(servers_client, server_id, image_id, ip_address=fip)
+#
+# A server is ready once its SSH server answers on ip_address, when given,
+# or once its console log shows a login prompt or the end of cloud-init.
+# Probing starts fast and backs off; for images seen before, the first
+# probe is only done once about as much time passed as these took at best.
+# When there is nothing to probe at all, e.g. baremetal servers without
+# console log nor FIP, it falls back to waiting FALLBACK_DELAY seconds.
+
+import logging
+import re
+import socket
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+# login prompt of most images, and the cloud-init final message
+CONSOLE_MARKERS = (r'login:\s*$', r'Cloud-init v\. \S+ finished')
+CONSOLE_LINES = 50
+
+TIMEOUT = 120
+MIN_INTERVAL = 0.5
+MAX_INTERVAL = 5.0
+BACKOFF = 1.5
+SSH_PORT = 22
+SSH_PROBE_TIMEOUT = 2
+FALLBACK_DELAY = 5
+
+
+def ssh_ready(ip_address, port=SSH_PORT, timeout=SSH_PROBE_TIMEOUT):
+    """Returns whether an SSH server answers on ip_address
+
+    Only reads its banner, which the SSH server sends right away; no key
+    exchange nor authentication is done.
+    """
+    try:
+        sock = socket.create_connection((ip_address, port), timeout)
+    except (socket.error, socket.timeout):
+        return False
+    try:
+        return sock.recv(64).startswith(b'SSH-')
+    except (socket.error, socket.timeout):
+        return False
+    finally:
+        sock.close()
+
+
+class _ImageStats(object):
+
+    def __init__(self):
+        self.count = 0
+        self.timeouts = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def as_dict(self):
+        return {'count': self.count, 'timeouts': self.timeouts,
+                'min': self.min, 'max': self.max,
+                'mean': self.total / self.count if self.count else None}
+
+
+class ReadinessProber(object):
+    """Waits for servers to be usable, keeping readiness times per image"""
+
+    def __init__(self, markers=CONSOLE_MARKERS, timeout=TIMEOUT,
+                 min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        self.markers = [re.compile(m, re.MULTILINE) for m in markers]
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._images = {}  # image ID -> _ImageStats
+
+    def _image_stats(self, image_id):
+        with self._lock:
+            if image_id not in self._images:
+                self._images[image_id] = _ImageStats()
+            return self._images[image_id]
+
+    def console_ready(self, servers_client, server_id):
+        """Returns whether the console log shows a marker
+
+        None when there is no console log to look at.
+        """
+        try:
+            output = servers_client.get_console_output(
+                server_id, length=CONSOLE_LINES)['output']
+        except Exception as e:
+            LOG.debug('No console log of server %s: %s', server_id, e)
+            return None
+        if not output:
+            return False
+        return any(marker.search(output) for marker in self.markers)
+
+    def wait(self, servers_client, server_id, image_id=None,
+             ip_address=None, timeout=None):
+        """Waits for a server to be ready
+
+        Returns the seconds it took, or None when it didn't get ready within
+        timeout seconds; that is left for whatever uses the server next to
+        find out, so only logged.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        stats = self._image_stats(image_id)
+        start = time.time()
+        if stats.min:
+            # no need to ask earlier than it ever took
+            time.sleep(min(stats.min, timeout) * 0.8)
+        interval = self.min_interval
+        console = True
+        while True:
+            ready = False
+            if ip_address:
+                ready = ssh_ready(ip_address)
+            if not ready and console:
+                ready = self.console_ready(servers_client, server_id)
+                if ready is None:
+                    console = False
+            if not ip_address and not console:
+                LOG.info('Nothing to probe server %s for readiness, '
+                         'waiting %ss', server_id, FALLBACK_DELAY)
+                time.sleep(FALLBACK_DELAY)
+                return None
+            elapsed = time.time() - start
+            if ready:
+                with self._lock:
+                    stats.add(elapsed)
+                LOG.info('Server %s ready after %.1fs', server_id, elapsed)
+                return elapsed
+            if elapsed >= timeout:
+                with self._lock:
+                    stats.timeouts += 1
+                LOG.warning('Server %s not found ready within %ss',
+                            server_id, timeout)
+                return None
+            time.sleep(min(interval, timeout - elapsed))
+            interval = min(interval * BACKOFF, self.max_interval)
+
+    def wait_for_ssh(self, ip_address, timeout=None):
+        """Waits for an SSH server to answer on ip_address
+
+        Returns whether it did within timeout seconds.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        interval = self.min_interval
+        while not ssh_ready(ip_address):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * BACKOFF, self.max_interval)
+        return True
+
+    def stats(self):
+        """Readiness times per image"""
+        with self._lock:
+            return dict((image_id or 'unknown', stats.as_dict())
+                        for image_id, stats in self._images.items())
@@ -0,0 +1,93 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+
+import itertools
+import json
+import threading
+
+import six
+
+MAX_BODY_LEN = 5000
+LARGE_BODY_SAMPLE_RATE = 10  # log 1 out of that many truncated bodies
+
+_local = threading.local()
+_large_bodies = itertools.count()
+
+
+def set_test_caller(caller_name):
+    """Declares the test (or test class) issuing requests in this thread
+
+    While set, request logs name this caller rather than walking the stack
+    for every request. Pass None to clear.
+    """
+    _local.caller_name = caller_name
+
+
+def get_test_caller():
+    caller_name = getattr(_local, 'caller_name', None)
+    if caller_name is None:
+        from tempest.lib.common.utils import test_utils
+        caller_name = test_utils.find_test_caller()
+    return caller_name
+
+
+def truncated_text(body, maxlen=MAX_BODY_LEN):
+    """Returns a (text, truncated) tuple for body, up to maxlen characters
+
+    Structures are serialized incrementally, so only the part of a large
+    body which ends up in the log is ever converted to text.
+    """
+    if body is None:
+        return '', False
+    if isinstance(body, six.binary_type):
+        text = body[:maxlen + 1].decode('utf8', 'replace')
+    elif isinstance(body, six.string_types):
+        text = body[:maxlen + 1]
+    else:
+        chunks = []
+        size = 0
+        try:
+            for chunk in json.JSONEncoder().iterencode(body):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > maxlen:
+                    break
+        except (TypeError, ValueError):
+            chunks = [six.text_type(body)[:maxlen + 1]]
+        text = ''.join(chunks)
+    if len(text) > maxlen:
+        return text[:maxlen], True
+    return text, False
+
+
+@six.python_2_unicode_compatible
+class LazyBody(object):
+    """Request or response body which is only rendered when logged
+
+    Pass it as a logging argument: nothing is serialized when the log level
+    is disabled. Bodies exceeding maxlen are truncated, and only one out of
+    `sample_rate` of them is logged at all; only those count towards the
+    sampling. Whether this one is, is decided on its first rendering, which
+    all its renderings reuse.
+    """
+
+    def __init__(self, body, maxlen=MAX_BODY_LEN,
+                 sample_rate=LARGE_BODY_SAMPLE_RATE):
+        self.body = body
+        self.maxlen = maxlen
+        self.sample_rate = sample_rate
+        self._text = None
+
+    def _sampled(self):
+        return (self.sample_rate <= 1 or
+                not next(_large_bodies) % self.sample_rate)
+
+    def __str__(self):
+        if self._text is None:
+            text, truncated = truncated_text(self.body, self.maxlen)
+            if truncated and not self._sampled():
+                text = u'<large body not sampled>'
+            elif isinstance(text, six.binary_type):
+                text = text.decode('utf8', 'replace')
+            self._text = text
+        return self._text
@@ -0,0 +1,140 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+
+import collections
+import json
+import threading
+import time
+
+import six
+
+# request headers which select what a GET returns
+KEY_HEADERS = ('X-Nuage-Filter', 'X-Nuage-FilterType', 'X-Nuage-Page',
+               'X-Nuage-PageSize', 'X-Nuage-OrderBy')
+
+
+def _segments(path):
+    return [segment for segment in path.split('?', 1)[0].split('/')
+            if segment]
+
+
+def _resource(segments):
+    """Returns the resource type of a path
+
+    That is vports for /vports, /domains/<id>/vports as well as /vports/<id>.
+    """
+    if len(segments) % 2:
+        return segments[-1]
+    return segments[-2] if segments else None
+
+
+class ResponseCache(object):
+    """Read-through cache for VSD GET responses
+
+    Entries are keyed by path and filtering/paging headers, expire after the
+    TTL of their resource type and are evicted least recently used first
+    once their total size exceeds max_bytes. Responses are kept serialized,
+    so every hit returns a fresh copy the caller is free to modify.
+
+    A write on a path drops all entries on that path, its ancestors and its
+    descendants, as well as all listings of the written resource type under
+    other parents (e.g. a POST on /zones/<id>/subnets drops /subnets). A
+    DELETE drops all entries, as the objects deleted along with the written
+    one are cached under paths of their own (e.g. /zones/<id> for
+    /domains/<id>).
+    """
+
+    def __init__(self, max_bytes, default_ttl, ttls=None):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(path, extra_headers=None):
+        headers = dict((k.lower(), v) for k, v in
+                       six.iteritems(extra_headers or {}))
+        return (path,) + tuple(headers.get(h.lower()) for h in KEY_HEADERS)
+
+    def ttl(self, path):
+        return self.ttls.get(_resource(_segments(path)), self.default_ttl)
+
+    def get(self, path, extra_headers=None):
+        """Returns a (data, headers) tuple, or None on a miss"""
+        key = self.key(path, extra_headers)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] < time.time():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            # most recently used last
+            self._entries[key] = self._entries.pop(key)
+            self.hits += 1
+            self.bytes_saved += entry[2]
+        return json.loads(entry[0]), dict(entry[1])
+
+    def put(self, path, extra_headers, data, headers):
+        ttl = self.ttl(path)
+        if ttl <= 0:
+            return
+        try:
+            serialized = json.dumps(data)
+        except (TypeError, ValueError):
+            return
+        size = len(serialized)
+        if size > self.max_bytes:
+            return
+        key = self.key(path, extra_headers)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (serialized, dict(headers or {}), size,
+                                  time.time() + ttl)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        self._size -= self._entries.pop(key)[2]
+
+    def invalidate(self, path, method=None):
+        """Drops whatever a write on path may have changed"""
+        written = _segments(path)
+        resource = _resource(written)
+        with self._lock:
+            if method == 'DELETE':
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._size = 0
+                return
+            for key in list(self._entries):
+                cached = _segments(key[0])
+                common = min(len(cached), len(written))
+                if (cached[:common] == written[:common] or
+                        _resource(cached) == resource):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'bytes_saved': self.bytes_saved,
+                    'invalidations': self.invalidations,
+                    'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': self._size}
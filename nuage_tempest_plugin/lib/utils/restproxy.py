@@ -4,10 +4,20 @@
 from future.utils import lrange
 
 import base64
+import contextlib
+from email.utils import mktime_tz
+from email.utils import parsedate_tz
+import errno
 import json
 import logging
+import os
+import random
+import select
 import socket
 import ssl
+import stat
+import tempfile
+import threading
 import time
 
 try:
@@ -15,21 +25,57 @@ try:
 except ImportError:
     import http.client as httpclient  # python 3
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # no cross-process sharing of api keys
+
+from nuage_tempest_plugin.lib.utils import request_logging
+
 LOG = logging.getLogger(__name__)
 MAX_RETRIES = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8
+CONN_POOL_SIZE = 4
+CONN_POOL_IDLE_TIMEOUT = 30
+API_KEY_REFRESH_MARGIN = 300
+# safe to send again on a fresh connection when the response got lost
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT')
 
 REST_SERV_UNAVAILABLE_CODE = 503
 
 
 class RESTResponse(object):
-    def __init__(self, status_code, reason=None, data=None, headers=None):
-        """Initializes a request """
+    def __init__(self, status_code, reason=None, data=None, headers=None,
+                 body=None):
+        """Initializes a request
+
+        :param body: JSON response body, only decoded into data once that is
+        asked for; non-JSON bodies end up in data as they are
+        """
 
         self.status = status_code
-        self.data = data
+        self._data = data
+        self._body = body
         self.reason = reason
         self.headers = headers
 
+    @property
+    def data(self):
+        if self._body is not None:
+            try:
+                self._data = json.loads(self._body.decode('utf8'))
+            except ValueError:
+                # response was not JSON, ignore the exception
+                self._data = self._body
+            self._body = None
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._body = None
+
 
 class RESTProxyBaseException(Exception):
     message = ("An unknown exception occurred.")
@@ -67,10 +113,394 @@ class RESTProxyError(RESTProxyBaseException):
         super(RESTProxyError, self).__init__()
 
 
+class RequestSentError(RESTProxyError):
+    """A non-idempotent request went out but got no response
+
+    It may have been executed all the same, so it is never sent again.
+    """
+
+
+class HTTPConnectionPool(object):
+    """Bounded, thread-safe pool of keep-alive HTTP(S) connections
+
+    Connections are handed out one caller at a time and given back once the
+    response has been read completely. At most `maxsize` idle connections are
+    kept; connections which are idle for longer than `idle_timeout` seconds or
+    whose socket was closed by the server are discarded on checkout.
+    """
+
+    def __init__(self, factory, maxsize=CONN_POOL_SIZE,
+                 idle_timeout=CONN_POOL_IDLE_TIMEOUT):
+        self.factory = factory
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._idle = []  # (conn, last used) tuples, most recent last
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @staticmethod
+    def _is_stale(conn):
+        sock = conn.sock
+        if sock is None:
+            return True
+        try:
+            # an idle keep-alive socket has nothing to read ; being readable
+            # means the server closed it (EOF) or sent unsolicited data
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (select.error, ValueError, socket.error):
+            return True
+        return bool(readable)
+
+    def get(self):
+        """Returns a (connection, reused) tuple"""
+        now = time.time()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    self.misses += 1
+                    break
+                conn, last_used = self._idle.pop()
+            if (now - last_used > self.idle_timeout or
+                    self._is_stale(conn)):
+                with self._lock:
+                    self.stale += 1
+                self._close(conn)
+                continue
+            with self._lock:
+                self.hits += 1
+            return conn, True
+        return self.factory(), False
+
+    def put(self, conn):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append((conn, time.time()))
+                return
+        self._close(conn)
+
+    def discard(self, conn):
+        self._close(conn)
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'stale': self.stale,
+                    'idle': len(self._idle)}
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+
+def get_connection_pool(key, factory, maxsize=CONN_POOL_SIZE,
+                        idle_timeout=CONN_POOL_IDLE_TIMEOUT):
+    """Returns the process-wide pool for key, creating it when needed"""
+    with _connection_pools_lock:
+        pool = _connection_pools.get(key)
+        if pool is None:
+            pool = HTTPConnectionPool(factory, maxsize, idle_timeout)
+            _connection_pools[key] = pool
+        return pool
+
+
+def connection_pool_stats():
+    """Returns the hit/miss counters of all pools, keyed by server:port"""
+    with _connection_pools_lock:
+        pools = dict(_connection_pools)
+    stats = {}
+    for (server, port, _, _), pool in pools.items():
+        # pools differing in ssl or timeout only add up
+        totals = stats.setdefault('%s:%s' % (server, port), {})
+        for name, value in pool.stats().items():
+            totals[name] = totals.get(name, 0) + value
+    return stats
+
+
+class RetryStats(object):
+    """Thread-safe counters on how much time is spent backing off"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.retries = 0
+            self.wait_time = 0.0
+            self.retry_after_honoured = 0
+            self.deadline_exceeded = 0
+
+    def record_retry(self, delay, retry_after=False):
+        with self._lock:
+            self.retries += 1
+            self.wait_time += delay
+            if retry_after:
+                self.retry_after_honoured += 1
+
+    def record_deadline_exceeded(self):
+        with self._lock:
+            self.deadline_exceeded += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {'retries': self.retries,
+                    'wait_time': round(self.wait_time, 3),
+                    'retry_after_honoured': self.retry_after_honoured,
+                    'deadline_exceeded': self.deadline_exceeded}
+
+
+_retry_stats = RetryStats()
+
+
+def retry_stats():
+    """Returns the process-wide retry/backoff counters"""
+    return _retry_stats.as_dict()
+
+
+class RetryPolicy(object):
+    """Capped exponential backoff with full jitter
+
+    The n-th retry waits a random time in [0, min(max_delay, base_delay *
+    2^n)], so that concurrent workers hit by the same 503 do not come back in
+    lockstep. A Retry-After header sent by the server is honoured as a lower
+    bound. No retry is attempted when it would end past the request deadline.
+    Subclass and override `delay()` or `should_retry()` to plug in another
+    strategy.
+    """
+
+    def __init__(self, max_retries=MAX_RETRIES, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY, deadline=None, stats=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline  # in seconds, per request ; None is no limit
+        self.stats = stats or _retry_stats
+
+    def should_retry(self, status):
+        return status is None or status == REST_SERV_UNAVAILABLE_CODE
+
+    def delay(self, attempt):
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def parse_retry_after(value):
+        """Returns the Retry-After header value in seconds, or None
+
+        Both the delta-seconds and the HTTP-date forms are supported.
+        """
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        date = parsedate_tz(value)
+        if date is None:
+            return None
+        return max(0.0, mktime_tz(date) - time.time())
+
+    def backoff(self, attempt, start, retry_after=None):
+        """Returns the time to sleep before the next attempt
+
+        Returns None when no further attempt should be made, either because
+        the retries are exhausted or the request deadline would be exceeded.
+        """
+        if attempt + 1 >= self.max_retries:
+            return None
+        delay = self.delay(attempt)
+        retry_after = self.parse_retry_after(retry_after)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if (self.deadline is not None and
+                time.time() + delay > start + self.deadline):
+            self.stats.record_deadline_exceeded()
+            return None
+        self.stats.record_retry(delay, retry_after is not None)
+        return delay
+
+
+def _is_private(st):
+    """Returns whether a file is the current user's, and only accessible to
+    that user
+    """
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def user_private_dir():
+    """Returns a directory of the temporary directory only the current user
+    can access, creating it when needed
+    """
+    path = os.path.join(tempfile.gettempdir(),
+                        'nuage_tempest_plugin-%d' % os.getuid())
+    try:
+        os.mkdir(path, 0o700)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or not _is_private(st):
+        raise OSError(errno.EPERM, 'Not a private directory', path)
+    return path
+
+
+class APIKeyCache(object):
+    """VSD API keys shared by all RESTProxyServer instances
+
+    Keys are kept in memory for the process and, when a path is given, in a
+    JSON file guarded by an exclusive file lock so that concurrent test
+    workers share a single login. A relative path is taken in the
+    user_private_dir(). The file is created accessible to its owner only,
+    and is ignored unless it still is and is owned by the current user.
+    A key is no longer handed out once it is within `refresh_margin`
+    seconds of its expiry, so that it gets renewed before the VSD starts
+    rejecting it.
+    """
+
+    def __init__(self, path=None, refresh_margin=API_KEY_REFRESH_MARGIN):
+        if path and fcntl and not os.path.isabs(path):
+            try:
+                path = os.path.join(user_private_dir(), path)
+            except OSError as e:
+                LOG.warning('Not sharing VSD API keys across processes: %s',
+                            e)
+                path = None
+        self.path = path if fcntl else None
+        self.refresh_margin = refresh_margin
+        self._keys = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.logins = 0
+
+    def _is_fresh(self, entry):
+        expiry = entry.get('expiry')
+        return (expiry is None or
+                time.time() < expiry - self.refresh_margin)
+
+    def _open_private(self, path, flags):
+        fd = os.open(path, flags | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+        if not _is_private(os.fstat(fd)):
+            os.close(fd)
+            LOG.warning('Ignoring %s, which is not private to the current '
+                        'user', path)
+            return None
+        return fd
+
+    def _read_file(self):
+        try:
+            fd = self._open_private(self.path, os.O_RDONLY)
+        except OSError:
+            return {}
+        if fd is None:
+            return {}
+        try:
+            with os.fdopen(fd) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write_file(self, keys):
+        # created accessible to the current user only
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(keys, f)
+        os.rename(tmp, self.path)
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Serializes logins across threads and processes"""
+        with self._lock:
+            if not self.path:
+                yield
+                return
+            fd = self._open_private(self.path + '.lock',
+                                    os.O_RDWR | os.O_CREAT)
+            if fd is None:
+                # someone else's, so is the key file
+                self.path = None
+                yield
+                return
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def get(self, key):
+        """Returns a fresh (api key, expiry) tuple or None; call locked"""
+        entry = self._keys.get(key)
+        if (not entry or not self._is_fresh(entry)) and self.path:
+            entry = self._read_file().get(key)
+        if entry and self._is_fresh(entry):
+            self._keys[key] = entry
+            self.hits += 1
+            return entry['api_key'], entry.get('expiry')
+        return None
+
+    def put(self, key, api_key, expiry):
+        """Stores a new api key; call locked"""
+        entry = {'api_key': api_key, 'expiry': expiry}
+        self._keys[key] = entry
+        self.logins += 1
+        if self.path:
+            keys = self._read_file()
+            keys[key] = entry
+            self._write_file(keys)
+
+    def invalidate(self, key, api_key):
+        """Drops api_key, unless another user already replaced it"""
+        with self.locked():
+            if self._keys.get(key, {}).get('api_key') == api_key:
+                del self._keys[key]
+            if self.path:
+                keys = self._read_file()
+                if keys.get(key, {}).get('api_key') == api_key:
+                    del keys[key]
+                    self._write_file(keys)
+
+    def stats(self):
+        return {'hits': self.hits, 'logins': self.logins}
+
+
+_api_key_caches = {}
+_api_key_caches_lock = threading.Lock()
+
+
+def get_api_key_cache(path=None, refresh_margin=API_KEY_REFRESH_MARGIN):
+    """Returns the process-wide api key cache backed by path"""
+    with _api_key_caches_lock:
+        cache = _api_key_caches.get(path)
+        if cache is None:
+            cache = APIKeyCache(path, refresh_margin)
+            _api_key_caches[path] = cache
+        return cache
+
+
 class RESTProxyServer(object):
     def __init__(self, server, base_uri, serverssl,
                  serverauth, auth_resource,
-                 organization, servertimeout):
+                 organization, servertimeout,
+                 pool_size=CONN_POOL_SIZE,
+                 pool_idle_timeout=CONN_POOL_IDLE_TIMEOUT,
+                 retry_policy=None,
+                 api_key_cache=None,
+                 cassette=None):
         try:
             server_ip, port = server.split(":")
         except ValueError:
@@ -84,11 +514,74 @@ class RESTProxyServer(object):
         self.auth_resource = auth_resource
         self.organization = organization
         self.timeout = servertimeout
-        self.max_retries = MAX_RETRIES
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.max_retries = self.retry_policy.max_retries
         self.auth = None
-        self.success_codes = lrange(200, 207)
+        self.api_key = None
+        self.api_key_expiry = None
+        self.api_key_cache = api_key_cache or get_api_key_cache()
+        self.cassette = cassette
+        # up to 207 Multi-Status, returned by bulk requests
+        self.success_codes = lrange(200, 208)
+        self.log_maxlen = request_logging.MAX_BODY_LEN
+        self.log_sample_rate = request_logging.LARGE_BODY_SAMPLE_RATE
+        self.pool = get_connection_pool(
+            (self.server, self.port, bool(self.serverssl), self.timeout),
+            self._create_connection, pool_size, pool_idle_timeout)
+
+    def _send(self, action, uri, body, headers):
+        """Sends a request over a pooled connection
+
+        Returns a (connection, response, response body) tuple. A reused
+        keep-alive connection which turns out to be dead is replaced by a
+        fresh one once, without consuming a retry attempt. That is only done
+        when the request can't have reached the server, or is idempotent:
+        a POST which got no response may have been executed all the same,
+        hence raises RequestSentError instead.
+        """
+        conn, reused = self.pool.get()
+        try:
+            return self._send_on(conn, action, uri, body, headers)
+        except (socket.error, httpclient.HTTPException):
+            if not reused:
+                raise
+        LOG.debug('ServerProxy: stale keep-alive connection, reconnecting')
+        return self._send_on(self._create_connection(), action, uri, body,
+                             headers)
+
+    def _send_on(self, conn, action, uri, body, headers):
+        sent = False
+        try:
+            conn.request(action, uri, body, headers)
+            sent = True
+            response = conn.getresponse()
+            return conn, response, response.read()
+        except (socket.error, httpclient.HTTPException) as e:
+            self.pool.discard(conn)
+            if sent and action not in IDEMPOTENT_METHODS:
+                LOG.error('ServerProxy: %s %s got no response (%r)',
+                          action, uri, e)
+                raise RequestSentError(
+                    '%s %s got no response (%r), it may have been executed'
+                    % (action, uri, e))
+            raise
+        except Exception:
+            self.pool.discard(conn)
+            raise
 
     def _rest_call(self, action, resource, data, extra_headers=None):
+        if self.cassette and self.cassette.replaying:
+            status, reason, resp_data, headers = self.cassette.play(
+                action, resource, data, extra_headers)
+            return RESTResponse(status_code=status, reason=reason,
+                                data=resp_data, headers=headers)
+        ret = self._http_call(action, resource, data, extra_headers)
+        if (self.cassette and ret is not None and
+                resource != self.auth_resource):  # never record api keys
+            self.cassette.record(action, resource, data, extra_headers, ret)
+        return ret
+
+    def _http_call(self, action, resource, data, extra_headers=None):
         uri = self.base_uri + resource
         body = json.dumps(data)
         headers = {'Content-type': 'application/json',
@@ -98,57 +591,68 @@ class RESTProxyServer(object):
         if extra_headers:
             headers.update(extra_headers)
 
-        if "X-Nuage-Filter" in headers:
-            hdr = '[' + headers['X-Nuage-Filter'] + ']'
-            LOG.debug('API REQ %s %s %s %s', action, uri, hdr, body)
-        else:
-            LOG.debug('API REQ %s %s %s', action, uri, body)
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        if debug:
+            if "X-Nuage-Filter" in headers:
+                hdr = '[' + headers['X-Nuage-Filter'] + ']'
+                LOG.debug('API REQ %s %s %s %s', action, uri, hdr,
+                          request_logging.LazyBody(body, self.log_maxlen))
+            else:
+                LOG.debug('API REQ %s %s %s', action, uri,
+                          request_logging.LazyBody(body, self.log_maxlen))
 
         ret = None
+        start = time.time()
         for attempt in range(self.max_retries):
-            conn = None
+            response = None
             try:
-                conn = self._create_connection()
-                conn.request(action, uri, body, headers)
-                response = conn.getresponse()
-                resp_str = response.read()
+                conn, response, resp_str = self._send(
+                    action, uri, body, headers)
                 resp_data = resp_str
 
-                LOG.debug('API RSP %s %s %s',
-                          response.status,
-                          response.reason,
-                          resp_data)
+                if debug:
+                    LOG.debug('API RSP %s %s %s',
+                              response.status,
+                              response.reason,
+                              request_logging.LazyBody(
+                                  resp_data, self.log_maxlen,
+                                  self.log_sample_rate))
                 if response.status in self.success_codes:
-                    try:
-                        resp_data = json.loads(resp_str.decode('utf8'))
-                    except ValueError:
-                        # response was not JSON, ignore the exception
-                        pass
-
-                ret = RESTResponse(status_code=response.status,
-                                   reason=response.reason,
-                                   data=resp_data,
-                                   headers=dict(response.getheaders()))
-
-            except (socket.timeout, socket.error) as e:
-                LOG.error(('ServerProxy: %(action)s failure, %(e)r'),
-                          locals())
-                if conn:
-                    try:
-                        conn.close()
-                    except Exception:
-                        pass
+                    # decoded when used
+                    ret = RESTResponse(status_code=response.status,
+                                       reason=response.reason,
+                                       body=resp_str,
+                                       headers=dict(response.getheaders()))
+                else:
+                    ret = RESTResponse(status_code=response.status,
+                                       reason=response.reason,
+                                       data=resp_data,
+                                       headers=dict(response.getheaders()))
+
+            except (socket.error, httpclient.HTTPException) as e:
+                # not a RequestSentError, which must not be sent again
+                LOG.error('ServerProxy: %s failure, %r', action, e)
             else:
                 # no exception received or got exception != above ones
-                conn.close()
-                if response.status != REST_SERV_UNAVAILABLE_CODE:
+                if response.will_close:
+                    self.pool.discard(conn)
+                else:
+                    self.pool.put(conn)
+                if not self.retry_policy.should_retry(response.status):
                     return ret
 
-            time.sleep(1)
-            LOG.debug('Attempt %s of %s' % (attempt + 1, self.max_retries))
-
-        LOG.debug('After %d retries server did not respond properly.'
-                  % self.max_retries)
+            delay = self.retry_policy.backoff(
+                attempt, start,
+                response.getheader('Retry-After')
+                if response is not None else None)
+            if delay is None:
+                break
+            LOG.debug('Attempt %s of %s, retrying in %.2fs',
+                      attempt + 1, self.max_retries, delay)
+            time.sleep(delay)
+
+        LOG.debug('After %d attempts server did not respond properly.',
+                  attempt + 1)
         return ret or None
 
     @staticmethod
@@ -184,34 +688,67 @@ class RESTProxyServer(object):
                 'Could not create HTTP(S)Connection object.')
         return conn
 
-    def generate_nuage_auth(self):
-        data = ''
-        encoded_auth = base64.b64encode(
-            self.serverauth.encode()).decode()
-        self.auth = 'Basic ' + encoded_auth
-        resp = self.rest_call('GET',
-                              self.auth_resource, data)
-        data = resp.data[0]
-        if resp.status in self.success_codes and data['APIKey']:
-            respkey = data['APIKey']
-        else:
-            if resp.status == 0:
-                assert 0, 'Could not establish conn with REST server. Abort'
-            else:
-                assert 0, 'Could not authenticate to REST server. Abort'
+    def _api_key_cache_key(self):
+        return '%s@%s@%s:%s%s' % (self.serverauth.split(':')[0],
+                                  self.organization, self.server, self.port,
+                                  self.base_uri)
+
+    def _set_api_key(self, api_key, expiry):
         uname = self.serverauth.split(':')[0]
-        new_uname_pass = uname + ':' + respkey
+        new_uname_pass = uname + ':' + api_key
         encoded_auth = base64.b64encode(new_uname_pass.encode()).decode()
-        auth = 'Basic ' + encoded_auth
-        self.auth = auth
+        self.auth = 'Basic ' + encoded_auth
+        self.api_key = api_key
+        self.api_key_expiry = expiry
+
+    def generate_nuage_auth(self):
+        if self.cassette and self.cassette.replaying:
+            self._set_api_key('replay', None)  # no login needed offline
+            return
+        key = self._api_key_cache_key()
+        with self.api_key_cache.locked():
+            cached = self.api_key_cache.get(key)
+            if cached:
+                self._set_api_key(*cached)
+                return
+            data = ''
+            encoded_auth = base64.b64encode(
+                self.serverauth.encode()).decode()
+            self.auth = 'Basic ' + encoded_auth
+            resp = self._rest_call('GET',
+                                   self.auth_resource, data)
+            data = resp.data[0]
+            if resp.status in self.success_codes and data['APIKey']:
+                respkey = data['APIKey']
+            else:
+                if resp.status == 0:
+                    assert 0, ('Could not establish conn with REST server. '
+                               'Abort')
+                else:
+                    assert 0, 'Could not authenticate to REST server. Abort'
+            # VSD reports the expiry in milliseconds since the epoch
+            expiry = data.get('APIKeyExpiry')
+            expiry = expiry / 1000.0 if expiry else None
+            self.api_key_cache.put(key, respkey, expiry)
+        self._set_api_key(respkey, expiry)
+
+    def _api_key_expiring(self):
+        return (self.api_key_expiry is not None and
+                time.time() >= (self.api_key_expiry -
+                                self.api_key_cache.refresh_margin))
 
     def rest_call(self, action, resource, data, extra_headers=None):
+        if self._api_key_expiring():
+            # renew ahead of expiry rather than replaying a rejected call
+            self.generate_nuage_auth()
         response = self._rest_call(action, resource, data,
                                    extra_headers=extra_headers)
         '''
         If at all authentication expires with VSD, re-authenticate.
         '''
         if response.status == 401 and response.reason == 'Unauthorized':
+            self.api_key_cache.invalidate(self._api_key_cache_key(),
+                                          self.api_key)
             self.generate_nuage_auth()
             return self._rest_call(action, resource, data,
                                    extra_headers=extra_headers)
@@ -0,0 +1,88 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# Resource shared by its users, created on first use and torn down when the
+# last user releases it, e.g.
+#
+#     def create(add_cleanup):
+#         network = networks_client.create_network(...)['network']
+#         add_cleanup(networks_client.delete_network, network['id'])
+#         return network
+#
+#     shared = SharedResource(create, 'access network')
+#     network = shared.acquire()  # creates it
+#     network = shared.acquire()  # same network
+#     shared.release()
+#     shared.release()  # deletes it
+#
+# Cleanups run in reverse order of addition, also when create fails half
+# way. Once torn down, a next acquire creates the resource anew.
+
+import logging
+import six
+import sys
+import threading
+
+LOG = logging.getLogger(__name__)
+
+
+class SharedResource(object):
+
+    def __init__(self, create, name=None):
+        """:param create: create(add_cleanup) returning the resource"""
+        self.name = name or 'shared resource'
+        self._create = create
+        self._lock = threading.RLock()
+        self._resource = None
+        self._users = 0
+        self._cleanups = []
+        self.created = 0
+        self.acquired = 0
+
+    @property
+    def users(self):
+        return self._users
+
+    def _add_cleanup(self, fn, *args, **kwargs):
+        self._cleanups.append((fn, args, kwargs))
+
+    def acquire(self):
+        """Returns the resource, creating it when it has no users yet"""
+        with self._lock:
+            if not self._users:
+                LOG.info('Creating %s', self.name)
+                try:
+                    self._resource = self._create(self._add_cleanup)
+                except Exception:
+                    exc_info = sys.exc_info()
+                    # the creation error is what matters
+                    self._teardown(reraise=False)
+                    six.reraise(*exc_info)
+                self.created += 1
+            self._users += 1
+            self.acquired += 1
+            return self._resource
+
+    def release(self):
+        """Gives up a use of the resource, tearing it down after the last"""
+        with self._lock:
+            if not self._users:
+                raise RuntimeError('%s released more often than acquired' %
+                                   self.name)
+            self._users -= 1
+            if not self._users:
+                LOG.info('Tearing down %s', self.name)
+                self._teardown()
+
+    def _teardown(self, reraise=True):
+        self._resource = None
+        errors = []
+        while self._cleanups:
+            fn, args, kwargs = self._cleanups.pop()
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                LOG.exception('Cleanup of %s failed', self.name)
+                errors.append(e)
+        if errors and reraise:
+            raise errors[0]
@@ -0,0 +1,98 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# Index of where VSD objects live in the object tree, e.g.
+#
+#     index.add(subnet.id, 'subnet', subnet.parent_id, 'zone')
+#     index.add(zone.id, 'zone', zone.parent_id, 'domain')
+#     index.ancestor(subnet.id, 'domain')  # no VSD round trip
+#
+# VSD objects never move to another parent, so entries only go stale when
+# an object is deleted, which the deleter has to tell through invalidate().
+
+import collections
+import threading
+
+MAX_ENTRIES = 10000
+
+
+class AncestorIndex(object):
+    """Bounded ID -> (type, parent ID, parent type) index of VSD objects
+
+    The least recently used entries are evicted once there are more than
+    max_entries.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def add(self, obj_id, obj_type, parent_id, parent_type):
+        if not obj_id or self.max_entries <= 0:
+            return
+        with self._lock:
+            if parent_id and parent_type and parent_id not in self._entries:
+                # so that the parent's type is known as well
+                self._entries[parent_id] = (parent_type, None, None)
+            self._entries.pop(obj_id, None)
+            self._entries[obj_id] = (obj_type, parent_id, parent_type)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, obj_id):
+        """Returns (type, parent ID, parent type), or None when unknown"""
+        with self._lock:
+            entry = self._entries.get(obj_id)
+            if entry is not None:
+                # most recently used last
+                self._entries[obj_id] = self._entries.pop(obj_id)
+            return entry
+
+    def ancestor(self, obj_id, ancestor_type):
+        """Returns the ID of the ancestor of type ancestor_type
+
+        None when the chain up to it is not (entirely) known.
+        """
+        with self._lock:
+            current = obj_id
+            while True:
+                entry = self._entries.get(current)
+                if entry is None or not entry[1]:
+                    self.misses += 1
+                    return None
+                obj_type, parent_id, parent_type = entry
+                self._entries[current] = self._entries.pop(current)
+                if parent_type == ancestor_type:
+                    self.hits += 1
+                    return parent_id
+                current = parent_id
+
+    def invalidate(self, obj_id):
+        """Forgets a deleted object and everything below it"""
+        with self._lock:
+            gone = set([obj_id])
+            # the descendants of obj_id, in as many passes as levels
+            while True:
+                below = set(i for i, entry in self._entries.items()
+                            if entry[1] in gone and i not in gone)
+                if not below:
+                    break
+                gone |= below
+            for i in gone:
+                if self._entries.pop(i, None) is not None:
+                    self.invalidations += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries)}
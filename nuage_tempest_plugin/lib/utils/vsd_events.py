@@ -0,0 +1,194 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# Waits on VSD state through the VSD push notification channel, e.g.
+#
+#     subscriber = VSDEventSubscriber(proxy).start()
+#     vport = wait_until(lambda: get_vport(...), timeout=30,
+#                        entity_types=['vport'], subscriber=subscriber)
+#
+# The subscriber long-polls the /events resource in the background. A wait
+# re-checks its condition as soon as an event on one of its entity types
+# comes in, and anyhow every poll interval: events can be missed while
+# (re)connecting, and without subscriber waiting falls back to polling.
+
+import logging
+import threading
+import time
+
+from tempest.lib import exceptions
+
+LOG = logging.getLogger(__name__)
+
+EVENTS_RESOURCE = '/events'
+
+# the VSD holds a long poll for up to a minute when nothing happens
+LONG_POLL_TIMEOUT = 90
+RECONNECT_DELAY = 5
+POLL_INTERVAL = 1.0
+
+# resources not simply named after their entity type plus an s
+_ENTITY_TYPES = {'policies': 'policy',
+                 'qos': 'qos',
+                 'redirectiontargets': 'redirectiontarget',
+                 'vminterfaces': 'vminterface'}
+
+
+def entity_type(resource):
+    """Returns the entity type events report for a REST resource"""
+    return _ENTITY_TYPES.get(resource, resource[:-1]
+                             if resource.endswith('s') else resource)
+
+
+def resource_name(entity):
+    """Returns the REST resource of an entity type, reverse of entity_type"""
+    for resource, name in _ENTITY_TYPES.items():
+        if name == entity:
+            return resource
+    return entity + 's'
+
+
+class VSDEventSubscriber(object):
+    """Background listener on the VSD push notification channel
+
+    Every event bumps a sequence number; waiters remember the sequence
+    number before checking their condition and wait for an event on the
+    entity types they are interested in past it.
+
+    :param proxy: RESTProxyServer to long-poll with, best a dedicated one
+                  with a timeout beyond LONG_POLL_TIMEOUT
+    """
+
+    def __init__(self, proxy, reconnect_delay=RECONNECT_DELAY):
+        self.proxy = proxy
+        self.reconnect_delay = reconnect_delay
+        self.connected = False
+        self.sequence = 0
+        self._cond = threading.Condition()
+        self._changed = {}  # entity type -> sequence of its last event
+        self._resync = 0    # sequence as of which events may have been lost
+        self._listeners = []
+        self._stopped = threading.Event()
+        self._thread = None
+        self.events = 0
+        self.reconnects = 0
+
+    def add_listener(self, callback):
+        """Has callback(event) called for every event received"""
+        self._listeners.append(callback)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run,
+                                        name='vsd-event-subscriber')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stops listening
+
+        :param timeout: seconds to wait for a long poll in progress to end
+        """
+        self._stopped.set()
+        if timeout and self._thread:
+            self._thread.join(timeout)
+
+    def _poll(self, uuid):
+        resource = EVENTS_RESOURCE + ('?uuid=%s' % uuid if uuid else '')
+        resp = self.proxy.rest_call('GET', resource, None)
+        if resp is None or resp.status != 200 or \
+                not isinstance(resp.data, dict):
+            raise IOError('Event channel failure: %s' %
+                          (resp and resp.status))
+        return resp.data
+
+    def _run(self):
+        uuid = None
+        while not self._stopped.is_set():
+            try:
+                data = self._poll(uuid)
+            except Exception as e:
+                LOG.debug('VSD event subscriber: %s, reconnecting in %ss',
+                          e, self.reconnect_delay)
+                with self._cond:
+                    if self.connected:
+                        self.reconnects += 1
+                    self.connected = False
+                uuid = None
+                self._stopped.wait(self.reconnect_delay)
+                continue
+            if uuid is None:
+                # (re)subscribed: whatever happened meanwhile went unseen
+                self._dispatch([], resync=True)
+            uuid = data.get('uuid')
+            self._dispatch(data.get('events') or [])
+
+    def _dispatch(self, events, resync=False):
+        with self._cond:
+            self.connected = True
+            if resync:
+                self.sequence += 1
+                self._resync = self.sequence
+            for event in events:
+                self.sequence += 1
+                self.events += 1
+                self._changed[event.get('entityType')] = self.sequence
+            self._cond.notify_all()
+        for event in events:
+            for listener in self._listeners:
+                try:
+                    listener(event)
+                except Exception:
+                    LOG.exception('VSD event listener failed')
+
+    def _seen(self, since, entity_types):
+        if self._resync > since:
+            return True
+        if entity_types is None:
+            return self.sequence > since
+        return any(self._changed.get(t, 0) > since for t in entity_types)
+
+    def wait(self, since, entity_types=None, timeout=None):
+        """Waits for an event on one of entity_types after sequence since
+
+        Any entity type counts when entity_types is None. Returns whether
+        there was such event within timeout seconds.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while not self._seen(since, entity_types):
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                self._cond.wait(remaining)
+            return True
+
+    def stats(self):
+        return {'connected': self.connected, 'events': self.events,
+                'reconnects': self.reconnects}
+
+
+def wait_until(predicate, timeout, entity_types=None, interval=POLL_INTERVAL,
+               message=None, subscriber=None):
+    """Returns the first true result of predicate()
+
+    predicate is re-evaluated whenever subscriber reports an event on one of
+    entity_types, and at least every interval seconds. Raises
+    TimeoutException when it didn't hold within timeout seconds.
+    """
+    deadline = time.time() + timeout
+    while True:
+        since = subscriber.sequence if subscriber else 0
+        result = predicate()
+        if result:
+            return result
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise exceptions.TimeoutException(
+                message or 'VSD condition not met within %ss' % timeout)
+        if subscriber and subscriber.connected:
+            subscriber.wait(since, entity_types, min(interval, remaining))
+        else:
+            time.sleep(min(interval, remaining))
@@ -0,0 +1,168 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# Builder for VSD predicate filters (X-Nuage-Filter), e.g.
+#
+#     expr = (vsd_filter.Eq('type', 'VM') &
+#             vsd_filter.In('externalID', external_ids))
+#     for chunk in expr.split(max_len):
+#         client.get(path, vsd_filter.headers(chunk))
+#
+# Values are quoted and escaped, so any string can be matched.
+
+import abc
+
+import six
+
+# VSD (or a proxy in front of it) refuses overly long request headers
+MAX_FILTER_LEN = 4000
+
+
+def quote(value):
+    """Returns value as a predicate literal"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, six.integer_types + (float,)):
+        return str(value)
+    return '"%s"' % (six.text_type(value).replace('\\', '\\\\')
+                     .replace('"', '\\"'))
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Filter(object):
+    """Base of all predicate expressions, which combine with & and |
+
+    Subclasses implement render(), which str() returns.
+    """
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def split(self, max_len=MAX_FILTER_LEN):
+        """Returns filters together matching what this one matches
+
+        Each of them renders to at most max_len characters, provided single
+        comparisons do. Only In expressions, possibly ANDed with others, are
+        divided; other expressions are returned as they are.
+        """
+        return [self]
+
+    @abc.abstractmethod
+    def render(self):
+        """Returns the predicate as sent in X-Nuage-Filter"""
+
+    def __str__(self):
+        return self.render()
+
+
+class Comparison(Filter):
+
+    operator = None
+
+    def __init__(self, attr, value):
+        self.attr = attr
+        self.value = value
+
+    def render(self):
+        return '%s %s %s' % (self.attr, self.operator, quote(self.value))
+
+
+class Eq(Comparison):
+    operator = 'IS'
+
+
+class Ne(Comparison):
+    operator = 'ISNOT'
+
+
+class Like(Comparison):
+    operator = 'LIKE'
+
+
+class BeginsWith(Comparison):
+    operator = 'BEGINSWITH'
+
+
+class Lt(Comparison):
+    operator = '<'
+
+
+class Gt(Comparison):
+    operator = '>'
+
+
+class _Compound(Filter):
+
+    keyword = None
+
+    def __init__(self, *operands):
+        self.operands = []
+        for operand in operands:
+            # flatten (a AND b) AND c
+            if type(operand) is type(self):
+                self.operands.extend(operand.operands)
+            else:
+                self.operands.append(operand)
+
+    def render(self):
+        if len(self.operands) == 1:
+            return str(self.operands[0])
+        return (' %s ' % self.keyword).join(
+            '(%s)' % operand if isinstance(operand, _Compound) and
+            len(operand.operands) > 1 else str(operand)
+            for operand in self.operands)
+
+
+class And(_Compound):
+    keyword = 'AND'
+
+    def split(self, max_len=MAX_FILTER_LEN):
+        divisible = [o for o in self.operands if isinstance(o, In)]
+        if len(str(self)) <= max_len or not divisible:
+            return [self]
+        # divide the largest disjunction, leaving room for the others
+        largest = max(divisible, key=lambda o: len(o.values))
+        others = [o for o in self.operands if o is not largest]
+        room = max_len - len(str(And(*others + [In(largest.attr, [])])))
+        return [And(*others + [chunk]) for chunk in largest.split(room)]
+
+
+class Or(_Compound):
+    keyword = 'OR'
+
+
+class In(Or):
+    """attr matching any of values, i.e. attr IS v1 OR attr IS v2 ..."""
+
+    def __init__(self, attr, values):
+        self.attr = attr
+        self.values = list(values)
+        super(In, self).__init__(*[Eq(attr, value) for value in self.values])
+
+    def split(self, max_len=MAX_FILTER_LEN):
+        chunks = []
+        chunk = []
+        length = 2  # parentheses
+        for operand, value in zip(self.operands, self.values):
+            added = len(str(operand)) + (len(' OR ') if chunk else 0)
+            if chunk and length + added > max_len:
+                chunks.append(In(self.attr, chunk))
+                chunk = []
+                added = len(str(operand))
+                length = 2
+            chunk.append(value)
+            length += added
+        if chunk or not chunks:
+            chunks.append(In(self.attr, chunk))
+        return chunks
+
+
+def headers(expression):
+    """Returns the request headers filtering on expression"""
+    return {'X-Nuage-FilterType': 'predicate',
+            'X-Nuage-Filter': str(expression)}
@@ -0,0 +1,199 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+
+import atexit
+import json
+import os
+import re
+import threading
+
+import six
+
+# VSD object IDs are UUIDs; numeric path segments are IDs as well
+_ID_SEGMENT = re.compile(r'^([0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|\d+)$')
+
+# values are bucketed on their top 8 bits: 2^7 buckets per power of 2, each
+# at most 1/128 of its lower bound wide, so that reporting bucket midpoints
+# keeps the relative error below 0.4%
+SUB_BUCKET_BITS = 8
+
+
+def normalize_path(url):
+    """Returns url without query string and with IDs as {id}
+
+    e.g. /domains/7f5c.../vports?responseChoice=1 -> /domains/{id}/vports
+    """
+    path = url.split('?', 1)[0]
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment
+                    for segment in path.split('/'))
+
+
+class Histogram(object):
+    """Log-linear (HDR style) histogram of latencies in microseconds
+
+    Values are counted in buckets of constant relative width, so that
+    percentiles are exact up to 0.4% whatever their magnitude, in a small and
+    bounded amount of memory.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _shift(value):
+        return max(value.bit_length() - SUB_BUCKET_BITS, 0)
+
+    @classmethod
+    def _bucket(cls, value):
+        shift = cls._shift(value)
+        return (value >> shift) << shift
+
+    @classmethod
+    def _midpoint(cls, bucket):
+        # a bucket holds the values bucket .. bucket + 2^shift - 1
+        return bucket + ((1 << cls._shift(bucket)) - 1) / 2.0
+
+    def record(self, secs):
+        value = max(int(secs * 1000000), 0)
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent):
+        """Returns the given percentile in seconds
+
+        That is the midpoint of the bucket holding it, but never more than
+        the largest value recorded.
+        """
+        if not self.count:
+            return 0.0
+        if percent >= 100:
+            return self.max / 1000000.0
+        rank = percent * self.count / 100.0
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self._midpoint(bucket), self.max) / 1000000.0
+
+
+class ResourceStats(object):
+
+    def __init__(self):
+        self.errors = 0
+        self.latency = Histogram()
+
+    def as_dict(self):
+        latency = self.latency
+        return {'count': latency.count,
+                'errors': self.errors,
+                'total': latency.total / 1000000.0,
+                'mean': (latency.total / 1000000.0 / latency.count
+                         if latency.count else 0.0),
+                'p50': latency.percentile(50),
+                'p90': latency.percentile(90),
+                'p99': latency.percentile(99),
+                'max': latency.max / 1000000.0}
+
+
+class MetricsRegistry(object):
+    """VSD call counts, error counts and latencies per method and resource"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, method, url, secs, error=False):
+        key = (method.upper(), normalize_path(url))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = ResourceStats()
+            stats.latency.record(secs)
+            if error:
+                stats.errors += 1
+
+    def as_dict(self):
+        """Returns {'METHOD /path': stats}"""
+        with self._lock:
+            return dict(('%s %s' % key, stats.as_dict())
+                        for key, stats in six.iteritems(self._stats))
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def __len__(self):
+        return len(self._stats)
+
+
+# every request is accounted for the running test class and the worker
+_class_registry = MetricsRegistry()
+_worker_registry = MetricsRegistry()
+_dump_lock = threading.Lock()
+_worker_dump_dir = None
+_counters = {}
+
+
+def record(method, url, secs, error=False):
+    _class_registry.record(method, url, secs, error)
+    _worker_registry.record(method, url, secs, error)
+
+
+def register_counters(name, counters):
+    """Adds counters(), a dict, to the worker metrics under name"""
+    _counters[name] = counters
+
+
+def worker_metrics():
+    return _worker_registry.as_dict()
+
+
+def worker_counters():
+    return dict((name, counters())
+                for name, counters in six.iteritems(_counters))
+
+
+def _append(path, entry):
+    with _dump_lock:
+        with open(path, 'a') as f:
+            f.write(json.dumps(entry, sort_keys=True) + '\n')
+
+
+def dump_class_metrics(metrics_dir, class_name):
+    """Appends the metrics of the test class as a JSON line, then resets
+
+    Does nothing when metrics_dir is not set or no VSD call was made.
+    """
+    if not metrics_dir or not len(_class_registry):
+        _class_registry.reset()
+        return
+    metrics = _class_registry.as_dict()
+    _class_registry.reset()
+    _append(os.path.join(metrics_dir,
+                         'vsd_metrics_classes.%d.jsonl' % os.getpid()),
+            {'class': class_name, 'resources': metrics})
+
+
+def dump_worker_metrics(metrics_dir):
+    if not metrics_dir or not len(_worker_registry):
+        return
+    path = os.path.join(metrics_dir, 'vsd_metrics.%d.json' % os.getpid())
+    with open(path, 'w') as f:
+        json.dump({'pid': os.getpid(), 'resources': worker_metrics(),
+                   'counters': worker_counters()}, f,
+                  indent=2, sort_keys=True)
+
+
+def enable_worker_dump(metrics_dir):
+    """Has the worker metrics written to metrics_dir at process exit"""
+    global _worker_dump_dir
+    with _dump_lock:
+        if metrics_dir and _worker_dump_dir is None:
+            _worker_dump_dir = metrics_dir
+            atexit.register(dump_worker_metrics, metrics_dir)
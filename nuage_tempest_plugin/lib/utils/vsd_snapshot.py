@@ -0,0 +1,242 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# In-memory copy of a VSD domain subtree, to run many verifications against
+# without a VSD round trip each, e.g.
+#
+#     snapshot = DomainSnapshot(client, 'domains', domain_id).load()
+#     vport = snapshot.find('vports', externalID=ext_id)[0]
+#     rules = snapshot.children(template_id, 'ingressaclentrytemplates')
+#     ...
+#     snapshot.refresh()  # after changing things
+#
+# The client is a NuageRestClient, or anything with its iter_pages and
+# count methods. Objects are the VSD JSON dicts.
+
+from concurrent import futures
+import threading
+
+import six
+
+from nuage_tempest_plugin.lib.utils import exceptions
+from nuage_tempest_plugin.lib.utils import vsd_filter
+
+# the collections fetched below a domain, per domain type
+DOMAIN_RESOURCES = {
+    'domains': ('zones', 'subnets', 'vports', 'vminterfaces', 'policygroups',
+                'ingressacltemplates', 'egressacltemplates',
+                'redirectiontargets'),
+    'l2domains': ('vports', 'vminterfaces', 'policygroups',
+                  'ingressacltemplates', 'egressacltemplates',
+                  'redirectiontargets', 'dhcpoptions')
+}
+
+# the collections fetched below each object of these types
+CHILD_RESOURCES = {
+    'ingressacltemplates': ('ingressaclentrytemplates',),
+    'egressacltemplates': ('egressaclentrytemplates',),
+    'subnets': ('dhcpoptions',),
+    'vminterfaces': ('dhcpoptions',)
+}
+
+WORKERS = 8
+
+
+class _Collection(object):
+
+    def __init__(self, path, resource, parent_id):
+        self.path = path
+        self.resource = resource
+        self.parent_id = parent_id
+        self.ids = set()
+        self.last_updated = 0
+
+
+class DomainSnapshot(object):
+    """The objects below a L3 (domains) or L2 (l2domains) domain
+
+    Indexed by ID, externalID, parent and type (the REST resource they were
+    fetched as, e.g. 'vports'). An object appearing in several collections,
+    such as a vport listed below its domain, is held once.
+    """
+
+    def __init__(self, client, domain_resource, domain_id, workers=WORKERS):
+        self.client = client
+        self.domain_resource = domain_resource
+        self.domain_id = domain_id
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._collections = {}     # path -> _Collection
+        self._objects = {}         # ID -> object
+        self._types = {}           # ID -> resource
+        self._by_external_id = {}  # externalID -> [object]
+        self.requests = 0
+
+    # - - - - - - loading
+
+    def load(self):
+        """Fetches the whole subtree, concurrently, returns self"""
+        with self._lock:
+            self._collections.clear()
+            self._objects.clear()
+            self._types.clear()
+            self._by_external_id.clear()
+        top = [self._add_collection(self.domain_resource, self.domain_id,
+                                    resource)
+               for resource in DOMAIN_RESOURCES[self.domain_resource]]
+        self._fetch_levels(top, full=True)
+        return self
+
+    def _add_collection(self, parent_resource, parent_id, resource):
+        path = '/%s/%s/%s' % (parent_resource, parent_id, resource)
+        collection = self._collections.get(path)
+        if collection is None:
+            collection = self._collections[path] = _Collection(
+                path, resource, parent_id)
+        return collection
+
+    def _fetch_levels(self, collections, full):
+        """Fetches collections, then the children of what they brought in"""
+        executor = futures.ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while collections:
+                results = [executor.submit(self._fetch, collection, full)
+                           for collection in collections]
+                collections = []
+                for result in results:
+                    collections.extend(result.result())
+        finally:
+            executor.shutdown(wait=True)
+
+    def _list(self, collection, updated_since=None):
+        headers = None
+        if updated_since is not None:
+            # also those last updated in the very millisecond of the last
+            # one seen, so that none goes unnoticed
+            headers = vsd_filter.headers(vsd_filter.Gt(
+                'lastUpdatedDate', updated_since - 1))
+        objs = list(self.client.iter_pages(collection.path, headers))
+        with self._lock:
+            self.requests += 1
+        return objs
+
+    def _fetch(self, collection, full):
+        """Fetches (the changes of) collection, returns its new children"""
+        try:
+            if full:
+                objs = self._list(collection)
+            else:
+                count = self.client.count(collection.path)
+                with self._lock:
+                    self.requests += 1
+                if count:
+                    objs = self._list(collection, collection.last_updated)
+                    with self._lock:
+                        known = collection.ids | set(o['ID'] for o in objs)
+                    full = count != len(known)
+                    if full:
+                        # something went: list everything again
+                        objs = self._list(collection)
+                else:
+                    objs, full = [], True
+        except exceptions.NotFound:
+            # its parent got deleted
+            with self._lock:
+                self._drop(collection.parent_id)
+                self._collections.pop(collection.path, None)
+            return []
+        with self._lock:
+            if full:
+                for gone in collection.ids - set(o['ID'] for o in objs):
+                    self._drop(gone)
+                collection.ids = set()
+            new_children = []
+            for obj in objs:
+                is_new = obj['ID'] not in self._objects
+                self._put(collection.resource, obj)
+                collection.ids.add(obj['ID'])
+                collection.last_updated = max(
+                    collection.last_updated, obj.get('lastUpdatedDate') or 0)
+                if is_new:
+                    new_children.extend(
+                        self._add_collection(collection.resource, obj['ID'],
+                                             resource)
+                        for resource in CHILD_RESOURCES.get(
+                            collection.resource, ()))
+            return new_children
+
+    def _put(self, resource, obj):
+        old = self._objects.get(obj['ID'])
+        if old is not None and old.get('externalID'):
+            holders = self._by_external_id.get(old['externalID'], [])
+            if old in holders:
+                holders.remove(old)
+        self._objects[obj['ID']] = obj
+        self._types[obj['ID']] = resource
+        if obj.get('externalID'):
+            self._by_external_id.setdefault(obj['externalID'], []).append(obj)
+
+    def _drop(self, obj_id):
+        obj = self._objects.pop(obj_id, None)
+        self._types.pop(obj_id, None)
+        if obj is not None and obj.get('externalID'):
+            holders = self._by_external_id.get(obj['externalID'], [])
+            if obj in holders:
+                holders.remove(obj)
+        for path, collection in list(self._collections.items()):
+            if collection.parent_id == obj_id:
+                del self._collections[path]
+                for child_id in collection.ids:
+                    self._drop(child_id)
+
+    def refresh(self, resources=None):
+        """Brings the snapshot up to date, returns the number of requests
+
+        Per collection, the size is counted to detect deletions, and only
+        the objects updated since the last fetch are listed, if any; only a
+        collection which shrank is listed entirely again. With
+        resources (e.g. ['vports']), only collections of those types are
+        refreshed.
+        """
+        collections = [c for c in list(self._collections.values())
+                       if not resources or c.resource in resources]
+        cache = getattr(self.client, 'response_cache', None)
+        if cache:
+            # the changes may not have been notified yet
+            for resource in set(c.resource for c in collections):
+                cache.invalidate('/' + resource)
+        before = self.requests
+        self._fetch_levels(collections, full=False)
+        return self.requests - before
+
+    # - - - - - - queries
+
+    def get(self, obj_id):
+        return self._objects.get(obj_id)
+
+    def type_of(self, obj_id):
+        return self._types.get(obj_id)
+
+    def of_type(self, resource):
+        """Returns all objects of a type, e.g. 'vports'"""
+        return [obj for obj_id, obj in six.iteritems(self._objects)
+                if self._types[obj_id] == resource]
+
+    def by_external_id(self, external_id, resource=None):
+        return [obj for obj in self._by_external_id.get(external_id, ())
+                if not resource or self._types[obj['ID']] == resource]
+
+    def children(self, parent_id, resource=None):
+        """Returns the objects whose parent is parent_id"""
+        return [obj for obj_id, obj in six.iteritems(self._objects)
+                if obj.get('parentID') == parent_id and
+                (not resource or self._types[obj_id] == resource)]
+
+    def find(self, resource, **attributes):
+        """Returns the objects of a type having all given attribute values"""
+        return [obj for obj in self.of_type(resource)
+                if all(obj.get(k) == v for k, v in
+                       six.iteritems(attributes))]
+
+    def __len__(self):
+        return len(self._objects)
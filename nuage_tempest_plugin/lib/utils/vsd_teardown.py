@@ -0,0 +1,180 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# Deletes a set of VSD objects in dependency order, e.g.
+#
+#     teardown = VSDTeardown()
+#     teardown.add(l2domain, client.delete_l2domain, 'l2domain')
+#     teardown.add(l2dom_template, client.delete_l2domaintemplate)
+#     teardown.run()
+#
+# An object is deleted only once everything below it or referring to it
+# (as far as known to the teardown) is gone, so the VSD never reports it as
+# being in use. Independent objects are deleted in parallel.
+
+import logging
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+# attributes through which a VSD object refers to objects that can only be
+# deleted after it
+REFERENCE_ATTRIBUTES = ('parentID', 'templateID',
+                        'associatedSharedNetworkResourceID')
+
+
+class _Node(object):
+
+    def __init__(self, key, delete, label):
+        self.key = key
+        self.delete = delete
+        self.label = label
+        self.after = set()   # keys of the nodes to delete before this one
+        self.start = None
+        self.end = None
+        self.error = None
+
+
+class TeardownReport(object):
+
+    def __init__(self, nodes, duration):
+        self.duration = duration
+        self.deleted = [n.label for n in nodes
+                        if n.end is not None and not n.error]
+        self.failed = [(n.label, n.error) for n in nodes if n.error]
+        self.skipped = [n.label for n in nodes if n.start is None]
+        self.critical_path = self._critical_path(nodes)
+
+    @staticmethod
+    def _critical_path(nodes):
+        """Returns [(label, secs)], the chain of deletes which took longest
+
+        Each delete waited for the last one to finish among those it had
+        to wait for; following those back from the last delete gives the
+        chain which determined the teardown duration.
+        """
+        by_key = dict((n.key, n) for n in nodes)
+        done = [n for n in nodes if n.end is not None]
+        path = []
+        node = max(done, key=lambda n: n.end) if done else None
+        while node:
+            path.append((node.label, node.end - node.start))
+            waited_for = [by_key[k] for k in node.after
+                          if by_key[k].end is not None]
+            node = (max(waited_for, key=lambda n: n.end)
+                    if waited_for else None)
+        return list(reversed(path))
+
+    def __str__(self):
+        return ('%d deleted, %d failed, %d skipped in %.2fs; critical path: '
+                '%s' % (len(self.deleted), len(self.failed),
+                        len(self.skipped), self.duration,
+                        ' -> '.join('%s (%.2fs)' % step
+                                    for step in self.critical_path)))
+
+
+class VSDTeardown(object):
+    """Dependency aware, parallel deletion of VSD objects"""
+
+    def __init__(self, workers=8):
+        self.workers = workers
+        self._nodes = {}
+        self._order = []
+        self._references = []
+
+    def add(self, obj, delete, label=None):
+        """Schedules the VSD object (dict) obj for deletion by delete(ID)
+
+        Objects obj refers to through REFERENCE_ATTRIBUTES, its parent
+        for instance, are deleted after it.
+        """
+        key = obj['ID']
+        if key in self._nodes:
+            return
+        self._nodes[key] = _Node(key, lambda: delete(key),
+                                 '%s %s' % (label or 'object', key))
+        self._order.append(key)
+        for attribute in REFERENCE_ATTRIBUTES:
+            if obj.get(attribute):
+                self._references.append((key, obj[attribute]))
+
+    def add_dependency(self, first, then):
+        """Has the object with ID then deleted after the one with ID first"""
+        self._references.append((first, then))
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def run(self):
+        """Deletes all objects, returns a TeardownReport
+
+        Objects depending on one which failed to be deleted are skipped.
+        Once all possible deletes are done, the first error is raised; the
+        report is then available as its teardown_report attribute.
+        """
+        nodes = [self._nodes[key] for key in self._order]
+        for first, then in self._references:
+            if first in self._nodes and then in self._nodes:
+                self._nodes[then].after.add(first)
+
+        cond = threading.Condition()
+        pending = set(self._order)
+        running = set()
+        finished = set()
+        failed = set()
+
+        def next_node():
+            # with cond held: a node whose dependencies are all deleted,
+            # None when nothing is left to be done
+            while True:
+                for key in self._order:
+                    if key not in pending:
+                        continue
+                    node = self._nodes[key]
+                    if node.after & failed:
+                        pending.discard(key)
+                        failed.add(key)  # skipped, and so are its dependants
+                        cond.notify_all()
+                        continue
+                    if node.after <= finished:
+                        pending.discard(key)
+                        running.add(key)
+                        return node
+                if not running:
+                    return None
+                cond.wait()
+
+        def worker():
+            while True:
+                with cond:
+                    node = next_node()
+                if node is None:
+                    return
+                node.start = time.time()
+                try:
+                    node.delete()
+                except Exception as e:
+                    node.error = e
+                node.end = time.time()
+                with cond:
+                    running.discard(node.key)
+                    (failed if node.error else finished).add(node.key)
+                    cond.notify_all()
+
+        start = time.time()
+        threads = [threading.Thread(target=worker)
+                   for _ in range(min(self.workers, len(nodes)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report = TeardownReport(nodes, time.time() - start)
+        LOG.info('VSD teardown: %s', report)
+        for label, error in report.failed:
+            LOG.error('VSD teardown of %s failed: %s', label, error)
+            error.teardown_report = report
+        if report.failed:
+            raise report.failed[0][1]
+        return report
@@ -0,0 +1,90 @@
+# Copyright 2026 NOKIA
+# All Rights Reserved.
+#
+# Concurrent flavour of NuageRestClient, allowing verification helpers to
+# issue many independent VSD requests at once, e.g.
+#
+#     with AsyncNuageRestClient() as client:
+#         vm_interfaces = client.gather(
+#             *[client.get_child_resource(constants.VPORT, vport_id,
+#                                         constants.VM_IFACE)
+#               for vport_id in vport_ids])
+#
+# Every NuageRestClient helper is available, returning a future of its
+# result. They run on a bounded thread pool through a copy of the
+# RESTProxyServer of the synchronous client, hence share its authentication
+# header and API key, over keep-alive connections of a pool of their own,
+# sized to the concurrency. asyncio code can await these futures through
+# asyncio.wrap_future(). close(), or leaving the with block, stops the
+# threads and closes the connections.
+
+from concurrent import futures
+import copy
+import functools
+
+from nuage_tempest_plugin.lib.topology import Topology
+from nuage_tempest_plugin.lib.utils import restproxy
+from nuage_tempest_plugin.services.nuage_client import NuageRestClient
+
+LOG = Topology.get_logger(__name__)
+
+
+class AsyncNuageRestClient(object):
+    """NuageRestClient whose helpers return futures
+
+    At most `concurrency` requests are in flight at any time; further calls
+    are queued. The synchronous client is available as `self.client`.
+    """
+
+    def __init__(self, client=None, concurrency=None):
+        client = client or NuageRestClient()
+        self.concurrency = concurrency or Topology.vsd_async_concurrency
+        proxy = copy.copy(client.restproxy)
+        proxy.pool = restproxy.HTTPConnectionPool(
+            proxy._create_connection, self.concurrency,
+            client.restproxy.pool.idle_timeout)
+        self.client = copy.copy(client)
+        self.client.restproxy = proxy
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=self.concurrency)
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name == 'client':
+            raise AttributeError(name)
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def submit(*args, **kwargs):
+            return self._executor.submit(attr, *args, **kwargs)
+        return submit
+
+    @staticmethod
+    def gather(*fs, **kwargs):
+        """Waits for all futures, returning their results in the given order
+
+        :param return_exceptions: return the exception a future raised as
+        its result, rather than raising the first one
+        """
+        return_exceptions = kwargs.pop('return_exceptions', False)
+        results = []
+        for future in fs:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def close(self):
+        """Waits for the queued calls, then stops the pools"""
+        self._executor.shutdown(wait=True)
+        self.client.restproxy.pool.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -7,39 +7,147 @@
 #
 #
 
+from concurrent import futures
+import logging
 import netaddr
 import re
-import six
+import threading
 import time
 
-from tempest.lib.common.utils import test_utils as misc_utils
 from tempest.lib import exceptions
 
 from nuage_tempest_plugin.lib.topology import Topology
+from nuage_tempest_plugin.lib.utils import cassette
 from nuage_tempest_plugin.lib.utils import constants
 from nuage_tempest_plugin.lib.utils import exceptions as n_exceptions
+from nuage_tempest_plugin.lib.utils import request_logging
+from nuage_tempest_plugin.lib.utils import response_cache
 from nuage_tempest_plugin.lib.utils import restproxy
+from nuage_tempest_plugin.lib.utils import vsd_events
+from nuage_tempest_plugin.lib.utils import vsd_filter
+from nuage_tempest_plugin.lib.utils import vsd_metrics
 
 SERVERSSL = True
 SERVERTIMEOUT = 30
 RESPONSECHOICE = '?responseChoice=1'
 CMS_ID = None
+PAGE_SIZE = 500
 
 CONF = Topology.get_conf()
 LOG = Topology.get_logger(__name__)
 
 
+# /enterprises/<id>, possibly followed by a child resource
+NET_PARTITION_PATH = re.compile(
+    r'^/%s/(?P<id>[^/?]+)(?P<child>/[^?]*)?' % constants.NET_PARTITION)
+
+
 # convert a structure into a string safely
 def safe_body(body, maxlen=5000):
-    try:
-        text = six.text_type(body)
-    except UnicodeDecodeError:
-        # if this isn't actually text, return marker that
-        return "<BinaryData: removed>"
-    if len(text) > maxlen:
-        return text[:maxlen]
-    else:
-        return text
+    return request_logging.truncated_text(body, maxlen)[0]
+
+
+class NetPartitionIdCache(object):
+    """Net-partition name to ID mapping, shared by all clients
+
+    Hits are the VSD lookups which were saved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, name):
+        with self._lock:
+            netpart_id = self._ids.get(name)
+            if netpart_id is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return netpart_id
+
+    def put(self, name, netpart_id):
+        with self._lock:
+            self._ids[name] = netpart_id
+
+    def invalidate(self, name=None, netpart_id=None):
+        with self._lock:
+            for cached_name, cached_id in list(self._ids.items()):
+                if cached_name == name or cached_id == netpart_id:
+                    del self._ids[cached_name]
+                    self.invalidations += 1
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'invalidations': self.invalidations}
+
+
+netpartition_ids = NetPartitionIdCache()
+vsd_metrics.register_counters('net_partition_id_cache',
+                              netpartition_ids.stats)
+
+_get_cache = None
+_get_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Returns the process-wide VSD GET cache, None when not enabled"""
+    global _get_cache
+    if not Topology.vsd_get_cache:
+        return None
+    with _get_cache_lock:
+        if _get_cache is None:
+            _get_cache = response_cache.ResponseCache(
+                Topology.vsd_get_cache_max_bytes,
+                Topology.vsd_get_cache_ttl,
+                Topology.vsd_get_cache_ttls)
+            vsd_metrics.register_counters('get_cache', _get_cache.stats)
+        return _get_cache
+
+
+_event_subscriber = None
+_event_subscriber_lock = threading.Lock()
+
+
+def _invalidate_cached_on_event(event):
+    cache = get_response_cache()
+    if cache and event.get('entityType'):
+        cache.invalidate(
+            '/' + vsd_events.resource_name(event['entityType']),
+            event.get('type'))
+
+
+def get_event_subscriber():
+    """Returns the process-wide VSD event subscriber, None when not enabled
+
+    It is not used along with a cassette, as it never replays events.
+    """
+    global _event_subscriber
+    if (not Topology.vsd_push_notifications or
+            Topology.vsd_cassette_mode != 'off'):
+        return None
+    with _event_subscriber_lock:
+        if _event_subscriber is None:
+            proxy = restproxy.RESTProxyServer(
+                Topology.vsd_server, Topology.base_uri, SERVERSSL,
+                Topology.server_auth, Topology.auth_resource,
+                Topology.vsd_org, vsd_events.LONG_POLL_TIMEOUT,
+                retry_policy=restproxy.RetryPolicy(max_retries=1),
+                api_key_cache=restproxy.get_api_key_cache(
+                    Topology.vsd_api_key_cache_file,
+                    Topology.vsd_api_key_refresh_margin))
+            # long polls get a connection of their own, with their timeout
+            proxy.pool = restproxy.HTTPConnectionPool(
+                proxy._create_connection, maxsize=1)
+            _event_subscriber = vsd_events.VSDEventSubscriber(proxy)
+            _event_subscriber.add_listener(_invalidate_cached_on_event)
+            vsd_metrics.register_counters('vsd_events',
+                                          _event_subscriber.stats)
+            _event_subscriber.start()
+        return _event_subscriber
 
 
 class NuageRestClient(object):
@@ -59,10 +167,34 @@ class NuageRestClient(object):
         server_auth = Topology.server_auth
         vsd_org = Topology.vsd_org
 
-        self.restproxy = restproxy.RESTProxyServer(server, base_uri, SERVERSSL,
-                                                   server_auth, auth_resource,
-                                                   vsd_org, SERVERTIMEOUT)
+        self.restproxy = restproxy.RESTProxyServer(
+            server, base_uri, SERVERSSL, server_auth, auth_resource,
+            vsd_org, SERVERTIMEOUT,
+            pool_size=Topology.vsd_conn_pool_size,
+            pool_idle_timeout=Topology.vsd_conn_pool_idle_timeout,
+            retry_policy=restproxy.RetryPolicy(
+                base_delay=Topology.vsd_retry_base_delay,
+                max_delay=Topology.vsd_retry_max_delay,
+                deadline=Topology.vsd_request_deadline),
+            api_key_cache=restproxy.get_api_key_cache(
+                Topology.vsd_api_key_cache_file,
+                Topology.vsd_api_key_refresh_margin),
+            cassette=(cassette.get_cassette(Topology.vsd_cassette,
+                                            Topology.vsd_cassette_mode)
+                      if Topology.vsd_cassette_mode != 'off' else None))
+        self.log_maxlen = Topology.vsd_log_body_maxlen
+        self.log_sample_rate = Topology.vsd_log_large_body_sample_rate
+        self.restproxy.log_maxlen = self.log_maxlen
+        self.restproxy.log_sample_rate = self.log_sample_rate
         self.restproxy.generate_nuage_auth()
+        self.response_cache = get_response_cache()
+        vsd_metrics.enable_worker_dump(Topology.vsd_metrics_dir)
+
+    @property
+    def event_subscriber(self):
+        # started on the first wait, workers which never wait on the VSD
+        # hold no long poll
+        return get_event_subscriber()
 
     @staticmethod
     def _error_checker(resp):
@@ -98,11 +230,11 @@ class NuageRestClient(object):
 
     def _log_request_start(self, method, req_url, req_headers=None,
                            req_body=None):
-        if req_headers is None:
-            req_headers = {}
-        caller_name = misc_utils.find_test_caller()
         trace_regex = CONF.debug.trace_requests
-        if trace_regex and re.search(trace_regex, caller_name):
+        if not trace_regex or not LOG.isEnabledFor(logging.DEBUG):
+            return
+        caller_name = request_logging.get_test_caller()
+        if re.search(trace_regex, caller_name):
             LOG.debug('Starting Request (%s): %s %s',
                       caller_name, method, req_url)
 
@@ -111,7 +243,7 @@ class NuageRestClient(object):
                           req_body=None, resp_body=None,
                           caller_name=None, extra=None):
         if 'X-Auth-Token' in req_headers:
-            req_headers['X-Auth-Token'] = '<omitted>'
+            req_headers = dict(req_headers, **{'X-Auth-Token': '<omitted>'})
         log_fmt = """Request (%s):
             HTTP %s %s %s%s
             Request - Headers: %s
@@ -121,13 +253,18 @@ class NuageRestClient(object):
 
         LOG.debug(
             log_fmt, caller_name, resp.status, method, req_url, secs,
-            str(req_headers), safe_body(req_body),
+            req_headers, request_logging.LazyBody(req_body, self.log_maxlen),
             resp.headers,
-            safe_body(resp_body), extra=extra)
+            request_logging.LazyBody(resp_body, self.log_maxlen,
+                                     self.log_sample_rate),
+            extra=extra)
 
     def _log_request(self, method, req_url, resp,
                      secs="", req_headers=None,
                      req_body=None, resp_body=None):
+        # nothing to do - not even finding the caller - when not logging
+        if not LOG.isEnabledFor(logging.INFO):
+            return
         if req_headers is None:
             req_headers = {}
 
@@ -135,11 +272,7 @@ class NuageRestClient(object):
         # extra = dict(request_id=self._get_request_id(resp))
         extra = {}
 
-        # NOTE(sdague): while we still have 6 callers to this function
-        # we're going to just provide work around on who is actually
-        # providing timings by gracefully adding no content if they don't.
-        # Once we're down to 1 caller, clean this up.
-        caller_name = misc_utils.find_test_caller()
+        caller_name = request_logging.get_test_caller()
         if secs:
             secs = " %.3fs" % secs
         LOG.info(
@@ -148,25 +281,72 @@ class NuageRestClient(object):
 
         # Also look everything at DEBUG if you want to filter this
         # out, don't run at debug.
-        self._log_request_full(method, req_url, resp, secs, req_headers,
-                               req_body, resp_body, caller_name, extra)
+        if LOG.isEnabledFor(logging.DEBUG):
+            if resp_body is None:
+                resp_body = resp.data
+            self._log_request_full(method, req_url, resp, secs, req_headers,
+                                   req_body, resp_body, caller_name, extra)
+
+    def _cached_response(self, method, url, extra_headers):
+        if not self.response_cache or method != 'GET':
+            return None
+        cached = self.response_cache.get(url, extra_headers)
+        if cached is None:
+            return None
+        data, headers = cached
+        return restproxy.RESTResponse(200, 'OK', data, headers)
+
+    def _update_response_cache(self, method, url, extra_headers, resp):
+        if not self.response_cache:
+            return
+        if method == 'GET':
+            if resp.status == 200:
+                self.response_cache.put(url, extra_headers, resp.data,
+                                        resp.headers)
+        elif method != 'HEAD':
+            self.response_cache.invalidate(url, method)
 
     def request(self, method, url, body=None, extra_headers=None):
+        resp = self._cached_response(method, url, extra_headers)
+        if resp is not None:
+            return resp
+
         self._log_request_start(method, url)
 
         start = time.time()
-        resp = self.restproxy.rest_call(
-            method, url, data=body, extra_headers=extra_headers)
+        try:
+            resp = self.restproxy.rest_call(
+                method, url, data=body, extra_headers=extra_headers)
+        except Exception:
+            vsd_metrics.record(method, url, time.time() - start, error=True)
+            raise
         end = time.time()
+        vsd_metrics.record(method, url, end - start,
+                           error=resp.status >= 400)
 
         self._log_request(method, url, resp, secs=(end - start),
-                          req_headers=extra_headers, req_body=body,
-                          resp_body=resp.data)
+                          req_headers=extra_headers, req_body=body)
+
+        self._invalidate_net_partition_ids(method, url, body, resp.status)
+        self._update_response_cache(method, url, extra_headers, resp)
 
         # Verify HTTP response codes
         self._error_checker(resp)
         return resp
 
+    @staticmethod
+    def _invalidate_net_partition_ids(method, url, body, status):
+        if method == 'POST' and url == '/' + constants.NET_PARTITION:
+            if isinstance(body, dict):
+                netpartition_ids.invalidate(name=body.get('name'))
+            return
+        match = NET_PARTITION_PATH.match(url)
+        if not match:
+            return
+        if status == 404 or (method in ('PUT', 'DELETE') and
+                             not match.group('child')):
+            netpartition_ids.invalidate(netpart_id=match.group('id'))
+
     def delete(self, url, body=None, extra_headers=None):
         return self.request('DELETE', url, body, extra_headers)
 
@@ -198,6 +378,34 @@ class NuageRestClient(object):
             headers['X-Nuage-Filter'] = "%s IS '%s'" % (attr, attr_value)
         return headers
 
+    @staticmethod
+    def get_filter_headers(expression):
+        """Returns the headers filtering on a vsd_filter expression"""
+        return vsd_filter.headers(expression)
+
+    def get_by_external_ids(self, res_path, neutron_ids, expression=None):
+        """Returns {neutron ID: object} for the objects of neutron_ids
+
+        The objects are looked up under res_path through their externalID,
+        with as few GETs as the filter header length allows. Neutron IDs
+        without a matching object (also matching expression, when given)
+        are left out.
+        """
+        by_external_id = dict((self.get_vsd_external_id(neutron_id),
+                               neutron_id) for neutron_id in neutron_ids)
+        if not by_external_id:
+            return {}
+        expression = vsd_filter.And(
+            *([expression] if expression else []) +
+            [vsd_filter.In('externalID', sorted(by_external_id))])
+        found = {}
+        for chunk in expression.split(Topology.vsd_filter_max_len):
+            for obj in self.iter_pages(res_path, vsd_filter.headers(chunk)):
+                neutron_id = by_external_id.get(obj.get('externalID'))
+                if neutron_id:
+                    found[neutron_id] = obj
+        return found
+
     @staticmethod
     def build_resource_path(resource=None, resource_id=None,
                             child_resource=None):
@@ -216,24 +424,49 @@ class NuageRestClient(object):
             extra_headers = self.get_extra_headers(filters, filter_value)
         return self.get(res_path, extra_headers)
 
+    def _get_resource_path(self, resource, netpart_name=None,
+                           flat_rest_path=False):
+        if flat_rest_path:
+            return '/' + resource
+        netpart_id = self.get_net_partition_id(netpart_name)
+        return self.build_resource_path(
+            resource=constants.NET_PARTITION,
+            resource_id=netpart_id,
+            child_resource=resource)
+
+    def _net_partition_request(self, netpart_name, resource, send):
+        """Returns send(res_path) for resource of the net-partition
+
+        When the net-partition got recreated since its ID was cached, the
+        404 dropped that ID, and the request is resent under the new one.
+        """
+        res_path = self._get_resource_path(resource, netpart_name)
+        try:
+            return send(res_path)
+        except n_exceptions.NotFound:
+            retry_path = self._get_resource_path(resource, netpart_name)
+            if retry_path == res_path:
+                raise
+            return send(retry_path)
+
     def get_resource(self, resource, filters=None,
                      filter_value=None,
                      netpart_name=None,
                      flat_rest_path=False):
         extra_headers = None
-        if flat_rest_path:
-            res_path = '/' + resource
-        else:
-            if not netpart_name:
-                netpart_name = self.def_netpart_name
-            net_part = self.get_net_partition(netpart_name)
-            res_path = self.build_resource_path(
-                resource=constants.NET_PARTITION,
-                resource_id=net_part[0]['ID'],
-                child_resource=resource)
         if filters:
             extra_headers = self.get_extra_headers(filters, filter_value)
-        return self.get(res_path, extra_headers)
+        if flat_rest_path:
+            return self.get('/' + resource, extra_headers)
+        return self._net_partition_request(
+            netpart_name, resource,
+            lambda res_path: self.get(res_path, extra_headers))
+
+    def create_resource(self, resource, data, netpart_name=None):
+        """Creates resource in the net-partition"""
+        return self._net_partition_request(
+            netpart_name, resource,
+            lambda res_path: self.post(res_path, data))
 
     def get_child_resource(self, resource, resource_id, child_resource,
                            filters=None, filter_value=None):
@@ -245,12 +478,263 @@ class NuageRestClient(object):
             extra_headers = self.get_extra_headers(filters, filter_value)
         return self.get(res_path, extra_headers)
 
+    # Paging
+    @staticmethod
+    def _get_count(resp):
+        for header, value in (resp.headers or {}).items():
+            if header.lower() == 'x-nuage-count':
+                return int(value)
+        return None
+
+    def _get_page(self, res_path, extra_headers, page, page_size):
+        headers = dict(extra_headers or {})
+        headers['X-Nuage-Page'] = str(page)
+        headers['X-Nuage-PageSize'] = str(page_size)
+        return self.request('GET', res_path, extra_headers=headers)
+
+    def iter_pages(self, res_path, extra_headers=None, page_size=PAGE_SIZE,
+                   prefetch=True):
+        """Yields the objects of a VSD collection one page at a time
+
+        Pages are requested through the X-Nuage-Page and X-Nuage-PageSize
+        headers and only decoded when reached, so large collections need not
+        be held in memory at once. With prefetch, the next page is requested
+        in the background while the current one is being consumed; that
+        stops as soon as the iteration does, or the generator is closed.
+        """
+        executor = futures.ThreadPoolExecutor(max_workers=1) \
+            if prefetch else None
+        pending = None
+        page = 0
+        try:
+            while True:
+                resp = (pending.result() if pending else
+                        self._get_page(res_path, extra_headers, page,
+                                       page_size))
+                pending = None
+                count = self._get_count(resp)
+                if count is not None:
+                    more = (page + 1) * page_size < count
+                else:
+                    # only told by the page itself
+                    more = len(resp.data or []) == page_size
+                if more and executor:
+                    pending = executor.submit(self._get_page, res_path,
+                                              extra_headers, page + 1,
+                                              page_size)
+                for item in resp.data or []:
+                    yield item
+                if not more:
+                    return
+                page += 1
+        finally:
+            if pending:
+                pending.cancel()
+            if executor:
+                # a page in flight is dropped when it arrives
+                executor.shutdown(wait=False)
+
+    def count(self, res_path, extra_headers=None):
+        """Returns the size of a VSD collection, without fetching it"""
+        resp = self.request('HEAD', res_path, extra_headers=extra_headers)
+        return self._get_count(resp) or 0
+
+    def iter_resource(self, resource, filters=None, filter_value=None,
+                      netpart_name=None, flat_rest_path=False,
+                      page_size=PAGE_SIZE, prefetch=True):
+        extra_headers = None
+        res_path = self._get_resource_path(resource, netpart_name,
+                                           flat_rest_path)
+        if filters:
+            extra_headers = self.get_extra_headers(filters, filter_value)
+        return self.iter_pages(res_path, extra_headers, page_size, prefetch)
+
+    def iter_child_resource(self, resource, resource_id, child_resource,
+                            filters=None, filter_value=None,
+                            page_size=PAGE_SIZE, prefetch=True):
+        extra_headers = None
+        res_path = self.build_resource_path(
+            resource, resource_id,
+            child_resource)
+        if filters:
+            extra_headers = self.get_extra_headers(filters, filter_value)
+        return self.iter_pages(res_path, extra_headers, page_size, prefetch)
+
+    def count_resource(self, resource, filters=None, filter_value=None,
+                       netpart_name=None, flat_rest_path=False):
+        extra_headers = None
+        if filters:
+            extra_headers = self.get_extra_headers(filters, filter_value)
+        if flat_rest_path:
+            return self.count('/' + resource, extra_headers)
+        return self._net_partition_request(
+            netpart_name, resource,
+            lambda res_path: self.count(res_path, extra_headers))
+
+    def count_child_resource(self, resource, resource_id, child_resource,
+                             filters=None, filter_value=None):
+        extra_headers = None
+        res_path = self.build_resource_path(
+            resource, resource_id,
+            child_resource)
+        if filters:
+            extra_headers = self.get_extra_headers(filters, filter_value)
+        return self.count(res_path, extra_headers)
+
+    # Waits
+    def wait_until(self, predicate, timeout=None, resources=None,
+                   message=None):
+        """Returns the first true result of predicate()
+
+        predicate is re-checked as soon as the VSD reports a change of any of
+        resources (e.g. constants.VPORT), or of anything when not given, and
+        in any case every vsd_wait_poll_interval seconds.
+        """
+        def check():
+            if self.response_cache:
+                # the change waited for may not have been notified yet
+                for resource in resources or ():
+                    self.response_cache.invalidate('/' + resource)
+            return predicate()
+
+        return vsd_events.wait_until(
+            check, timeout or CONF.network.build_timeout,
+            [vsd_events.entity_type(r) for r in resources]
+            if resources else None,
+            Topology.vsd_wait_poll_interval, message, self.event_subscriber)
+
+    def _wait_for_change(self, resources, timeout):
+        """Sleeps timeout seconds, less when resources change meanwhile"""
+        if self.event_subscriber and self.event_subscriber.connected:
+            self.event_subscriber.wait(
+                self.event_subscriber.sequence,
+                [vsd_events.entity_type(r) for r in resources], timeout)
+        else:
+            time.sleep(timeout)
+
+    def wait_for_vm_interfaces(self, port_ids, timeout=None, parent=None,
+                               parent_id=None):
+        """Waits for a VM interface of each port, returns them by port ID"""
+        port_ids = set(port_ids)
+
+        def all_found():
+            found = self.get_vm_ifaces_by_port_ids(port_ids, parent,
+                                                   parent_id)
+            return found if len(found) == len(port_ids) else None
+
+        return self.wait_until(
+            all_found, timeout, [constants.VM_IFACE],
+            'No VM interface on the VSD for all of ports %s' %
+            ', '.join(sorted(port_ids)))
+
+    def wait_for_vports(self, parent, parent_id, port_ids, timeout=None):
+        """Waits for a vport of each port, returns them by port ID"""
+        port_ids = set(port_ids)
+
+        def all_found():
+            found = self.get_vports_by_port_ids(parent, parent_id, port_ids)
+            return found if len(found) == len(port_ids) else None
+
+        return self.wait_until(
+            all_found, timeout, [constants.VPORT],
+            'No vport on the VSD for all of ports %s' %
+            ', '.join(sorted(port_ids)))
+
+    def wait_for_child_count(self, resource, resource_id, child_resource,
+                             count, timeout=None):
+        """Waits until the VSD object has count children of a type"""
+        return self.wait_until(
+            lambda: self.count_child_resource(
+                resource, resource_id, child_resource) == count,
+            timeout, [child_resource],
+            '%s %s does not get %d %s' % (resource, resource_id, count,
+                                          child_resource))
+
     def delete_resource(self, resource, resource_id, responseChoice=False):
         res_path = self.build_resource_path(resource, resource_id)
         if responseChoice:
             res_path = res_path + RESPONSECHOICE
         return self.delete(res_path)
 
+    # Bulk operations
+    def _bulk_results(self, resp, items):
+        """Returns a (result, error) tuple per item of a bulk response
+
+        A 207 response carries a status per item, which is checked like the
+        status of a single request; any other successful response applies
+        to all items alike.
+        """
+        if resp.status != 207:
+            data = resp.data if isinstance(resp.data, list) else []
+            if len(data) != len(items):
+                data = items
+            return [(result, None) for result in data]
+        results = []
+        for item, item_resp in zip(items, resp.data):
+            data = item_resp.get('data')
+            try:
+                self._error_checker(restproxy.RESTResponse(
+                    item_resp['status'], None, data, {}))
+            except n_exceptions.NuageRestClientException as e:
+                results.append((None, e))
+                continue
+            if isinstance(data, list) and len(data) == 1:
+                data = data[0]
+            results.append((data or item_resp.get('ID', item), None))
+        return results
+
+    def bulk_request(self, method, url, items, chunk_size=None):
+        """Sends items as list bodies of at most chunk_size items
+
+        Returns the results in the order of items: the created objects for
+        a POST, the IDs for a PUT or DELETE. When any item fails, all chunks
+        are still sent, after which BulkError is raised carrying the result
+        or exception of every item.
+        """
+        chunk_size = chunk_size or Topology.vsd_bulk_chunk_size
+        results = []
+        errors = []
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            try:
+                resp = self.request(method, url, chunk)
+                chunk_results = self._bulk_results(resp, chunk)
+            except n_exceptions.NuageRestClientException as e:
+                # the chunk was rejected as a whole
+                chunk_results = [(None, e)] * len(chunk)
+            for index, (result, error) in enumerate(chunk_results, start):
+                if error:
+                    errors.append((index, error))
+                    results.append(error)
+                else:
+                    results.append(result)
+        if errors:
+            raise n_exceptions.BulkError(results, errors)
+        return results
+
+    def bulk_create(self, res_path, items, chunk_size=None):
+        # results are shaped as those of post(), a list holding the object
+        try:
+            return [[obj] for obj in self.bulk_request(
+                'POST', res_path, items, chunk_size)]
+        except n_exceptions.BulkError as e:
+            e.results = [r if isinstance(r, Exception) else [r]
+                         for r in e.results]
+            raise
+
+    def bulk_update(self, resource, items, chunk_size=None):
+        """Updates objects of one type, items are dicts holding their ID"""
+        return self.bulk_request(
+            'PUT', self.build_resource_path(resource), items, chunk_size)
+
+    def bulk_delete(self, resource, resource_ids, responseChoice=False,
+                    chunk_size=None):
+        res_path = self.build_resource_path(resource)
+        if responseChoice:
+            res_path = res_path + RESPONSECHOICE
+        return self.bulk_request('DELETE', res_path, list(resource_ids),
+                                 chunk_size)
+
     # Net Partition
     def create_net_partition(self, name, fip_quota, extra_params):
         data = {
@@ -271,6 +755,19 @@ class NuageRestClient(object):
         extra_headers = self.get_extra_headers('name', net_part_name)
         return self.get(res_path, extra_headers)
 
+    def get_net_partition_id(self, net_part_name=None):
+        """Returns the ID of the net-partition, looked up once per run"""
+        net_part_name = net_part_name or self.def_netpart_name
+        netpart_id = netpartition_ids.get(net_part_name)
+        if netpart_id is None:
+            netpartitions = self.get_net_partition(net_part_name)
+            if not netpartitions:
+                raise n_exceptions.NotFound(
+                    'Net-partition %s not found' % net_part_name)
+            netpart_id = netpartitions[0]['ID']
+            netpartition_ids.put(net_part_name, netpart_id)
+        return netpart_id
+
     # Network
     # EnterpriseNetworkMacro
     def get_enterprise_net_macro(self, filters=None, filter_value=None,
@@ -299,14 +796,8 @@ class NuageRestClient(object):
         }
         if extra_params:
             data.update(extra_params)
-        if not netpart_name:
-            netpart_name = self.def_netpart_name
-        net_part = self.get_net_partition(netpart_name)
-
-        res_path = self.build_resource_path(
-            constants.NET_PARTITION, net_part[0]['ID'],
-            constants.DOMAIN_TEMPLATE)
-        return self.post(res_path, data)
+        return self.create_resource(constants.DOMAIN_TEMPLATE, data,
+                                    netpart_name)
 
     def get_l3domaintemplate(self, filters=None,
                              filter_value=None, netpart_name=None):
@@ -328,13 +819,7 @@ class NuageRestClient(object):
             data['externalID'] = self.get_vsd_external_id(externalId)
         if extra_params:
             data.update(extra_params)
-        if not netpart_name:
-            netpart_name = self.def_netpart_name
-        net_part = self.get_net_partition(netpart_name)
-        res_path = self.build_resource_path(
-            constants.NET_PARTITION, net_part[0]['ID'],
-            constants.DOMAIN)
-        return self.post(res_path, data)
+        return self.create_resource(constants.DOMAIN, data, netpart_name)
 
     # If filters is not set, returns /enterprises/%s/domains
     def get_l3domain(self, filters=None, filter_value=None, netpart_name=None):
@@ -353,7 +838,9 @@ class NuageRestClient(object):
                       'Policy Group cannot be deleted as it is attached '
                       'to VPort' in str(e)):
                     LOG.error('Got {} (attempt {})'.format(str(e), attempt))
-                    time.sleep(0.2)  # same wait time as plugin
+                    # same wait time as plugin, shorter when vports change
+                    self._wait_for_change(
+                        [constants.VPORT, constants.POLICYGROUP], 0.2)
                 else:
                     raise
 
@@ -580,14 +1067,8 @@ class NuageRestClient(object):
         }
         if extra_params:
             data.update(extra_params)
-        if not netpart_name:
-            netpart_name = self.def_netpart_name
-        net_part = self.get_net_partition(netpart_name)
-
-        res_path = self.build_resource_path(
-            constants.NET_PARTITION, net_part[0]['ID'],
-            constants.L2_DOMAIN_TEMPLATE)
-        return self.post(res_path, data)
+        return self.create_resource(constants.L2_DOMAIN_TEMPLATE, data,
+                                    netpart_name)
 
     def get_l2domaintemplate(self, filters=None, filter_value=None,
                              netpart_name=None):
@@ -604,7 +1085,8 @@ class NuageRestClient(object):
                     raise
                 elif 'l2domaintemplate is in use' in str(e):
                     LOG.error('Got {} (attempt {})'.format(str(e), attempt))
-                    time.sleep(0.2)  # same wait time as plugin
+                    # same wait time as plugin, shorter when l2domains change
+                    self._wait_for_change([constants.L2_DOMAIN], 0.2)
                 else:
                     raise
 
@@ -630,14 +1112,7 @@ class NuageRestClient(object):
             data['externalID'] = self.get_vsd_external_id(externalId)
         if extra_params:
             data.update(extra_params)
-        if not netpart_name:
-            netpart_name = self.def_netpart_name
-        net_part = self.get_net_partition(netpart_name)
-
-        res_path = self.build_resource_path(
-            constants.NET_PARTITION, net_part[0]['ID'],
-            constants.L2_DOMAIN)
-        return self.post(res_path, data)
+        return self.create_resource(constants.L2_DOMAIN, data, netpart_name)
 
     def update_l2domain(self, l2domain_id, externalId=None,
                         update_params=None):
@@ -666,7 +1141,9 @@ class NuageRestClient(object):
                       'Policy Group cannot be deleted as it is attached '
                       'to VPort' in str(e)):
                     LOG.error('Got {} (attempt {})'.format(str(e), attempt))
-                    time.sleep(0.2)  # same wait time as plugin
+                    # same wait time as plugin, shorter when vports change
+                    self._wait_for_change(
+                        [constants.VPORT, constants.POLICYGROUP], 0.2)
                 else:
                     raise
 
@@ -685,8 +1162,8 @@ class NuageRestClient(object):
 
     # Policy
     # Policygroup
-    def create_policygroup(self, parent, parent_id, name, type,
-                           externalId=None, extra_params=None):
+    def _policygroup_data(self, name, type, externalId=None,
+                          extra_params=None):
         data = {
             'description': name,
             'type': type
@@ -698,10 +1175,23 @@ class NuageRestClient(object):
             data['name'] = name
         if extra_params:
             data.update(extra_params)
+        return data
+
+    def create_policygroup(self, parent, parent_id, name, type,
+                           externalId=None, extra_params=None):
+        data = self._policygroup_data(name, type, externalId, extra_params)
         res_path = self.build_resource_path(
             parent, parent_id, constants.POLICYGROUP)
         return self.post(res_path, data)
 
+    def create_policygroups(self, parent, parent_id, policygroups):
+        """Bulk create_policygroup, policygroups are dicts of its arguments"""
+        res_path = self.build_resource_path(
+            parent, parent_id, constants.POLICYGROUP)
+        return self.bulk_create(
+            res_path, [self._policygroup_data(**policygroup)
+                       for policygroup in policygroups])
+
     def delete_policygroup(self, id):
         return self.delete_resource(constants.POLICYGROUP, id)
 
@@ -916,16 +1406,19 @@ class NuageRestClient(object):
         result = self.post(res_path, data)
         return result
 
-    def create_ingress_security_group_entry(self, name_description,
-                                            iacl_template_id,
-                                            extra_params=None,
-                                            responseChoice=False):
+    @staticmethod
+    def _ingress_security_group_entry_data(name_description,
+                                           extra_params=None):
         data = {
             "description": name_description
         }
 
         if extra_params:
             data.update(extra_params)
+        return data
+
+    def _ingress_security_group_entry_path(self, iacl_template_id,
+                                           responseChoice):
         res_path = self.build_resource_path(
             resource=constants.INGRESS_ACL_TEMPLATE,
             resource_id=iacl_template_id,
@@ -933,10 +1426,32 @@ class NuageRestClient(object):
 
         if responseChoice:
             res_path = res_path + RESPONSECHOICE
+        return res_path
 
+    def create_ingress_security_group_entry(self, name_description,
+                                            iacl_template_id,
+                                            extra_params=None,
+                                            responseChoice=False):
+        data = self._ingress_security_group_entry_data(name_description,
+                                                       extra_params)
+        res_path = self._ingress_security_group_entry_path(
+            iacl_template_id, responseChoice)
         result = self.post(res_path, data)
         return result
 
+    def create_ingress_security_group_entries(self, iacl_template_id,
+                                              entries, responseChoice=False):
+        """Bulk create_ingress_security_group_entry
+
+        entries are dicts of its name_description and extra_params
+        arguments
+        """
+        res_path = self._ingress_security_group_entry_path(
+            iacl_template_id, responseChoice)
+        return self.bulk_create(
+            res_path, [self._ingress_security_group_entry_data(**entry)
+                       for entry in entries])
+
     # ACLRule
     def create_ingress_acl(self):
         pass
@@ -983,6 +1498,14 @@ class NuageRestClient(object):
                                        constants.VM_IFACE, filters,
                                        filter_value)
 
+    def get_vm_ifaces_by_port_ids(self, port_ids, parent=None,
+                                  parent_id=None):
+        """Batched get_vm_iface by port, returns {port ID: vm interface}"""
+        res_path = self.build_resource_path(parent or constants.VM_IFACE,
+                                            parent_id,
+                                            parent and constants.VM_IFACE)
+        return self.get_by_external_ids(res_path, port_ids)
+
     # VM
     def get_vm(self, parent, parent_id, filters=None,
                filter_value=None, netpart_name=None):
@@ -1006,6 +1529,12 @@ class NuageRestClient(object):
         return self.get_child_resource(parent, parent_id, constants.VPORT,
                                        filters, filter_value)
 
+    def get_vports_by_port_ids(self, parent, parent_id, port_ids):
+        """Batched get_vport by port, returns {port ID: vport}"""
+        res_path = self.build_resource_path(parent, parent_id,
+                                            constants.VPORT)
+        return self.get_by_external_ids(res_path, port_ids)
+
     # VirtualIP
     def get_virtual_ip(self, parent, parent_id, filters=None,
                        filter_value=None):
@@ -1092,8 +1621,8 @@ class NuageRestClient(object):
                                  filters, filter_value, netpart_name)
 
     # GatewayVlan
-    def create_gateway_vlan(self, gw_port_id, userMnemonic, value,
-                            extra_params=None):
+    @staticmethod
+    def _gateway_vlan_data(userMnemonic, value, extra_params=None):
         data = {
             'userMnemonic': userMnemonic,
             'value': value
@@ -1101,15 +1630,32 @@ class NuageRestClient(object):
 
         if extra_params:
             data.update(extra_params)
+        return data
+
+    def create_gateway_vlan(self, gw_port_id, userMnemonic, value,
+                            extra_params=None):
+        data = self._gateway_vlan_data(userMnemonic, value, extra_params)
         res_path = self.build_resource_path(
             resource=constants.GATEWAY_PORT,
             resource_id=gw_port_id, child_resource=constants.VLAN)
         return self.post(res_path, data)
 
+    def create_gateway_vlans(self, gw_port_id, vlans):
+        """Bulk create_gateway_vlan, vlans are dicts of its arguments"""
+        res_path = self.build_resource_path(
+            resource=constants.GATEWAY_PORT,
+            resource_id=gw_port_id, child_resource=constants.VLAN)
+        return self.bulk_create(
+            res_path, [self._gateway_vlan_data(**vlan) for vlan in vlans])
+
     def delete_gateway_vlan(self, vlan_id):
         return self.delete_resource(constants.VLAN, vlan_id,
                                     responseChoice=True)
 
+    def delete_gateway_vlans(self, vlan_ids):
+        return self.bulk_delete(constants.VLAN, vlan_ids,
+                                responseChoice=True)
+
     def get_gateway_vlan(self, parent, parent_id, filters=None,
                          filter_value=None):
         return self.get_child_resource(
@@ -1288,14 +1834,8 @@ class NuageRestClient(object):
         }
         if extra_params:
             data.update(extra_params)
-        if not netpart_name:
-            netpart_name = self.def_netpart_name
-        net_part = self.get_net_partition(netpart_name)
-
-        res_path = self.build_resource_path(
-            constants.NET_PARTITION, net_part[0]['ID'],
-            constants.DOMAIN_TEMPLATE)
-        return self.post(res_path, data)
+        return self.create_resource(constants.DOMAIN_TEMPLATE, data,
+                                    netpart_name)
 
     def create_app_domain(self, name, templateId, externalId=None,
                           netpart_name=None, extra_params=None):
@@ -1307,13 +1847,7 @@ class NuageRestClient(object):
             data['externalID'] = self.get_vsd_external_id(externalId)
         if extra_params:
             data.update(extra_params)
-        if not netpart_name:
-            netpart_name = self.def_netpart_name
-        net_part = self.get_net_partition(netpart_name)
-        res_path = self.build_resource_path(
-            constants.NET_PARTITION, net_part[0]['ID'],
-            constants.DOMAIN)
-        return self.post(res_path, data)
+        return self.create_resource(constants.DOMAIN, data, netpart_name)
 
     def delete_app_domain(self, app_dom_id):
         return self.delete_resource(constants.DOMAIN, app_dom_id, True)
@@ -1327,14 +1861,7 @@ class NuageRestClient(object):
         }
         if extra_params:
             data.update(extra_params)
-        if not netpart_name:
-            netpart_name = self.def_netpart_name
-        net_part = self.get_net_partition(netpart_name)
-        res_path = self.build_resource_path(
-            constants.NET_PARTITION,
-            resource_id=net_part[0]['ID'],
-            child_resource=constants.APPLICATION)
-        return self.post(res_path, data)
+        return self.create_resource(constants.APPLICATION, data, netpart_name)
 
     def delete_application(self, app):
         return self.delete_resource(constants.APPLICATION, app, True)
@@ -1399,13 +1926,7 @@ class NuageRestClient(object):
         }
         if extra_params:
             data.update(extra_params)
-        if not netpart_name:
-            netpart_name = self.def_netpart_name
-        net_part = self.get_net_partition(netpart_name)
-        res_path = self.build_resource_path(
-            constants.NET_PARTITION, net_part[0]['ID'],
-            constants.SERVICE)
-        return self.post(res_path, data)
+        return self.create_resource(constants.SERVICE, data, netpart_name)
 
     def delete_service(self, svc):
         return self.delete_resource(constants.SERVICE, svc, True)
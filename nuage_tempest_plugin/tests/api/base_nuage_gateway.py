@@ -33,6 +33,24 @@ CONF = Topology.get_conf()
 LOG = Topology.get_logger(__name__)
 
 
+def create_test_gateway_vlans(nuage_client, gw_port, gatewayvlans):
+    """Creates the test vlans of gw_port in bulk, adding them to gatewayvlans
+
+    Vlans which did get created are added also when others failed, to have
+    them cleaned up.
+    """
+    vlans = [{'userMnemonic': 'test',
+              'value': str(n_constants.START_VLAN_VALUE + i)}
+             for i in range(n_constants.NUMBER_OF_VLANS_PER_PORT)]
+    try:
+        gatewayvlans.extend(nuage_client.create_gateway_vlans(
+            gw_port[0]['ID'], vlans))
+    except exceptions.BulkError as e:
+        gatewayvlans.extend(r for r in e.results
+                            if not isinstance(r, Exception))
+        raise
+
+
 class BaseNuageGatewayTest(NuageAdminNetworksTest):
     _interface = 'json'
 
@@ -62,12 +80,6 @@ class BaseNuageGatewayTest(NuageAdminNetworksTest):
             name, 'test', 'ACCESS', gw[0]['ID'])
         return gw_port
 
-    @classmethod
-    def create_gateway_vlan(cls, gw_port, value):
-        gw_port = cls.nuage_client.create_gateway_vlan(
-            gw_port[0]['ID'], 'test', value)
-        return gw_port
-
     @classmethod
     def create_test_gateway_topology(cls):
         for personality in n_constants.GW_TYPES_UNDER_TEST:
@@ -80,11 +92,8 @@ class BaseNuageGatewayTest(NuageAdminNetworksTest):
                 cls.gatewayports.append(gw_port)
 
         for gw_port in cls.gatewayports:
-            for i in range(n_constants.NUMBER_OF_VLANS_PER_PORT):
-                gw_vlan = cls.create_gateway_vlan(
-                    gw_port, str(
-                        n_constants.START_VLAN_VALUE + i))
-                cls.gatewayvlans.append(gw_vlan)
+            create_test_gateway_vlans(cls.nuage_client, gw_port,
+                                      cls.gatewayvlans)
 
     @classmethod
     def setup_clients(cls):
@@ -197,6 +206,7 @@ class BaseNuageGatewayTest(NuageAdminNetworksTest):
                 LOG.exception(exc)
                 has_exception = True
 
+        vlan_ids = []
         for vlan in cls.gatewayvlans:
             try:
                 if 'id' in vlan:
@@ -204,10 +214,15 @@ class BaseNuageGatewayTest(NuageAdminNetworksTest):
                 else:
                     vlan_id = vlan[0]['ID']
                 cls.nuage_client.delete_vlan_permission(vlan_id)
-                cls.nuage_client.delete_gateway_vlan(vlan_id)
+                vlan_ids.append(vlan_id)
             except Exception as exc:
                 LOG.exception(exc)
                 has_exception = True
+        try:
+            cls.nuage_client.delete_gateway_vlans(vlan_ids)
+        except Exception as exc:
+            LOG.exception(exc)
+            has_exception = True
 
         for port in cls.gatewayports:
             try:
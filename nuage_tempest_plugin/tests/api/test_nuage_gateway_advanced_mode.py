@@ -22,6 +22,7 @@ from nuage_tempest_plugin.lib.utils import exceptions
 from nuage_tempest_plugin.services.nuage_client import NuageRestClient
 from nuage_tempest_plugin.services.nuage_network_client \
     import NuageNetworkClientJSON
+from nuage_tempest_plugin.tests.api import base_nuage_gateway as base_gw
 from nuage_tempest_plugin.tests.api.vsd_managed \
     import base_vsd_managed_networks as base_vsdman
 
@@ -104,11 +105,8 @@ class NuageGatewayTestJSON(base.BaseAdminNetworkTest,
                 cls.gatewayports.append(gw_port)
 
         for gw_port in cls.gatewayports:
-            for i in range(n_constants.NUMBER_OF_VLANS_PER_PORT):
-                gw_vlan = cls.create_gateway_vlan(
-                    gw_port, str(
-                        n_constants.START_VLAN_VALUE + i))
-                cls.gatewayvlans.append(gw_vlan)
+            base_gw.create_test_gateway_vlans(cls.nuage_client, gw_port,
+                                              cls.gatewayvlans)
 
     @classmethod
     def create_test_gateway_redundancy_topology(cls):
@@ -316,6 +314,7 @@ class NuageGatewayTestJSON(base.BaseAdminNetworkTest,
         if has_exception:
             raise exceptions.TearDownException()
 
+        vlan_ids = []
         for vlan in cls.gatewayvlans:
             try:
                 if 'id' in vlan:
@@ -323,10 +322,15 @@ class NuageGatewayTestJSON(base.BaseAdminNetworkTest,
                 else:
                     vlan_id = vlan[0]['ID']
                 cls.nuage_client.delete_vlan_permission(vlan_id)
-                cls.nuage_client.delete_gateway_vlan(vlan_id)
+                vlan_ids.append(vlan_id)
             except Exception as exc:
                 LOG.exception(exc)
                 has_exception = True
+        try:
+            cls.nuage_client.delete_gateway_vlans(vlan_ids)
+        except Exception as exc:
+            LOG.exception(exc)
+            has_exception = True
 
         if has_exception:
             raise exceptions.TearDownException()
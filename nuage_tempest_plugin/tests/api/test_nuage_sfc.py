@@ -1,5 +1,4 @@
 from netaddr import IPNetwork
-import time
 
 from tempest.common import utils
 from tempest.lib import exceptions as lib_exec
@@ -56,6 +55,9 @@ class NuageSfc(NuageBaseTest):
                                          name=name,
                                          cleanup=cleanup)
 
+    def _wait_for_vm_interfaces(self, *ports):
+        self.nuage_client.wait_for_vm_interfaces([p['id'] for p in ports])
+
     @classmethod
     def _create_security_disabled_network(self, network_name):
         kwargs = {'name': network_name,
@@ -263,7 +265,7 @@ class NuageSfc(NuageBaseTest):
         self._create_server([p1, p2], 'sfc-vm1')
         self._create_server([p3, p4], 'sfc-vm2')
 
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p1, p2, p3, p4)
         pp1 = self._create_port_pair('pp1', p1, p2)
         ppg1 = self._create_port_pair_group('ppg1', pp1)
         pp_list.append(pp1)
@@ -525,7 +527,7 @@ class NuageSfc(NuageBaseTest):
                                      port_security_enabled=False)
             self._create_server([port1, port2], 'vm1')
             self._create_server([port3, port4], 'vm2')
-            time.sleep(5)
+            self._wait_for_vm_interfaces(port1, port2, port3, port4)
             port_pair1 = self._create_port_pair('pp1', port1, port2)
             port_pair2 = self._create_port_pair('pp2', port3, port4)
             ppg1 = self._create_port_pair_group('ppg1', port_pair1)
@@ -606,7 +608,7 @@ class NuageSfc(NuageBaseTest):
         self._create_server([p1, p2], 'sfc-vm1')
         self._create_server([p3, p4], 'sfc-vm2')
 
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p1, p2, p3, p4)
         pp1 = self._create_port_pair('pp1', p1, p2)
         ppg1 = self._create_port_pair_group('ppg1', pp1)
 
@@ -694,7 +696,7 @@ class NuageSfc(NuageBaseTest):
         p1 = self.create_port(network, name='p1', port_security_enabled=False)
         p2 = self.create_port(network, name='p2', port_security_enabled=False)
         self._create_server([p1, p2], 'sfc-vm1')
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p1, p2)
         pp1 = self._create_port_pair('pp1', p1, p2)
         ppg1 = self._create_port_pair_group('ppg1', pp1)
         pc1 = self. _create_port_chain('pc1', [ppg1], [fc1])
@@ -802,7 +804,7 @@ class NuageSfc(NuageBaseTest):
         p5 = self.create_port(network, name='p5', port_security_enabled=False)
         p6 = self.create_port(network, name='p6', port_security_enabled=False)
         self._create_server([p5, p6], 'sfc-vm3')
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p5, p6)
         ppg1 = ppg_list[0]
         ppg2 = ppg_list[1]
 
@@ -866,7 +868,7 @@ class NuageSfc(NuageBaseTest):
         p6 = self.create_port(network, name='p6', port_security_enabled=False)
         self._create_server([p5, p6], 'sfc-vm3')
 
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p5, p6)
         ppg1 = ppg_list[0]
         ppg2 = ppg_list[1]
         pp3 = self._create_port_pair('pp3', p5, p6)
@@ -927,7 +929,7 @@ class NuageSfc(NuageBaseTest):
         p2 = self.create_port(network2, name='p2', port_security_enabled=False)
         self._create_server([p1, p2], 'sfc-vm1')
 
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p1, p2)
         pp1 = self._create_port_pair('pp1', p1, p2)
         self.assertRaises(
             lib_exec.BadRequest,
@@ -947,7 +949,7 @@ class NuageSfc(NuageBaseTest):
         p2 = self.create_port(network1, name='p2', port_security_enabled=False)
 
         sfcvm1 = self._create_server([p1, p2], 'sfc-vm1')
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p1, p2)
         self.stop_tenant_server(sfcvm1.openstack_data['id'])
         pp1 = self.nsfc_client.create_port_pair('pp1', p1['id'], p2['id'])
         ppg1 = self.nsfc_client.create_port_pair_group('ppg1', pp1)
@@ -983,7 +985,7 @@ class NuageSfc(NuageBaseTest):
 
         p2 = self.create_port(network, name='p2', port_security_enabled=False)
         self._create_server([p2], 'sfc-vm2')
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p1, p2)
 
         pp1 = self._create_port_pair('pp1', p1, p1)
         ppg1 = self._create_port_pair_group('ppg1', pp1)
@@ -1081,7 +1083,7 @@ class NuageSfc(NuageBaseTest):
                               port_security_enabled=False)
 
         self._create_server([p1, p2], 'sfc-vm1')
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p1, p2)
         pp1 = self._create_port_pair('pp1', p1, p2)
         ppg1 = self._create_port_pair_group('ppg1', pp1)
         pc1 = self. _create_port_chain('pc1', [ppg1], [fc1])
@@ -1147,7 +1149,7 @@ class NuageSfc(NuageBaseTest):
         self._create_server([p3, p4], 'sfc-vm2')
         self._create_server([p5, p6], 'sfc-vm3')
 
-        time.sleep(5)
+        self._wait_for_vm_interfaces(p1, p2, p3, p4, p5, p6)
         pp1 = self._create_port_pair('pp1', p1, p2)
         ppg1 = self._create_port_pair_group('ppg1', pp1)
         pp2 = self._create_port_pair('pp2', p3, p4)
@@ -20,6 +20,7 @@ from tempest.lib.common.utils import data_utils
 from nuage_tempest_plugin.lib.test.nuage_test import NuageBaseTest
 from nuage_tempest_plugin.lib.topology import Topology
 from nuage_tempest_plugin.lib.utils import constants
+from nuage_tempest_plugin.lib.utils import vsd_teardown
 from nuage_tempest_plugin.services import nuage_client
 from nuage_tempest_plugin.services.nuage_network_client \
     import NuageNetworkClientJSON
@@ -61,38 +62,35 @@ class BaseVSDManagedNetwork(NuageBaseTest):
         cls.vsd_subnets = []
         cls.vsd_shared_domains = []
         cls.vsd_policy_groups = []
+        cls.vsd_shared_domain_links = []
 
     @classmethod
     def resource_cleanup(cls):
         # cleanup the OpenStack managed objects first
         super(BaseVSDManagedNetwork, cls).resource_cleanup()
 
-        for vsd_policy_group in reversed(cls.vsd_policy_groups):
-            cls.nuage_client.delete_policygroup(vsd_policy_group[0]['id'])
-
-        for vsd_l2domain in reversed(cls.vsd_l2domains):
-            cls.nuage_client.delete_l2domain(vsd_l2domain[0]['ID'])
-
-        for vsd_l2dom_template in reversed(cls.vsd_l2dom_templates):
-            cls.nuage_client.delete_l2domaintemplate(
-                vsd_l2dom_template[0]['ID'])
-
-        for vsd_subnet in reversed(cls.vsd_subnets):
-            cls.nuage_client.delete_domain_subnet(vsd_subnet[0]['ID'])
-
-        for vsd_zone in reversed(cls.vsd_zones):
-            cls.nuage_client.delete_zone(vsd_zone[0]['ID'])
-
-        for vsd_l3domain in reversed(cls.vsd_l3domains):
-            cls.nuage_client.delete_domain(vsd_l3domain[0]['ID'])
-
-        for vsd_l3dom_template in reversed(cls.vsd_l3dom_templates):
-            cls.nuage_client.delete_l3domaintemplate(
-                vsd_l3dom_template[0]['ID'])
-
-        for vsd_shared_domain in reversed(cls.vsd_shared_domains):
-            cls.nuage_client.delete_vsd_shared_resource(
-                vsd_shared_domain[0]['ID'])
+        # children and users of an object are deleted before it,
+        # independent ones in parallel
+        teardown = vsd_teardown.VSDTeardown()
+        client = cls.nuage_client
+        for objects, delete, label in (
+                (cls.vsd_policy_groups, client.delete_policygroup,
+                 'policygroup'),
+                (cls.vsd_l2domains, client.delete_l2domain, 'l2domain'),
+                (cls.vsd_l2dom_templates, client.delete_l2domaintemplate,
+                 'l2domaintemplate'),
+                (cls.vsd_subnets, client.delete_domain_subnet, 'subnet'),
+                (cls.vsd_zones, client.delete_zone, 'zone'),
+                (cls.vsd_l3domains, client.delete_domain, 'domain'),
+                (cls.vsd_l3dom_templates, client.delete_l3domaintemplate,
+                 'domaintemplate'),
+                (cls.vsd_shared_domains, client.delete_vsd_shared_resource,
+                 'sharednetworkresource')):
+            for vsd_object in objects:
+                teardown.add(vsd_object[0], delete, label)
+        for domain_id, shared_domain_id in cls.vsd_shared_domain_links:
+            teardown.add_dependency(domain_id, shared_domain_id)
+        teardown.run()
 
     @classmethod
     def create_vsd_dhcpmanaged_l2dom_template(cls, **kwargs):
@@ -277,6 +275,7 @@ class BaseVSDManagedNetwork(NuageBaseTest):
         }
         cls.nuage_client.update_l2domain(domain_id,
                                          update_params=update_params)
+        cls.vsd_shared_domain_links.append((domain_id, shared_domain_id))
 
     @classmethod
     def create_vsd_l2_policy_group(cls, vsd_l2_subnet_id, name=None, type=None,
@@ -384,7 +384,7 @@ class BaseVSDManagedPortAttributes(
 
     def _create_ping_security_group_entries(self, policy_group_id,
                                             iacl_template_id):
-        extra_params = {
+        ping8_params = {
             "networkType": "POLICYGROUP",
             "networkID": policy_group_id,
             "locationType": "POLICYGROUP",
@@ -397,14 +397,9 @@ class BaseVSDManagedPortAttributes(
             "DSCP": "*",
             "action": "FORWARD"
         }
-        self.nuage_client.create_ingress_security_group_entry(
-            name_description='ping8',
-            iacl_template_id=iacl_template_id,
-            extra_params=extra_params,
-            responseChoice=True)
 
-        # create second entry
-        extra_params = {
+        # second entry
+        ping0_params = {
             "networkType": "POLICYGROUP",
             "networkID": policy_group_id,
             "locationType": "POLICYGROUP",
@@ -418,10 +413,10 @@ class BaseVSDManagedPortAttributes(
             "description": "ping0",
             "action": "FORWARD"
         }
-        self.nuage_client.create_ingress_security_group_entry(
-            name_description='ping0',
-            iacl_template_id=iacl_template_id,
-            extra_params=extra_params,
+        self.nuage_client.create_ingress_security_group_entries(
+            iacl_template_id,
+            [{'name_description': 'ping8', 'extra_params': ping8_params},
+             {'name_description': 'ping0', 'extra_params': ping0_params}],
             responseChoice=True)
         pass
 
@@ -822,13 +822,10 @@ class VSDManagedPolicyGroupsTest(
         vsd_l2_subnet, l2dom_template = self._create_vsd_l2_managed_subnet()
         network, subnet = self._create_os_l2_vsd_managed_subnet(vsd_l2_subnet)
         # And I have multiple policy_groups
-        for i in range(SEVERAL_POLICY_GROUPS):
-            policy_groups.append(self.nuage_client.create_policygroup(
-                constants.L2_DOMAIN,
-                vsd_l2_subnet[0]['ID'],
-                name='myVSDpg-%s' % i,
-                type='SOFTWARE',
-                extra_params=None))
+        policy_groups.extend(self.nuage_client.create_policygroups(
+            constants.L2_DOMAIN, vsd_l2_subnet[0]['ID'],
+            [{'name': 'myVSDpg-%s' % i, 'type': 'SOFTWARE'}
+             for i in range(SEVERAL_POLICY_GROUPS)]))
         # When I create  a port
         port = self.create_port(network)
         # And associate this port with all these policy groups
@@ -888,13 +885,10 @@ class VSDManagedPolicyGroupsTest(
         vsd_l2_subnet, l2dom_template = self._create_vsd_l2_managed_subnet()
         network, subnet = self._create_os_l2_vsd_managed_subnet(vsd_l2_subnet)
         # And I have multiple policy_groups
-        for i in range(SEVERAL_POLICY_GROUPS):
-            policy_groups.append(self.nuage_client.create_policygroup(
-                constants.L2_DOMAIN,
-                vsd_l2_subnet[0]['ID'],
-                name='myVSDpg-%s' % i,
-                type='SOFTWARE',
-                extra_params=None))
+        policy_groups.extend(self.nuage_client.create_policygroups(
+            constants.L2_DOMAIN, vsd_l2_subnet[0]['ID'],
+            [{'name': 'myVSDpg-%s' % i, 'type': 'SOFTWARE'}
+             for i in range(SEVERAL_POLICY_GROUPS)]))
         for i in range(SEVERAL_PORTS):
             # When I create multiple ports
             ports.append(self.create_port(network))
@@ -956,13 +950,10 @@ class VSDManagedPolicyGroupsTest(
         vsd_l2_subnet, l2dom_templ = self._create_vsd_l2_managed_subnet()
         network, subnet = self._create_os_l2_vsd_managed_subnet(vsd_l2_subnet)
         # When I create several policy groups
-        for i in range(SEVERAL_POLICY_GROUPS):
-            policy_groups.append(self.nuage_client.create_policygroup(
-                constants.L2_DOMAIN,
-                vsd_l2_subnet[0]['ID'],
-                name='myVSDpg-%s' % i,
-                type='SOFTWARE',
-                extra_params=None))
+        policy_groups.extend(self.nuage_client.create_policygroups(
+            constants.L2_DOMAIN, vsd_l2_subnet[0]['ID'],
+            [{'name': 'myVSDpg-%s' % i, 'type': 'SOFTWARE'}
+             for i in range(SEVERAL_POLICY_GROUPS)]))
         # When I list the policy groups of the VSD-L2-Managed-Subnet
         policy_group_list = \
             self.nuage_network_client.list_nuage_policy_group_for_subnet(
@@ -1178,13 +1169,10 @@ class VSDManagedPolicyGroupsTest(
         vsd_l3_subnet, vsd_l3_domain = self._create_vsd_l3_managed_subnet()
         network, subnet = self._create_os_l3_vsd_managed_subnet(vsd_l3_subnet)
         # And I have multiple policy_groups
-        for i in range(SEVERAL_POLICY_GROUPS):
-            policy_groups.append(self.nuage_client.create_policygroup(
-                constants.DOMAIN,
-                vsd_l3_domain[0]['ID'],
-                name='my-L3-VSDpg-%s' % i,
-                type='SOFTWARE',
-                extra_params=None))
+        policy_groups.extend(self.nuage_client.create_policygroups(
+            constants.DOMAIN, vsd_l3_domain[0]['ID'],
+            [{'name': 'my-L3-VSDpg-%s' % i, 'type': 'SOFTWARE'}
+             for i in range(SEVERAL_POLICY_GROUPS)]))
         for i in range(SEVERAL_PORTS):
             # When I create multiple ports
             ports.append(self.create_port(network))
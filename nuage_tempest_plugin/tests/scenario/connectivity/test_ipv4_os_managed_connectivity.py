@@ -147,18 +147,14 @@ class Ipv4OsManagedConnectivityTest(NuageBaseTest):
             security_groups=[ssh_security_group['id']],
             extra_dhcp_opts=[{'opt_name': 'router', 'opt_value': '0'}])
 
-        # Launch tenant servers in OpenStack network
-        server1 = self.create_tenant_server(
-            networks=[network1],
-            security_groups=[ssh_security_group])
-
-        server2 = self.create_tenant_server(
-            networks=[network2],
-            security_groups=[ssh_security_group])
-
-        server12 = self.create_tenant_server(
-            ports=[p1, p2],
-            make_reachable=True)
+        # Launch tenant servers in OpenStack network, all at once
+        server1, server2, server12 = self.create_tenant_servers([
+            {'networks': [network1],
+             'security_groups': [ssh_security_group]},
+            {'networks': [network2],
+             'security_groups': [ssh_security_group]},
+            {'ports': [p1, p2],
+             'make_reachable': True}])
 
         # Test IPv4 connectivity between peer servers
         self.assert_ping(server12, server1, network1)
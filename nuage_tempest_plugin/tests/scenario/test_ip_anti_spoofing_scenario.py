@@ -1,8 +1,7 @@
-import time
-
 from tempest.api.compute import base as serv_base
 from tempest.scenario import manager
 
+from nuage_tempest_plugin.services.nuage_client import NuageRestClient
 from nuage_tempest_plugin.tests.api import test_ip_anti_spoofing as antispoof
 
 
@@ -16,6 +15,11 @@ class IpAntiSpoofingTestScenario(antispoof.IpAntiSpoofingTestBase,
         raise cls.skipException('Skipping as needs VRS whitebox tests, '
                                 'which is work in progress - TODO(Kris)')
 
+    @classmethod
+    def setup_clients(cls):
+        super(IpAntiSpoofingTestScenario, cls).setup_clients()
+        cls.nuage_client = NuageRestClient()
+
     @classmethod
     def resource_setup(cls):
         super(IpAntiSpoofingTestScenario, cls).resource_setup()
@@ -100,7 +104,7 @@ class IpAntiSpoofingTestScenario(antispoof.IpAntiSpoofingTestBase,
             port['mac_address'],
             vm['addresses'][network['name']][0]['OS-EXT-IPS-MAC:mac_addr'])
         self.assertEqual(vm['status'], 'ACTIVE')
-        time.sleep(30)
+        self.nuage_client.wait_for_vm_interfaces([port['id']])
         # tag_name = 'verify_vm_vip_and_anit_spoof_l3domain'
         # nuage_ext.nuage_extension.nuage_components(
         #     nuage_ext._generate_tag(tag_name, self.__class__.__name__), self)
@@ -16,7 +16,6 @@
 
 import collections
 import re
-import time
 
 from tempest.api.network import base
 from tempest.common import utils
@@ -24,6 +23,7 @@ from tempest import exceptions
 from tempest.lib.common.utils import data_utils
 from tempest import test
 
+from nuage_tempest_plugin.lib.test.nuage_test import server_readiness
 from nuage_tempest_plugin.lib.topology import Topology
 from nuage_tempest_plugin.tests.scenario \
     import base_nuage_network_scenario_test
@@ -38,7 +38,6 @@ EXTRA_DHCP_OPT_MTU_VALUE = '1498'
 EXTRA_DHCP_OPT_DOMAIN_NAME = 'nuagenetworks.com'
 EXTRA_DHCP_OPT_DOMAIN_SEARCH = 'sales.domain.com;eng.domain.org'
 FIP_RATE_LIMIT = '5'
-FIP_UPDATE_DELAY = 4
 
 
 class TestNetworkBasicOps(
@@ -452,11 +451,13 @@ class TestNetworkBasicOps(
         #  extra dhcp options (done)
         kwargs = {'boot_with_port': True}
         self._setup_network_and_servers(**kwargs)
-        time.sleep(5)  # giving time for servers to come up - TODO(check this)
+        floating_ip, this_server = self.floating_ip_tuple
+        server_readiness.wait(
+            self.servers_client, this_server['id'],
+            this_server['image']['id'], floating_ip['floating_ip_address'])
         self._check_public_connectivity(
             should_connect=True, should_check_floating_ip_status=False)
         # Verify whether our extra dhcp options mad it to the VM
-        floating_ip, this_server = self.floating_ip_tuple
         self._check_extra_dhcp_opts_on_server(
             this_server, floating_ip['floating_ip_address'])
         # Check dissassociate / associate of the FIP on the same port
@@ -466,7 +467,7 @@ class TestNetworkBasicOps(
                  str(floating_ip['floating_ip_address']))
         for count in range(1, loop_range, 1):
             self._disassociate_floating_ips()
-            time.sleep(FIP_UPDATE_DELAY)
+            # the check keeps on pinging till connectivity is gone
             LOG.info("Loop " + str(count) + "/" + str(loop_range) +
                      " Connectivity is GONE")
             self._check_public_connectivity(
@@ -476,7 +477,7 @@ class TestNetworkBasicOps(
             self.floating_ip_tuple = Floating_IP_tuple(
                 floating_ip, this_server)
             self._associate_floating_ip(floating_ip, this_server)
-            time.sleep(FIP_UPDATE_DELAY)
+            server_readiness.wait_for_ssh(floating_ip['floating_ip_address'])
             LOG.info("Loop " + str(count) + "/" + str(loop_range) +
                      " Connectivity is BACK")
             self._check_public_connectivity(
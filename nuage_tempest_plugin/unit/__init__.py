@@ -0,0 +1,6 @@
+from tempest import config
+
+from nuage_tempest_plugin import plugin
+
+# the plugin options are read on import, tempest registers them before
+plugin.NuageTempestPlugin().register_opts(config.CONF)
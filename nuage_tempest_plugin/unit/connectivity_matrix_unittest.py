@@ -0,0 +1,87 @@
+import threading
+
+import testtools
+
+from nuage_tempest_plugin.lib.utils import connectivity_matrix
+
+# run me as :
+# $ python -m testtools.run \
+#     nuage_tempest_plugin/unit/connectivity_matrix_unittest.py
+
+PING_OUTPUT = ('2 packets transmitted, 2 packets received, 0% packet loss\n'
+               'round-trip min/avg/max = 0.301/0.412/0.520 ms\n')
+
+
+class _Probe(object):
+    """Reaches destinations in reachable, after failing fails times
+
+    Raises for destinations in broken. With in_flight, probes are held till
+    that many are in flight.
+    """
+
+    def __init__(self, reachable, fails=0, broken=(), in_flight=None):
+        self.reachable = reachable
+        self.fails = fails
+        self.broken = broken
+        self.in_flight = in_flight
+        self.all_in = threading.Event()
+        self.calls = {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, source, destination, should_pass):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            if self.active == self.in_flight:
+                self.all_in.set()
+            calls = self.calls[(source, destination)] = self.calls.get(
+                (source, destination), 0) + 1
+        if self.in_flight:
+            self.all_in.wait(10)
+        with self._lock:
+            self.active -= 1
+        if destination in self.broken:
+            raise IOError('console of %s is gone' % source)
+        if destination in self.reachable and calls > self.fails:
+            return True, PING_OUTPUT
+        return False, None
+
+
+class ConnectivityMatrixUnitTest(testtools.TestCase):
+
+    def test_pairs_probed_concurrently(self):
+        probe = _Probe({'b', 'c', 'd'}, in_flight=4)
+        matrix = connectivity_matrix.ConnectivityMatrix(probe, workers=4)
+        result = matrix.run(dict([(('a', d), True) for d in 'bcd'] +
+                                 [(('b', d), True) for d in 'cd']))
+        self.assertTrue(result.ok)
+        self.assertTrue(probe.all_in.is_set())
+        self.assertEqual(4, probe.max_active)
+        self.assertEqual(0.412, result[('a', 'b')].rtt)
+
+    def test_pairs_retried_independently(self):
+        probe = _Probe({'b'}, fails=2)
+        matrix = connectivity_matrix.ConnectivityMatrix(
+            probe, timeout=0.3, interval=0.01)
+        result = matrix.run({('a', 'b'): True, ('a', 'c'): False,
+                             ('a', 'd'): True})
+        self.assertEqual(3, result[('a', 'b')].attempts)
+        self.assertTrue(result[('a', 'b')].ok)
+        self.assertEqual(1, result[('a', 'c')].attempts)
+        self.assertEqual([result[('a', 'd')]], result.diff())
+        self.assertIn('! a -> d: expected pass, got fail', result.report())
+
+    def test_probe_errors_never_as_expected(self):
+        probe = _Probe({'b'}, broken={'c', 'd'})
+        matrix = connectivity_matrix.ConnectivityMatrix(
+            probe, timeout=0.05, interval=0.01)
+        result = matrix.run({('a', 'b'): True, ('a', 'c'): False,
+                             ('a', 'd'): True})
+        self.assertTrue(result[('a', 'b')].ok)
+        for pair in (('a', 'c'), ('a', 'd')):
+            self.assertFalse(result[pair].ok)
+            self.assertIsNone(result[pair].reachable)
+            self.assertIsInstance(result[pair].error, IOError)
+        self.assertIn('! a -> c: expected fail, got error', result.report())
@@ -0,0 +1,46 @@
+import fixtures
+
+from nuage_tempest_plugin.lib.topology import Topology
+from nuage_tempest_plugin.lib.utils import fake_vsd
+from nuage_tempest_plugin.services import nuage_client
+
+
+class FakeVSDFixture(fixtures.Fixture):
+    """A started FakeVSD, which the NuageRestClients of a test talk to
+
+    :ivar vsd: the FakeVSD
+    :ivar netpartition: its default net-partition
+    """
+
+    def __init__(self, **kwargs):
+        """:param kwargs: FakeVSD keyword arguments"""
+        super(FakeVSDFixture, self).__init__()
+        self.kwargs = kwargs
+
+    def _setUp(self):
+        self.vsd = fake_vsd.FakeVSD(**self.kwargs).start()
+        self.addCleanup(self.vsd.stop)
+        for name, value in (('vsd_server', self.vsd.address),
+                            ('base_uri', self.vsd.base_uri),
+                            ('cms_id', 'cms'),
+                            ('vsd_api_key_cache_file', None),
+                            ('vsd_request_deadline', None),
+                            ('vsd_push_notifications', False),
+                            ('vsd_get_cache', False),
+                            ('vsd_metrics_dir', None)):
+            self.useFixture(fixtures.MonkeyPatch(
+                'nuage_tempest_plugin.lib.topology.Topology.' + name, value))
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.services.nuage_client.SERVERSSL',
+            self.kwargs.get('use_ssl', False)))
+        self.netpartition = [
+            e for e in self.vsd.store.list('enterprises')
+            if e['name'] == Topology.def_netpartition][0]
+        # IDs are per FakeVSD
+        nuage_client.netpartition_ids.invalidate(
+            name=Topology.def_netpartition)
+        self.addCleanup(nuage_client.netpartition_ids.invalidate,
+                        name=Topology.def_netpartition)
+
+    def client(self):
+        return nuage_client.NuageRestClient()
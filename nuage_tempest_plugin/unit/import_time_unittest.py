@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+
+import testtools
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/import_time_unittest.py
+
+TOP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+# what test modules import, tempest registering the plugin options first
+IMPORT = """
+from tempest import config
+from nuage_tempest_plugin import plugin
+plugin.NuageTempestPlugin().register_opts(config.CONF)
+import nuage_tempest_plugin.lib.features
+import nuage_tempest_plugin.lib.test.vsd_helper
+"""
+
+# only to be loaded once talking to the VSD
+DEFERRED = ('vspk', 'bambou')
+
+# microseconds spent in the plugin's own modules, about 20ms at the time
+BUDGET = 100000
+RUNS = 3
+
+
+def import_times():
+    """Returns {module: (self us, cumulative us)} of importing IMPORT"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [TOP_DIR] + [p for p in [env.get('PYTHONPATH')] if p])
+    proc = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', IMPORT],
+                            cwd=TOP_DIR, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, universal_newlines=True)
+    _, err = proc.communicate()
+    if proc.returncode:
+        raise AssertionError('Import failed:\n' + err)
+    times = {}
+    for line in err.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        own, cumulative, module = line.split(':', 1)[1].split('|')
+        if own.strip().isdigit():
+            times[module.strip()] = (int(own), int(cumulative))
+    return times
+
+
+@testtools.skipIf(sys.version_info < (3, 7), 'needs python -X importtime')
+class ImportTimeUnitTest(testtools.TestCase):
+
+    def test_import_cost(self):
+        own = []
+        for _ in range(RUNS):
+            times = import_times()
+            loaded = [m for m in times if m.split('.')[0] in DEFERRED]
+            self.assertEqual([], loaded, 'loaded at import time')
+            own.append(sum(t[0] for m, t in times.items()
+                           if m.startswith('nuage_tempest_plugin')))
+        # the best run, the others may have had to compile
+        self.assertLess(min(own), BUDGET,
+                        'plugin import time regressed: %sus' % min(own))
@@ -0,0 +1,94 @@
+import threading
+
+import testtools
+
+from nuage_tempest_plugin.lib.utils import constants
+from nuage_tempest_plugin.lib.utils import exceptions
+from nuage_tempest_plugin.services import nuage_async_client
+from nuage_tempest_plugin.unit import fake_vsd_fixture
+
+# run me as :
+# $ python -m testtools.run \
+#     nuage_tempest_plugin/unit/nuage_async_client_unittest.py
+
+
+class _InFlight(object):
+    """FakeVSD latency holding requests till `expected` are in flight"""
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.active = 0
+        self.peak = 0
+        self.all_in = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            if self.active == self.expected:
+                self.all_in.set()
+        self.all_in.wait(10)
+        with self._lock:
+            self.active -= 1
+        return 0
+
+
+class AsyncNuageRestClientUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(AsyncNuageRestClientUnitTest, self).setUp()
+        self.fixture = self.useFixture(fake_vsd_fixture.FakeVSDFixture())
+        self.client = self.fixture.client()
+        self.async_client = nuage_async_client.AsyncNuageRestClient(
+            self.client, concurrency=4)
+        self.addCleanup(self.async_client.close)
+
+    def test_gather(self):
+        store = self.fixture.vsd.store
+        vports = [store.create('vports', {'name': 'vport-%d' % i})
+                  for i in range(8)]
+        for vport in vports:
+            store.create('vminterfaces', {'name': vport['name']},
+                         'vports', vport['ID'])
+        in_flight = _InFlight(4)
+        self.fixture.vsd.latency = in_flight
+        results = self.async_client.gather(
+            *[self.async_client.get_child_resource(
+                constants.VPORT, vport['ID'], constants.VM_IFACE)
+              for vport in vports])
+        self.assertEqual([vport['name'] for vport in vports],
+                         [result[0]['name'] for result in results])
+        self.assertTrue(in_flight.all_in.is_set())
+        self.assertEqual(4, in_flight.peak)
+
+    def test_own_connection_pool(self):
+        pool = self.client.restproxy.pool
+        maxsize = pool.maxsize
+        self.assertIsNot(pool, self.async_client.client.restproxy.pool)
+        self.assertEqual(4, self.async_client.client.restproxy.pool.maxsize)
+        self.assertEqual(maxsize, pool.maxsize)
+        # sharing the login of the synchronous client
+        self.assertEqual(self.client.restproxy.auth,
+                         self.async_client.client.restproxy.auth)
+
+    def test_errors(self):
+        results = self.async_client.gather(
+            self.async_client.get_resource(constants.DOMAIN),
+            self.async_client.delete_resource(constants.DOMAIN, 'missing'),
+            return_exceptions=True)
+        self.assertEqual('', results[0])
+        self.assertIsInstance(results[1], exceptions.NotFound)
+        self.assertRaises(
+            exceptions.NotFound, self.async_client.gather,
+            self.async_client.delete_resource(constants.DOMAIN, 'missing'))
+
+    def test_close(self):
+        with nuage_async_client.AsyncNuageRestClient(
+                self.client, concurrency=2) as async_client:
+            async_client.get_resource(constants.DOMAIN).result()
+            pool = async_client.client.restproxy.pool
+            self.assertEqual(1, pool.stats()['idle'])
+        self.assertEqual(0, pool.stats()['idle'])
+        self.assertRaises(RuntimeError, async_client.get_resource,
+                          constants.DOMAIN)
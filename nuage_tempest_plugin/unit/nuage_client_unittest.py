@@ -0,0 +1,196 @@
+import threading
+
+import fixtures
+import testtools
+
+from nuage_tempest_plugin.lib.utils import constants
+from nuage_tempest_plugin.lib.utils import exceptions
+from nuage_tempest_plugin.services import nuage_client
+from nuage_tempest_plugin.unit import fake_vsd_fixture
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/nuage_client_unittest.py
+
+
+class PagingUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(PagingUnitTest, self).setUp()
+        self.fixture = self.useFixture(fake_vsd_fixture.FakeVSDFixture())
+        self.vsd = self.fixture.vsd
+        self.client = self.fixture.client()
+        self.zone = self.vsd.store.create('zones', {'name': 'zone'})
+        for i in range(7):
+            self.vsd.store.create('subnets', {'name': 'subnet-%d' % i,
+                                              'index': i},
+                                  'zones', self.zone['ID'])
+
+    def _page_requests(self):
+        return self.vsd.requests.get(('GET', 'subnets'), 0)
+
+    def test_iter_pages(self):
+        for prefetch in (False, True):
+            subnets = self.client.iter_child_resource(
+                constants.ZONE, self.zone['ID'], constants.SUBNETWORK,
+                page_size=3, prefetch=prefetch)
+            self.assertEqual(['subnet-%d' % i for i in range(7)],
+                             [subnet['name'] for subnet in subnets])
+        self.assertEqual(6, self._page_requests())
+
+    def test_early_exit_stops_prefetch(self):
+        threads = set(threading.enumerate())
+        subnets = self.client.iter_child_resource(
+            constants.ZONE, self.zone['ID'], constants.SUBNETWORK,
+            page_size=2)
+        self.assertEqual('subnet-0', next(subnets)['name'])
+        subnets.close()
+        for thread in set(threading.enumerate()) - threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        # the 1st page and the prefetched 2nd one only
+        self.assertEqual(2, self._page_requests())
+
+    def test_count(self):
+        self.assertEqual(7, self.client.count_child_resource(
+            constants.ZONE, self.zone['ID'], constants.SUBNETWORK))
+        self.assertEqual(1, self.client.count_child_resource(
+            constants.ZONE, self.zone['ID'], constants.SUBNETWORK,
+            filters='index', filter_value=5))
+        self.assertEqual(1, self.client.count_resource(
+            constants.NET_PARTITION, flat_rest_path=True, filters='name',
+            filter_value=self.fixture.netpartition['name']))
+        self.assertEqual(0, self._page_requests())
+
+
+class BulkUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(BulkUnitTest, self).setUp()
+        self.fixture = self.useFixture(fake_vsd_fixture.FakeVSDFixture())
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.lib.topology.Topology.vsd_bulk_chunk_size',
+            2))
+        self.vsd = self.fixture.vsd
+        self.client = self.fixture.client()
+        self.domain = self.vsd.store.create('domains', {'name': 'domain'})
+
+    def test_create(self):
+        policygroups = self.client.create_policygroups(
+            constants.DOMAIN, self.domain['ID'],
+            [{'name': 'pg-%d' % i, 'type': 'SOFTWARE'} for i in range(5)])
+        self.assertEqual(['pg-%d' % i for i in range(5)],
+                         [pg[0]['name'] for pg in policygroups])
+        self.assertEqual(
+            [pg[0]['ID'] for pg in policygroups],
+            [pg['ID'] for pg in self.vsd.store.list('policygroups',
+                                                    self.domain['ID'])])
+        # in chunks of 2
+        self.assertEqual(3, self.vsd.requests[('POST', 'policygroups')])
+
+    def test_partial_create_failure(self):
+        template = self.vsd.store.create('ingressacltemplates', {},
+                                         'domains', self.domain['ID'])
+        taken = self.vsd.store.create('ingressaclentrytemplates', {},
+                                      'ingressacltemplates', template['ID'])
+        e = self.assertRaises(
+            exceptions.BulkError,
+            self.client.create_ingress_security_group_entries,
+            template['ID'],
+            [{'name_description': 'ping8'},
+             {'name_description': 'ping0',
+              'extra_params': {'ID': taken['ID']}},
+             {'name_description': 'ping0'}],
+            responseChoice=True)
+        self.assertEqual([(1, e.results[1])], e.errors)
+        self.assertIsInstance(e.results[1], exceptions.Conflict)
+        self.assertEqual(['ping8', 'ping0'],
+                         [e.results[i][0]['description'] for i in (0, 2)])
+        self.assertEqual(3, len(self.vsd.store.list(
+            'ingressaclentrytemplates', template['ID'])))
+
+    def test_partial_delete_failure(self):
+        vlans = [self.vsd.store.create('vlans', {'value': i})
+                 for i in range(3)]
+        self.vsd.store.create('vports', {}, 'vlans', vlans[0]['ID'])
+        ids = [vlan['ID'] for vlan in vlans] + ['missing']
+        e = self.assertRaises(exceptions.BulkError, self.client.bulk_delete,
+                              constants.VLAN, ids)
+        self.assertEqual([0, 3], [index for index, _ in e.errors])
+        self.assertIsInstance(e.results[0], exceptions.Conflict)
+        self.assertEqual(ids[1:3], e.results[1:3])
+        self.assertIsInstance(e.results[3], exceptions.NotFound)
+        # the vlan in use goes along with its vport
+        self.assertEqual(ids[:1], self.client.delete_gateway_vlans(ids[:1]))
+        self.assertEqual([], self.vsd.store.list('vlans'))
+
+
+class NetPartitionIdUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(NetPartitionIdUnitTest, self).setUp()
+        self.fixture = self.useFixture(fake_vsd_fixture.FakeVSDFixture())
+        self.vsd = self.fixture.vsd
+        self.client = self.fixture.client()
+        # caches the ID
+        self.client.create_l3domaintemplate('template')
+
+    def _recreate_net_partition(self):
+        netpartition = self.fixture.netpartition
+        self.vsd.store.delete('enterprises', netpartition['ID'],
+                              cascade=True)
+        return self.vsd.store.create('enterprises',
+                                     {'name': netpartition['name']})
+
+    def test_create_after_net_partition_recreated(self):
+        netpartition = self._recreate_net_partition()
+        invalidations = nuage_client.netpartition_ids.invalidations
+        template = self.client.create_l3domaintemplate('template')
+        self.assertEqual(netpartition['ID'], template[0]['parentID'])
+        self.assertEqual(invalidations + 1,
+                         nuage_client.netpartition_ids.invalidations)
+        self.assertEqual(netpartition['ID'],
+                         self.client.get_net_partition_id())
+
+    def test_get_after_net_partition_recreated(self):
+        netpartition = self._recreate_net_partition()
+        self.vsd.store.create('domaintemplates', {'name': 'template'},
+                              'enterprises', netpartition['ID'])
+        self.assertEqual(
+            ['template'],
+            [t['name'] for t in self.client.get_l3domaintemplate()])
+        self.assertEqual(1, self.client.count_resource(
+            constants.DOMAIN_TEMPLATE))
+
+    def test_net_partition_deleted(self):
+        self.vsd.store.delete('enterprises', self.fixture.netpartition['ID'],
+                              cascade=True)
+        posts = self.vsd.requests[('POST', 'domaintemplates')]
+        e = self.assertRaises(exceptions.NotFound,
+                              self.client.create_l3domaintemplate, 'template')
+        self.assertIn('Net-partition', str(e))
+        # not resent as no other ID was found
+        self.assertEqual(posts + 1,
+                         self.vsd.requests[('POST', 'domaintemplates')])
+
+
+class EventSubscriberUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(EventSubscriberUnitTest, self).setUp()
+        self.fixture = self.useFixture(fake_vsd_fixture.FakeVSDFixture(
+            event_timeout=0.1))
+        for name, value in (
+                ('nuage_tempest_plugin.lib.topology.Topology.'
+                 'vsd_push_notifications', True),
+                ('nuage_tempest_plugin.services.nuage_client.'
+                 '_event_subscriber', None)):
+            self.useFixture(fixtures.MonkeyPatch(name, value))
+
+    def test_started_on_first_wait(self):
+        client = self.fixture.client()
+        self.assertIsNone(nuage_client._event_subscriber)
+        self.assertTrue(client.wait_until(lambda: True, timeout=1))
+        subscriber = nuage_client._event_subscriber
+        self.assertIsNotNone(subscriber)
+        self.addCleanup(subscriber.stop, 5)
+        self.assertIs(subscriber, client.event_subscriber)
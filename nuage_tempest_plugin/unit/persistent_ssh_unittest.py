@@ -0,0 +1,110 @@
+import socket
+import threading
+import time
+
+from concurrent import futures
+import paramiko
+import testtools
+
+from nuage_tempest_plugin.lib.utils import persistent_ssh
+
+# run me as :
+# $ python -m testtools.run \
+#     nuage_tempest_plugin/unit/persistent_ssh_unittest.py
+
+
+class _Server(paramiko.ServerInterface):
+    """Accepts anyone, and answers any command with the command itself
+
+    The connection breaks instead on the 'reboot' command.
+    """
+
+    def __init__(self, transport, commands):
+        self.transport = transport
+        self.commands = commands
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_exec_request(self, channel, command):
+        self.commands.append(command)
+        if command == b'reboot':
+            threading.Thread(target=self.transport.close).start()
+            return True
+
+        def answer():
+            # once the exec request is acknowledged
+            time.sleep(0.05)
+            channel.sendall(command)
+            channel.send_exit_status(0)
+            channel.close()
+        threading.Thread(target=answer).start()
+        return True
+
+
+class PersistentSSHUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(PersistentSSHUnitTest, self).setUp()
+        self.host_key = paramiko.RSAKey.generate(1024)
+        self.transports = []
+        self.commands = []
+        self.listener = socket.socket()
+        self.listener.bind(('127.0.0.1', 0))
+        self.listener.listen(5)
+        self.addCleanup(self.listener.close)
+        thread = threading.Thread(target=self._serve)
+        thread.daemon = True
+        thread.start()
+        host, port = self.listener.getsockname()
+        self.client = persistent_ssh.PersistentSSHClient(
+            host, 'user', 'password', timeout=10, port=port)
+        self.addCleanup(self.client.close)
+
+    def _serve(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except socket.error:
+                return
+            transport = paramiko.Transport(sock)
+            transport.add_server_key(self.host_key)
+            transport.start_server(
+                server=_Server(transport, self.commands))
+            self.transports.append(transport)
+            self.addCleanup(transport.close)
+
+    def test_one_handshake_for_all_commands(self):
+        before = persistent_ssh.stats()
+        executor = futures.ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(executor.shutdown)
+        self.assertEqual('ip a', self.client.exec_command('ip a'))
+        results = [executor.submit(self.client.exec_command, 'echo %d' % i)
+                   for i in range(8)]
+        self.assertEqual(['echo %d' % i for i in range(8)],
+                         [result.result() for result in results])
+        after = persistent_ssh.stats()
+        self.assertEqual(1, after['handshakes'] - before['handshakes'])
+        self.assertEqual(9, after['commands'] - before['commands'])
+        self.assertEqual(1, len(self.transports))
+
+    def test_reconnects(self):
+        self.client.exec_command('uptime')
+        self.transports[0].close()
+        self.assertEqual('uptime', self.client.exec_command('uptime'))
+        self.assertEqual(2, len(self.transports))
+
+    def test_command_not_resent_once_sent(self):
+        self.client.exec_command('uptime')
+        self.assertRaises((EOFError, socket.error, paramiko.SSHException),
+                          self.client.exec_command, 'reboot')
+        self.assertEqual([b'uptime', b'reboot'], self.commands)
+        # but the next command gets a new connection
+        self.assertEqual('uptime', self.client.exec_command('uptime'))
+        self.assertEqual(2, len(self.transports))
@@ -0,0 +1,61 @@
+import socket
+import threading
+
+import testtools
+
+from nuage_tempest_plugin.lib.utils import readiness
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/readiness_unittest.py
+
+
+class _ServersClient(object):
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.calls = 0
+
+    def get_console_output(self, server_id, length=None):
+        self.calls += 1
+        output = self.outputs.pop(0) if len(self.outputs) > 1 \
+            else self.outputs[0]
+        if isinstance(output, Exception):
+            raise output
+        return {'output': output}
+
+
+class ReadinessUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ReadinessUnitTest, self).setUp()
+        self.prober = readiness.ReadinessProber(min_interval=0.01,
+                                                max_interval=0.02)
+
+    def test_console_marker(self):
+        client = _ServersClient(['', 'booting\n', 'cirros login: '])
+        self.assertIsNotNone(self.prober.wait(client, 'id', 'image'))
+        self.assertEqual(3, client.calls)
+        self.assertEqual(1, self.prober.stats()['image']['count'])
+
+    def test_timeout(self):
+        client = _ServersClient(['booting\n'])
+        self.assertIsNone(self.prober.wait(client, 'id', 'image',
+                                           timeout=0.1))
+        self.assertEqual(1, self.prober.stats()['image']['timeouts'])
+
+    def test_ssh_banner(self):
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        self.addCleanup(server.close)
+
+        def answer():
+            conn, _ = server.accept()
+            conn.sendall(b'SSH-2.0-dropbear\r\n')
+            conn.close()
+
+        threading.Thread(target=answer).start()
+        address, port = server.getsockname()
+        self.assertTrue(readiness.ssh_ready(address, port))
+        # accepted by the kernel, but no banner ever comes
+        self.assertFalse(readiness.ssh_ready(address, port, timeout=0.1))
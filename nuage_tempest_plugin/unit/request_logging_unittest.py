@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import six
+import testtools
+
+from nuage_tempest_plugin.lib.utils import request_logging
+
+# run me as :
+# $ python -m testtools.run \
+#     nuage_tempest_plugin/unit/request_logging_unittest.py
+
+
+class _Unserializable(object):
+
+    def __str__(self):
+        return 'unserializable ' * 10
+
+
+class RequestLoggingUnitTest(testtools.TestCase):
+
+    def test_truncated_text(self):
+        self.assertEqual(('', False), request_logging.truncated_text(None))
+        self.assertEqual((u'h\xe9', False), request_logging.truncated_text(
+            u'h\xe9'.encode('utf8')))
+        self.assertEqual(('abc', True),
+                         request_logging.truncated_text('abcdef', 3))
+        text, truncated = request_logging.truncated_text(
+            [{'ID': i} for i in range(100000)], 20)
+        self.assertEqual(('[{"ID": 0}, {"ID": 1', True),
+                         (text, truncated))
+        self.assertEqual(('unserializable', True),
+                         request_logging.truncated_text(
+                             _Unserializable(), 14))
+
+    def test_large_bodies_sampled_once(self):
+        bodies = [request_logging.LazyBody('x' * 20, maxlen=10,
+                                           sample_rate=3)
+                  for _ in range(6)]
+        renders = [str(body) for body in bodies]
+        self.assertEqual(renders, [str(body) for body in bodies])
+        self.assertEqual(2, renders.count('x' * 10))
+        # small bodies always make it
+        self.assertEqual('small', str(request_logging.LazyBody(
+            'small', maxlen=10, sample_rate=3)))
+
+    def test_one_in_rate_large_responses_logged(self):
+        logged = []
+        for _ in range(40):
+            # small requests along with large responses
+            for body in ('{"name": "subnet"}', '[' + 'x' * 40 + ']'):
+                logged.append(six.text_type(request_logging.LazyBody(
+                    body, maxlen=20, sample_rate=10)))
+        responses = logged[1::2]
+        self.assertEqual(4, len([r for r in responses
+                                 if r == '[' + 'x' * 19]))
+        self.assertEqual(36, responses.count(u'<large body not sampled>'))
+        self.assertEqual(['{"name": "subnet"}'] * 40, logged[::2])
+
+    def test_non_ascii(self):
+        body = request_logging.LazyBody(u'{"name": "caf\xe9"}'.encode('utf8'))
+        self.assertEqual(u'{"name": "caf\xe9"}', six.text_type(body))
+        record = logging.LogRecord('test', logging.INFO, __file__, 0,
+                                   u'RSP %s', (body,), None)
+        self.assertIn(u'caf\xe9', logging.Formatter().format(record))
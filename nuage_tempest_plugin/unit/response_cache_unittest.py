@@ -0,0 +1,63 @@
+import time
+
+import testtools
+
+from nuage_tempest_plugin.lib.utils import response_cache
+
+# run me as :
+# $ python -m testtools.run \
+#     nuage_tempest_plugin/unit/response_cache_unittest.py
+
+
+class ResponseCacheUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ResponseCacheUnitTest, self).setUp()
+        self.cache = response_cache.ResponseCache(
+            max_bytes=1000, default_ttl=60, ttls={'vports': 0})
+
+    def test_keyed_by_filter_and_copied(self):
+        headers = {'X-Nuage-Filter': "name IS 'a'"}
+        self.cache.put('/domains', headers, [{'name': 'a'}], {})
+        self.assertIsNone(self.cache.get('/domains'))
+        data, _ = self.cache.get('/domains',
+                                 {'x-nuage-filter': "name IS 'a'"})
+        data[0]['name'] = 'changed'
+        self.assertEqual([{'name': 'a'}],
+                         self.cache.get('/domains', headers)[0])
+        stats = self.cache.stats()
+        self.assertEqual((2, 1), (stats['hits'], stats['misses']))
+
+    def test_ttl_and_lru_eviction(self):
+        self.cache.put('/domains/1/vports', None, [], {})
+        self.assertIsNone(self.cache.get('/domains/1/vports'))
+        self.cache.ttls['zones'] = 0.01
+        self.cache.put('/zones', None, [], {})
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get('/zones'))
+        for i in range(20):
+            self.cache.put('/domains/%d' % i, None, ['x' * 90], {})
+            self.cache.get('/domains/0')
+        self.assertIsNotNone(self.cache.get('/domains/0'))
+        self.assertIsNone(self.cache.get('/domains/1'))
+        self.assertLessEqual(self.cache.stats()['bytes'], 1000)
+
+    def test_write_invalidation(self):
+        for path in ('/enterprises/e/domains', '/domains/d',
+                     '/domains/d/zones', '/zones/z', '/enterprises/e'):
+            self.cache.put(path, None, [], {})
+        self.cache.invalidate('/domains/d')
+        self.assertIsNone(self.cache.get('/enterprises/e/domains'))
+        self.assertIsNone(self.cache.get('/domains/d'))
+        self.assertIsNone(self.cache.get('/domains/d/zones'))
+        self.assertIsNotNone(self.cache.get('/zones/z'))
+        self.assertIsNotNone(self.cache.get('/enterprises/e'))
+
+    def test_delete_invalidation(self):
+        for path in ('/domains/d', '/zones/z', '/enterprises/e'):
+            self.cache.put(path, None, [], {})
+        # zone z may have been deleted along with its domain
+        self.cache.invalidate('/domains/d?responseChoice=1', 'DELETE')
+        for path in ('/domains/d', '/zones/z', '/enterprises/e'):
+            self.assertIsNone(self.cache.get(path))
+        self.assertEqual(0, self.cache.stats()['bytes'])
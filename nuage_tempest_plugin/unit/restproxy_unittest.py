@@ -0,0 +1,352 @@
+import os
+import socket
+import time
+
+import fixtures
+from six.moves import http_client as httpclient
+import testtools
+
+from nuage_tempest_plugin.lib.utils import cassette
+from nuage_tempest_plugin.lib.utils import fake_vsd
+from nuage_tempest_plugin.lib.utils import restproxy
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/restproxy_unittest.py
+
+
+class FakeConnection(object):
+
+    def __init__(self):
+        self.sock, self.peer = socket.socketpair()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        self.sock.close()
+        self.peer.close()
+
+
+class DeadConnection(object):
+    """Keep-alive connection the server closed while it was idle"""
+
+    def __init__(self, fail_on_request=False):
+        self.fail_on_request = fail_on_request
+        self.requests = 0
+
+    def request(self, *args):
+        self.requests += 1
+        if self.fail_on_request:
+            raise socket.error('broken pipe')
+
+    def getresponse(self):
+        raise httpclient.BadStatusLine('')
+
+    def close(self):
+        pass
+
+
+class ConnectionPoolUnitTest(testtools.TestCase):
+
+    def test_reuse_and_counters(self):
+        pool = restproxy.HTTPConnectionPool(FakeConnection, maxsize=1)
+        conn, reused = pool.get()
+        self.assertFalse(reused)
+        pool.put(conn)
+        again, reused = pool.get()
+        self.assertTrue(reused)
+        self.assertIs(conn, again)
+        self.assertEqual({'hits': 1, 'misses': 1, 'stale': 0, 'idle': 0},
+                         pool.stats())
+        again.close()
+
+    def test_bounded(self):
+        pool = restproxy.HTTPConnectionPool(FakeConnection, maxsize=1)
+        first, _ = pool.get()
+        second, _ = pool.get()
+        pool.put(first)
+        pool.put(second)
+        self.assertTrue(second.closed)
+        self.assertEqual(1, pool.stats()['idle'])
+        pool.clear()
+        self.assertTrue(first.closed)
+
+    def test_stale_socket_is_replaced(self):
+        pool = restproxy.HTTPConnectionPool(FakeConnection, maxsize=1)
+        conn, _ = pool.get()
+        pool.put(conn)
+        conn.peer.close()  # server side hangs up
+        fresh, reused = pool.get()
+        self.assertFalse(reused)
+        self.assertIsNot(conn, fresh)
+        self.assertTrue(conn.closed)
+        self.assertEqual(1, pool.stats()['stale'])
+        fresh.close()
+
+    def test_idle_timeout(self):
+        pool = restproxy.HTTPConnectionPool(FakeConnection, maxsize=1,
+                                            idle_timeout=-1)
+        conn, _ = pool.get()
+        pool.put(conn)
+        _, reused = pool.get()
+        self.assertFalse(reused)
+        self.assertTrue(conn.closed)
+
+
+class RetryPolicyUnitTest(testtools.TestCase):
+
+    def test_capped_full_jitter(self):
+        policy = restproxy.RetryPolicy(max_retries=10, base_delay=1,
+                                       max_delay=4,
+                                       stats=restproxy.RetryStats())
+        for attempt in range(8):
+            delay = policy.delay(attempt)
+            self.assertTrue(0 <= delay <= min(4, 2 ** attempt))
+
+    def test_retry_after_and_exhaustion(self):
+        stats = restproxy.RetryStats()
+        policy = restproxy.RetryPolicy(max_retries=2, base_delay=0.01,
+                                       stats=stats)
+        now = time.time()
+        self.assertEqual(3, policy.backoff(0, now, retry_after='3'))
+        self.assertIsNone(policy.backoff(1, now))
+        self.assertEqual(1, stats.as_dict()['retry_after_honoured'])
+
+    def test_deadline(self):
+        stats = restproxy.RetryStats()
+        policy = restproxy.RetryPolicy(deadline=1, stats=stats)
+        self.assertIsNone(policy.backoff(0, time.time(), retry_after='5'))
+        self.assertEqual(1, stats.as_dict()['deadline_exceeded'])
+        self.assertEqual(0, stats.as_dict()['retries'])
+
+
+class APIKeyCacheUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(APIKeyCacheUnitTest, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'keys.json')
+
+    def test_shared_through_file(self):
+        writer = restproxy.APIKeyCache(self.path)
+        with writer.locked():
+            self.assertIsNone(writer.get('user@csp'))
+            writer.put('user@csp', 'key', time.time() + 3600)
+        reader = restproxy.APIKeyCache(self.path)
+        with reader.locked():
+            self.assertEqual('key', reader.get('user@csp')[0])
+
+    def test_private_to_user(self):
+        writer = restproxy.APIKeyCache(self.path)
+        with writer.locked():
+            writer.put('user@csp', 'key', None)
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+        os.chmod(self.path, 0o644)
+        with writer.locked():
+            self.assertIsNone(restproxy.APIKeyCache(self.path).get(
+                'user@csp'))
+        os.chmod(self.path, 0o600)
+        uid = os.getuid()
+        self.useFixture(fixtures.MonkeyPatch('os.getuid', lambda: uid + 1))
+        with writer.locked():
+            self.assertIsNone(restproxy.APIKeyCache(self.path).get(
+                'user@csp'))
+
+    def test_relative_path_in_private_dir(self):
+        self.useFixture(fixtures.MonkeyPatch(
+            'tempfile.tempdir', self.useFixture(fixtures.TempDir()).path))
+        cache = restproxy.APIKeyCache('keys.json')
+        self.assertEqual(restproxy.user_private_dir(),
+                         os.path.dirname(cache.path))
+        self.assertEqual(0o700, os.stat(os.path.dirname(cache.path))
+                         .st_mode & 0o777)
+
+    def test_refreshed_ahead_of_expiry(self):
+        cache = restproxy.APIKeyCache(self.path, refresh_margin=60)
+        with cache.locked():
+            cache.put('user@csp', 'key', time.time() + 30)
+            self.assertIsNone(cache.get('user@csp'))
+
+    def test_invalidate_keeps_newer_key(self):
+        cache = restproxy.APIKeyCache(self.path)
+        with cache.locked():
+            cache.put('user@csp', 'new', None)
+        cache.invalidate('user@csp', 'old')
+        with cache.locked():
+            self.assertEqual(('new', None), cache.get('user@csp'))
+        cache.invalidate('user@csp', 'new')
+        with cache.locked():
+            self.assertIsNone(cache.get('user@csp'))
+
+
+class CassetteUnitTest(testtools.TestCase):
+
+    def test_record_and_replay(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'cassette.json.gz')
+        recorder = cassette.Cassette(path, cassette.RECORD)
+        headers = {'X-Nuage-Filter': "name IS 'a'",
+                   'Authorization': 'secret'}
+        for data in ([{'ID': 1}], [{'ID': 2}]):
+            recorder.record('GET', '/domains', None, headers,
+                            restproxy.RESTResponse(
+                                200, 'OK', data, {'X-Nuage-Count': '1',
+                                                  'Set-Cookie': 'x'}))
+        recorder.save()
+
+        player = cassette.Cassette(path, cassette.REPLAY)
+        # authorization is not part of the match
+        headers = {'x-nuage-filter': "name IS 'a'"}
+        self.assertEqual((200, 'OK', [{'ID': 1}], {'X-Nuage-Count': '1'}),
+                         player.play('GET', '/domains', None, headers))
+        self.assertEqual([{'ID': 2}],
+                         player.play('GET', '/domains', None, headers)[2])
+        self.assertEqual([{'ID': 2}],
+                         player.play('GET', '/domains', None, headers)[2])
+        self.assertRaises(cassette.CassetteMiss, player.play,
+                          'GET', '/domains', None)
+
+    def test_replay_with_other_ids(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'cassette.json.gz')
+
+        def run(tape, enterprise_id, port_id, suffix, domain_id=None,
+                zone_id=None):
+            """Creates a domain and looks up its zone, as a test would"""
+            external_id = port_id + '@cms'
+            name = 'tempest-domain-' + suffix
+            request = ('POST', '/enterprises/%s/domains' % enterprise_id,
+                       {'name': name, 'externalID': external_id})
+            response = restproxy.RESTResponse(
+                201, 'Created', [{'ID': domain_id, 'name': name,
+                                  'externalID': external_id}])
+            if tape.replaying:
+                domain = tape.play(*request)[2][0]
+            else:
+                tape.record(*(request + (None, response)))
+                domain = response.data[0]
+            request = ('GET', '/domains/%s/zones' % domain['ID'], None,
+                       {'X-Nuage-Filter': "externalID IS '%s'" %
+                                          external_id})
+            response = restproxy.RESTResponse(
+                200, 'OK', [{'ID': zone_id, 'parentID': domain['ID']}])
+            if tape.replaying:
+                zone = tape.play(*request)[2][0]
+            else:
+                tape.record(*(request + (response,)))
+                zone = response.data[0]
+            return domain, zone
+
+        recorder = cassette.Cassette(path, cassette.RECORD)
+        run(recorder, '0c9b5a4e-0d3a-4a43-8a4b-1b1c7f3a1d01',
+            '3f6e3c0a-5b8e-4d6f-9a3e-7a2b1c4d5e02', '1234567',
+            domain_id='9e1d2c3b-4a5f-4e6d-8c7b-6a5f4e3d2c03',
+            zone_id='5a4b3c2d-1e0f-4a9b-8c7d-6e5f4a3b2c04')
+        recorder.save()
+
+        player = cassette.Cassette(path, cassette.REPLAY)
+        port_id = 'b1a2c3d4-e5f6-4a7b-8c9d-0e1f2a3b4c05'
+        domain, zone = run(player, 'c2b3a4d5-e6f7-4b8a-9d0c-1f2e3d4c5b06',
+                           port_id, '7654321')
+        self.assertEqual('tempest-domain-7654321', domain['name'])
+        self.assertEqual(port_id + '@cms', domain['externalID'])
+        # IDs first seen in a response are new, and consistent
+        self.assertNotEqual('9e1d2c3b-4a5f-4e6d-8c7b-6a5f4e3d2c03',
+                            domain['ID'])
+        self.assertEqual(domain['ID'], zone['parentID'])
+        self.assertRaises(cassette.CassetteMiss, player.play,
+                          'GET', '/domains/%s/zones' % domain['ID'], None,
+                          {'X-Nuage-Filter': "externalID IS 'other@cms'"})
+
+
+class FakeVSDUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(FakeVSDUnitTest, self).setUp()
+        self.vsd = fake_vsd.FakeVSD().start()
+        self.addCleanup(self.vsd.stop)
+        self.proxy = restproxy.RESTProxyServer(
+            self.vsd.address, self.vsd.base_uri, False, 'csproot:csproot',
+            '/me', 'csp', 5, api_key_cache=restproxy.APIKeyCache(),
+            retry_policy=restproxy.RetryPolicy(
+                max_retries=10, base_delay=0.001,
+                stats=restproxy.RetryStats()))
+        self.proxy.generate_nuage_auth()
+
+    def test_filters_and_paging(self):
+        zone = self.vsd.store.create('zones', {'name': 'zone'})
+        for i in range(5):
+            self.proxy.rest_call('POST', '/zones/%s/subnets' % zone['ID'],
+                                 {'name': 'subnet-%d' % i, 'index': i})
+        resp = self.proxy.rest_call(
+            'GET', '/subnets', None,
+            {'X-Nuage-Filter': "(name IS 'subnet-1' OR name == \"sub'net\") "
+                               "OR index > 3"})
+        self.assertEqual(['subnet-1', 'subnet-4'],
+                         [s['name'] for s in resp.data])
+        resp = self.proxy.rest_call(
+            'GET', '/zones/%s/subnets' % zone['ID'], None,
+            {'X-Nuage-Page': '2', 'X-Nuage-PageSize': '2'})
+        self.assertEqual(['subnet-4'], [s['name'] for s in resp.data])
+        self.assertEqual('5', resp.headers['X-Nuage-Count'])
+
+    def test_in_use_and_injected_errors(self):
+        domain = self.vsd.store.create('domains', {'name': 'domain'})
+        self.vsd.store.create('vports', {}, 'domains', domain['ID'])
+        self.vsd.error_rate = 0.5
+        self.vsd.random.seed(7)
+        resp = self.proxy.rest_call('DELETE', '/domains/' + domain['ID'],
+                                    None)
+        self.assertEqual(409, resp.status)
+        self.assertIn(b'domain is in use', resp.data)
+        resp = self.proxy.rest_call(
+            'DELETE', '/domains/%s?responseChoice=1' % domain['ID'], None)
+        self.assertEqual(204, resp.status)
+        self.assertNotIn(domain['ID'], self.vsd.store.objects)
+        # the seed makes the injected errors, and so the retries, fixed
+        self.assertEqual(self.vsd.injected_errors,
+                         self.proxy.retry_policy.stats.retries)
+        self.assertEqual(3, self.vsd.injected_errors)
+
+    def test_only_idempotent_requests_replayed(self):
+        zone = self.vsd.store.create('zones', {'name': 'zone'})
+        uri = self.vsd.base_uri + '/zones/%s/subnets' % zone['ID']
+        dead = DeadConnection()
+        self.proxy.pool.get = lambda: (dead, True)
+        # the POST may have been executed, so it is not sent again
+        self.assertRaises(restproxy.RequestSentError, self.proxy._send,
+                          'POST', uri, '{"name": "subnet"}', {})
+        _, response, _ = self.proxy._send('GET', uri, None, {})
+        self.assertEqual(200, response.status)
+        # as is a POST which never made it out
+        dead = DeadConnection(fail_on_request=True)
+        _, response, _ = self.proxy._send('POST', uri, '{"name": "s"}', {})
+        self.assertEqual(201, response.status)
+        self.assertEqual(1, len(self.vsd.store.list('subnets')))
+
+    def test_post_not_resent_once_sent(self):
+        zone = self.vsd.store.create('zones', {'name': 'zone'})
+        respond = self.vsd._respond
+
+        def drop_post_responses(request, *args, **kwargs):
+            if request.command == 'POST':
+                request.close_connection = True
+            else:
+                respond(request, *args, **kwargs)
+
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.lib.utils.fake_vsd.FakeVSD._respond',
+            staticmethod(drop_post_responses)))
+        resource = '/zones/%s/subnets' % zone['ID']
+        # over a reused keep-alive connection and over a fresh one
+        for reuse in (True, False):
+            self.proxy.pool.clear()
+            if reuse:
+                self.proxy.rest_call('GET', resource, None)
+            posts = self.vsd.requests.get(('POST', 'subnets'), 0)
+            self.assertRaises(restproxy.RequestSentError,
+                              self.proxy.rest_call, 'POST', resource,
+                              {'name': 'subnet'})
+            self.assertEqual(posts + 1,
+                             self.vsd.requests[('POST', 'subnets')])
+        self.assertEqual(2, len(self.vsd.store.list('subnets')))
+        self.assertEqual(0, self.proxy.retry_policy.stats.retries)
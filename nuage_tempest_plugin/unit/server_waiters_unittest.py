@@ -0,0 +1,78 @@
+import fixtures
+import testtools
+
+from tempest import exceptions
+from tempest.lib import exceptions as lib_exc
+
+from nuage_tempest_plugin.lib.test import server_waiters
+
+# run me as :
+# $ python -m testtools.run \
+#     nuage_tempest_plugin/unit/server_waiters_unittest.py
+
+
+class _ServersClient(object):
+    """servers_client stub listing, per poll, the next of statuses
+
+    :param statuses: per poll, dict of server ID to status, or to None for
+    a server which is not listed
+    """
+
+    build_timeout = 60
+    build_interval = 1
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.polls = 0
+
+    def list_servers(self, detail=False):
+        assert detail
+        statuses = self.statuses[min(self.polls, len(self.statuses) - 1)]
+        self.polls += 1
+        servers = []
+        for server_id, status in sorted(statuses.items()):
+            if status is None:
+                continue
+            server = {'id': server_id, 'status': status}
+            if status == 'ERROR':
+                server['fault'] = 'no valid host'
+            servers.append(server)
+        return {'servers': servers}
+
+
+class WaitForServersStatusUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(WaitForServersStatusUnitTest, self).setUp()
+        self.clock = [0]
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.lib.test.server_waiters.time.time',
+            lambda: self.clock[0]))
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.lib.test.server_waiters.time.sleep',
+            self._sleep))
+
+    def _sleep(self, seconds):
+        self.clock[0] += seconds
+
+    def test_active(self):
+        client = _ServersClient([{'a': 'BUILD', 'b': 'BUILD'},
+                                 {'a': 'ACTIVE', 'b': 'BUILD'},
+                                 {'a': 'ACTIVE', 'b': 'ACTIVE'}])
+        self.assertEqual({}, server_waiters.wait_for_servers_status(
+            client, ['a', 'b'], 'ACTIVE'))
+        self.assertEqual(3, client.polls)
+
+    def test_failures(self):
+        client = _ServersClient([{'a': 'BUILD', 'b': 'BUILD', 'c': 'BUILD',
+                                  'd': 'BUILD'},
+                                 {'a': 'ERROR', 'b': None, 'c': 'ACTIVE',
+                                  'd': 'BUILD'}])
+        errors = server_waiters.wait_for_servers_status(
+            client, ['a', 'b', 'c', 'd'], 'ACTIVE')
+        self.assertEqual(['a', 'b', 'd'], sorted(errors))
+        self.assertIsInstance(errors['a'], exceptions.BuildErrorException)
+        self.assertIsInstance(errors['b'], lib_exc.NotFound)
+        self.assertIsInstance(errors['d'], lib_exc.TimeoutException)
+        # the missing server failed right away, the building one timed out
+        self.assertEqual(client.build_timeout, self.clock[0])
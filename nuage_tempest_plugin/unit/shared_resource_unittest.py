@@ -0,0 +1,46 @@
+import testtools
+
+from nuage_tempest_plugin.lib.utils import shared_resource
+
+# run me as :
+# $ python -m testtools.run \
+#     nuage_tempest_plugin/unit/shared_resource_unittest.py
+
+
+class SharedResourceUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(SharedResourceUnitTest, self).setUp()
+        self.log = []
+
+    def _create(self, add_cleanup):
+        self.log.append('create network')
+        add_cleanup(self.log.append, 'delete network')
+        self.log.append('create router')
+        add_cleanup(self.log.append, 'delete router')
+        return len(self.log)
+
+    def test_created_once_torn_down_after_last_release(self):
+        shared = shared_resource.SharedResource(self._create)
+        resources = [shared.acquire() for _ in range(3)]
+        self.assertEqual([resources[0]] * 3, resources)
+        shared.release()
+        shared.release()
+        self.assertEqual(2, len(self.log))
+        shared.release()
+        self.assertEqual(['create network', 'create router',
+                          'delete router', 'delete network'], self.log)
+        self.assertRaises(RuntimeError, shared.release)
+        shared.acquire()
+        self.assertEqual(2, shared.created)
+
+    def test_failed_create_cleaned_up(self):
+        def create(add_cleanup):
+            self._create(add_cleanup)
+            raise ValueError('no router interface')
+
+        shared = shared_resource.SharedResource(create)
+        self.assertRaises(ValueError, shared.acquire)
+        self.assertEqual(['create network', 'create router',
+                          'delete router', 'delete network'], self.log)
+        self.assertEqual(0, shared.users)
@@ -0,0 +1,38 @@
+import testtools
+
+from nuage_tempest_plugin.lib.utils import vsd_ancestry
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/vsd_ancestry_unittest.py
+
+
+class AncestorIndexUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(AncestorIndexUnitTest, self).setUp()
+        self.index = vsd_ancestry.AncestorIndex()
+        self.index.add('d', 'domain', 'e', 'enterprise')
+        self.index.add('z', 'zone', 'd', 'domain')
+        self.index.add('s', 'subnet', 'z', 'zone')
+
+    def test_ancestor(self):
+        self.assertEqual('d', self.index.ancestor('s', 'domain'))
+        self.assertEqual('e', self.index.ancestor('s', 'enterprise'))
+        self.assertIsNone(self.index.ancestor('s', 'l2domain'))
+        self.assertIsNone(self.index.ancestor('x', 'domain'))
+        self.assertEqual(('enterprise', None, None), self.index.get('e'))
+
+    def test_invalidate_drops_descendants(self):
+        self.index.add('v', 'vport', 's', 'subnet')
+        self.index.invalidate('z')
+        for gone in ('z', 's', 'v'):
+            self.assertIsNone(self.index.get(gone))
+        self.assertEqual('e', self.index.ancestor('d', 'enterprise'))
+
+    def test_bounded(self):
+        index = vsd_ancestry.AncestorIndex(max_entries=2)
+        index.add('z', 'zone', 'd', 'domain')
+        index.add('s', 'subnet', 'z', 'zone')
+        self.assertEqual(2, len(index))
+        self.assertIsNone(index.get('d'))
+        self.assertEqual(1, index.stats()['evictions'])
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from tempest.lib import exceptions
+import testtools
+
+from nuage_tempest_plugin.lib.utils import fake_vsd
+from nuage_tempest_plugin.lib.utils import restproxy
+from nuage_tempest_plugin.lib.utils import vsd_events
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/vsd_events_unittest.py
+
+
+class VSDEventsUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(VSDEventsUnitTest, self).setUp()
+        self.vsd = fake_vsd.FakeVSD(event_timeout=1).start()
+        self.addCleanup(self.vsd.stop)
+        self.domain = self.vsd.store.create('domains', {'name': 'domain'})
+        proxy = restproxy.RESTProxyServer(
+            self.vsd.address, self.vsd.base_uri, False, 'csproot:csproot',
+            '/me', 'csp', 5, api_key_cache=restproxy.APIKeyCache(),
+            retry_policy=restproxy.RetryPolicy(max_retries=1))
+        proxy.generate_nuage_auth()
+        self.subscriber = vsd_events.VSDEventSubscriber(
+            proxy, reconnect_delay=0.1).start()
+        self.addCleanup(self.subscriber.stop)
+
+    def _vports(self):
+        return self.vsd.store.list('vports', self.domain['ID'])
+
+    def _create_vport_later(self, delay):
+        timer = threading.Timer(delay, self.vsd.store.create,
+                                ('vports', {}, 'domains', self.domain['ID']))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+    def test_woken_up_by_event(self):
+        vsd_events.wait_until(lambda: self.subscriber.connected, 5,
+                              interval=0.01)
+        self._create_vport_later(0.2)
+        start = time.time()
+        self.assertEqual(1, len(vsd_events.wait_until(
+            self._vports, 5, ['vport'], interval=10,
+            subscriber=self.subscriber)))
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual(1, self.subscriber.stats()['events'])
+
+    def test_events_of_other_types_are_ignored(self):
+        vsd_events.wait_until(lambda: self.subscriber.connected, 5,
+                              interval=0.01)
+        since = self.subscriber.sequence
+        self.vsd.store.create('zones', {}, 'domains', self.domain['ID'])
+        self.assertFalse(self.subscriber.wait(since, ['vport'], 0.5))
+        self.assertTrue(self.subscriber.wait(since, ['zone'], 5))
+
+    def test_polling_fallback_and_timeout(self):
+        self._create_vport_later(0.1)
+        self.assertTrue(vsd_events.wait_until(self._vports, 5,
+                                              interval=0.05))
+        self.assertRaises(exceptions.TimeoutException,
+                          vsd_events.wait_until, lambda: False, 0.1,
+                          interval=0.05)
+
+    def test_entity_types(self):
+        self.assertEqual('vminterface',
+                         vsd_events.entity_type('vminterfaces'))
+        self.assertEqual('policies', vsd_events.resource_name('policy'))
+        self.assertEqual('vports', vsd_events.resource_name('vport'))
@@ -0,0 +1,43 @@
+import testtools
+
+from nuage_tempest_plugin.lib.utils import fake_vsd
+from nuage_tempest_plugin.lib.utils import vsd_filter
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/vsd_filter_unittest.py
+
+
+class VSDFilterUnitTest(testtools.TestCase):
+
+    def test_rendering_and_escaping(self):
+        expression = (vsd_filter.Eq('type', 'VM') &
+                      (vsd_filter.Eq('name', 'say "hi" \\o/') |
+                       vsd_filter.Gt('index', 3)))
+        self.assertEqual(
+            'type IS "VM" AND (name IS "say \\"hi\\" \\\\o/" OR index > 3)',
+            str(expression))
+        match = fake_vsd.Predicate(str(expression))
+        self.assertTrue(match({'type': 'VM', 'name': 'say "hi" \\o/'}))
+        self.assertFalse(match({'type': 'VM', 'name': 'say hi'}))
+
+    def test_abstract_base(self):
+        self.assertRaises(TypeError, vsd_filter.Filter)
+
+        class Raw(vsd_filter.Filter):
+            def render(self):
+                return 'name IS "a"'
+
+        self.assertEqual('name IS "a" OR name IS "a"', str(Raw() | Raw()))
+
+    def test_split(self):
+        ids = ['id-%02d' % i for i in range(40)]
+        expression = vsd_filter.Eq('type', 'VM') & vsd_filter.In('ID', ids)
+        chunks = expression.split(max_len=200)
+        self.assertGreater(len(chunks), 1)
+        matched = []
+        for chunk in chunks:
+            self.assertLessEqual(len(str(chunk)), 200)
+            match = fake_vsd.Predicate(str(chunk))
+            matched.extend(i for i in ids if match({'type': 'VM', 'ID': i}))
+        self.assertEqual(ids, matched)
+        self.assertEqual([expression], expression.split(max_len=10000))
@@ -0,0 +1,190 @@
+from bambou import NURESTSession
+import fixtures
+import testtools
+
+from nuage_tempest_plugin.lib.test import vsd_helper
+from nuage_tempest_plugin.lib.utils import vsd_ancestry
+from nuage_tempest_plugin.unit import fake_vsd_fixture
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/vsd_helper_unittest.py
+
+
+class VsdHelperTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(VsdHelperTestCase, self).setUp()
+        self.fixture = self.useFixture(
+            fake_vsd_fixture.FakeVSDFixture(use_ssl=True))
+        self.vsd = self.fixture.vsd
+        self.sessions = vsd_helper.VSDSessionPool()
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.lib.test.vsd_helper.vsd_sessions',
+            self.sessions))
+        self.useFixture(fixtures.MonkeyPatch(
+            'bambou.NURESTSession.current_session', None))
+
+    def _logins(self):
+        return self.vsd.requests.get(('GET', 'me'), 0)
+
+
+class VSDSessionUnitTest(VsdHelperTestCase):
+
+    def test_session_shared_on_the_rest_client_api_key(self):
+        helper = vsd_helper.VsdHelper(self.vsd.address)
+        created_before = vsd_helper.VsdHelper(self.vsd.address)
+        logins = self._logins()
+        session = helper.session()
+        self.assertEqual(logins, self._logins())
+        self.assertEqual(helper.nuage_rest_client.restproxy.api_key,
+                         session.root_object.api_key)
+        created_after = vsd_helper.VsdHelper(self.vsd.address)
+        logins = self._logins()
+        self.assertIs(session, created_after.session())
+        self.assertIs(session, created_before.session())
+        self.assertEqual(logins, self._logins())
+        self.assertIs(helper.get_default_enterprise(),
+                      created_before.get_default_enterprise())
+        self.assertEqual({'sessions': 1, 'logins': 0, 'reused': 1,
+                          'api_keys_reused': 1}, self.sessions.stats())
+
+    def test_login_of_other_user(self):
+        helper = vsd_helper.VsdHelper(self.vsd.address, user='admin',
+                                      password='admin')
+        logins = self._logins()
+        self.assertIsNotNone(helper.session().root_object.api_key)
+        self.assertEqual(logins + 1, self._logins())
+        self.assertEqual(1, self.sessions.stats()['logins'])
+
+    def test_made_current_again(self):
+        helper = vsd_helper.VsdHelper(self.vsd.address)
+        session = helper.session()
+        NURESTSession.current_session = None
+        logins = self._logins()
+        self.assertIs(session, helper.session())
+        self.assertTrue(session.is_current_session())
+        self.assertEqual(logins, self._logins())
+
+
+class ResolvePortsUnitTest(VsdHelperTestCase):
+
+    def setUp(self):
+        super(ResolvePortsUnitTest, self).setUp()
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.lib.test.vsd_helper.VsdHelper.cms_id',
+            'cms'))
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.lib.test.vsd_helper.vsd_ancestors',
+            vsd_ancestry.AncestorIndex()))
+        self.helper = vsd_helper.VsdHelper(self.vsd.address)
+        store = self.vsd.store
+        enterprise_id = self.fixture.netpartition['ID']
+        self.l2domain = store.create('l2domains', {}, 'enterprises',
+                                     enterprise_id)
+        self.domain = store.create('domains', {}, 'enterprises',
+                                   enterprise_id)
+        self.zone = store.create('zones', {}, 'domains', self.domain['ID'])
+        self.subnet = store.create('subnets', {}, 'zones', self.zone['ID'])
+        self.vports = {}
+        self.vm_interfaces = {}
+        self.policy_decisions = {}
+        # port-1 on the l2domain, port-2 on the subnet, both with a VM
+        # interface; port-3 on the l2domain without
+        for port_id, parent_type, parent in (
+                ('port-1', 'l2domains', self.l2domain),
+                ('port-2', 'subnets', self.subnet),
+                ('port-3', 'l2domains', self.l2domain)):
+            external_id = self.helper.external_id(port_id)
+            self.vports[port_id] = store.create(
+                'vports', {'externalID': external_id}, parent_type,
+                parent['ID'])
+            if port_id == 'port-3':
+                continue
+            decision = store.create('policydecisions', {})
+            self.policy_decisions[port_id] = decision
+            vm_interface = self._create_vm_interface(
+                port_id, parent_type, parent,
+                policyDecisionID=decision['ID'])
+            store.create('dhcpoptions', {'type': '0' + port_id[-1]},
+                         'vminterfaces', vm_interface['ID'])
+
+    def _create_vm_interface(self, port_id, parent_type, parent,
+                             **attributes):
+        l2 = parent_type == 'l2domains'
+        attributes.update({
+            'externalID': self.helper.external_id(port_id),
+            'attachedNetworkID': parent['ID'],
+            'attachedNetworkType': 'L2DOMAIN' if l2 else 'SUBNET',
+            'domainID': parent['ID'] if l2 else self.domain['ID']})
+        vm_interface = self.vsd.store.create('vminterfaces', attributes)
+        self.vm_interfaces[port_id] = vm_interface
+        return vm_interface
+
+    def _count_requests(self):
+        self.helper.session()
+        before = dict(self.vsd.requests)
+
+        def requests(resource):
+            return (self.vsd.requests.get(('GET', resource), 0) -
+                    before.get(('GET', resource), 0))
+        return requests
+
+    def test_resolve_ports(self):
+        requests = self._count_requests()
+
+        l2domain = self.helper.vspk.NUL2Domain(id=self.l2domain['ID'])
+        resolved = self.helper.resolve_ports(
+            ['port-1', 'port-2', 'port-3', 'port-4'], l2domain=l2domain,
+            policy_decisions=True, dhcp_options=True)
+        for port_id in ('port-1', 'port-2'):
+            port = resolved[port_id]
+            self.assertEqual(self.vports[port_id]['ID'], port.vport.id)
+            self.assertEqual(self.vm_interfaces[port_id]['ID'],
+                             port.vm_interface.id)
+            self.assertEqual(self.policy_decisions[port_id]['ID'],
+                             port.policy_decision.id)
+            self.assertEqual(['0' + port_id[-1]],
+                             [option.type for option in port.dhcp_options])
+        # without VM interface, the vport is looked up in the l2domain
+        self.assertEqual(self.vports['port-3']['ID'],
+                         resolved['port-3'].vport.id)
+        self.assertIsNone(resolved['port-3'].vm_interface)
+        self.assertIsNone(resolved['port-3'].policy_decision)
+        unknown = resolved['port-4']
+        self.assertEqual((None, None, None, None),
+                         (unknown.vport, unknown.vm_interface,
+                          unknown.policy_decision, unknown.dhcp_options))
+        # one batch of VM interfaces, one of vports per parent
+        self.assertEqual(1, requests('vminterfaces'))
+        # the l2domain and the L3 domain
+        self.assertEqual(2, requests('vports'))
+        self.assertEqual(2, requests('policydecisions'))
+        self.assertEqual(2, requests('dhcpoptions'))
+        # the vports found are remembered where they are in the tree
+        self.assertEqual(
+            ('vport', self.subnet['ID'], 'subnet'),
+            vsd_helper.vsd_ancestors.get(self.vports['port-2']['ID']))
+
+    def test_one_get_per_batch(self):
+        # 4 ports per filter, i.e. 3 batches of the 12 ports below
+        self.useFixture(fixtures.MonkeyPatch(
+            'nuage_tempest_plugin.lib.topology.Topology.vsd_filter_max_len',
+            130))
+        other_subnet = self.vsd.store.create('subnets', {}, 'zones',
+                                             self.zone['ID'])
+        port_ids = ['port-%d' % i for i in range(10, 22)]
+        for i, port_id in enumerate(port_ids):
+            parent = self.subnet if i % 2 else other_subnet
+            self.vports[port_id] = self.vsd.store.create(
+                'vports', {'externalID': self.helper.external_id(port_id)},
+                'subnets', parent['ID'])
+            self._create_vm_interface(port_id, 'subnets', parent)
+        requests = self._count_requests()
+        resolved = self.helper.resolve_ports(port_ids)
+        self.assertEqual([self.vports[port_id]['ID'] for port_id in port_ids],
+                         [resolved[port_id].vport.id for port_id in port_ids])
+        # per batch, whichever subnet of the domain the ports are in
+        self.assertEqual(3, requests('vminterfaces'))
+        self.assertEqual(3, requests('vports'))
+        self.assertEqual(0, requests('policydecisions'))
+        self.assertEqual(0, requests('dhcpoptions'))
@@ -0,0 +1,48 @@
+import random
+
+import testtools
+
+from nuage_tempest_plugin.lib.utils import vsd_metrics
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/vsd_metrics_unittest.py
+
+
+class VSDMetricsUnitTest(testtools.TestCase):
+
+    def test_normalize_path(self):
+        self.assertEqual(
+            '/domains/{id}/vports',
+            vsd_metrics.normalize_path(
+                '/domains/7f5c1c2a-1b2c-4d5e-8f90-0123456789ab/vports'
+                '?responseChoice=1'))
+        self.assertEqual('/me', vsd_metrics.normalize_path('/me'))
+
+    def test_percentiles(self):
+        histogram = vsd_metrics.Histogram()
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000.0)
+        for percent, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+            self.assertAlmostEqual(expected, histogram.percentile(percent),
+                                   delta=expected * 0.004)
+        self.assertEqual(1.0, histogram.percentile(100))
+
+    def test_relative_error(self):
+        rng = random.Random(0)
+        values = sorted(rng.uniform(0.0001, 100) for _ in range(1000))
+        histogram = vsd_metrics.Histogram()
+        for value in values:
+            histogram.record(value)
+        for percent in range(1, 100):
+            expected = values[int(percent * len(values) / 100.0) - 1]
+            self.assertAlmostEqual(expected, histogram.percentile(percent),
+                                   delta=expected * 0.004)
+
+    def test_registry(self):
+        registry = vsd_metrics.MetricsRegistry()
+        registry.record('get', '/domains/1/vports', 0.1)
+        registry.record('GET', '/domains/2/vports', 0.3, error=True)
+        stats = registry.as_dict()['GET /domains/{id}/vports']
+        self.assertEqual(2, stats['count'])
+        self.assertEqual(1, stats['errors'])
+        self.assertAlmostEqual(0.4, stats['total'])
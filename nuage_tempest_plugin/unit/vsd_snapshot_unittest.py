@@ -0,0 +1,79 @@
+import testtools
+
+from nuage_tempest_plugin.lib.utils import exceptions
+from nuage_tempest_plugin.lib.utils import fake_vsd
+from nuage_tempest_plugin.lib.utils import restproxy
+from nuage_tempest_plugin.lib.utils import vsd_snapshot
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/vsd_snapshot_unittest.py
+
+
+class _Client(object):
+    """The part of NuageRestClient a DomainSnapshot uses"""
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+
+    def _call(self, method, res_path, extra_headers):
+        resp = self.proxy.rest_call(method, res_path, None,
+                                    extra_headers=extra_headers)
+        if resp.status == 404:
+            raise exceptions.NotFound(resp.data)
+        return resp
+
+    def iter_pages(self, res_path, extra_headers=None):
+        return iter(self._call('GET', res_path, extra_headers).data or [])
+
+    def count(self, res_path, extra_headers=None):
+        headers = self._call('HEAD', res_path, extra_headers).headers
+        return int(dict((k.lower(), v) for k, v in headers.items())
+                   .get('x-nuage-count', 0))
+
+
+class DomainSnapshotUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(DomainSnapshotUnitTest, self).setUp()
+        self.vsd = fake_vsd.FakeVSD().start()
+        self.addCleanup(self.vsd.stop)
+        store = self.vsd.store
+        self.domain = store.create('domains', {'name': 'domain'})
+        zone = store.create('zones', {}, 'domains', self.domain['ID'])
+        self.subnet = store.create('subnets', {'externalID': 'net@cms'},
+                                   'zones', zone['ID'])
+        self.other_subnet = store.create('subnets', {}, 'zones', zone['ID'])
+        self.vport = store.create('vports', {'externalID': 'port@cms'},
+                                  'subnets', self.subnet['ID'])
+        self.acl = store.create('ingressacltemplates', {},
+                                'domains', self.domain['ID'])
+        store.create('ingressaclentrytemplates', {'action': 'FORWARD'},
+                     'ingressacltemplates', self.acl['ID'])
+        proxy = restproxy.RESTProxyServer(
+            self.vsd.address, self.vsd.base_uri, False, 'csproot:csproot',
+            '/me', 'csp', 5, api_key_cache=restproxy.APIKeyCache())
+        proxy.generate_nuage_auth()
+        self.snapshot = vsd_snapshot.DomainSnapshot(
+            _Client(proxy), 'domains', self.domain['ID']).load()
+
+    def test_load(self):
+        snapshot = self.snapshot
+        self.assertEqual(self.vport['ID'],
+                         snapshot.by_external_id('port@cms')[0]['ID'])
+        self.assertEqual('subnets', snapshot.type_of(self.subnet['ID']))
+        self.assertEqual(1, len(snapshot.children(
+            self.acl['ID'], 'ingressaclentrytemplates')))
+        self.assertEqual(1, len(snapshot.find(
+            'ingressaclentrytemplates', action='FORWARD')))
+
+    def test_refresh(self):
+        store = self.vsd.store
+        store.update('vports', self.vport['ID'], {'name': 'renamed'})
+        store.create('ingressaclentrytemplates', {'action': 'DROP'},
+                     'ingressacltemplates', self.acl['ID'])
+        store.delete('subnets', self.other_subnet['ID'])
+        self.snapshot.refresh()
+        self.assertIsNone(self.snapshot.get(self.other_subnet['ID']))
+        self.assertEqual('renamed',
+                         self.snapshot.get(self.vport['ID'])['name'])
+        self.assertEqual(2, len(self.snapshot.children(self.acl['ID'])))
@@ -0,0 +1,66 @@
+import threading
+
+import testtools
+
+from nuage_tempest_plugin.lib.utils import vsd_teardown
+
+# run me as :
+# $ python -m testtools.run nuage_tempest_plugin/unit/vsd_teardown_unittest.py
+
+
+class VSDTeardownUnitTest(testtools.TestCase):
+
+    def setUp(self):
+        super(VSDTeardownUnitTest, self).setUp()
+        self.deleted = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.zones_in_flight = threading.Event()
+
+    def delete(self, obj_id):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            if self.in_flight == 4:
+                self.zones_in_flight.set()
+        if obj_id.startswith('z'):
+            # held until all zones are being deleted
+            self.zones_in_flight.wait(5)
+        with self.lock:
+            self.in_flight -= 1
+            self.deleted.append(obj_id)
+
+    def test_children_and_users_first_in_parallel(self):
+        teardown = vsd_teardown.VSDTeardown()
+        teardown.add({'ID': 'template'}, self.delete, 'template')
+        for i in range(4):
+            teardown.add({'ID': 'd%d' % i, 'templateID': 'template'},
+                         self.delete, 'domain')
+            teardown.add({'ID': 'z%d' % i, 'parentID': 'd%d' % i},
+                         self.delete, 'zone')
+        report = teardown.run()
+        self.assertEqual('template', self.deleted[-1])
+        for i in range(4):
+            self.assertLess(self.deleted.index('z%d' % i),
+                            self.deleted.index('d%d' % i))
+        # the zones in parallel, but nothing along with them
+        self.assertTrue(self.zones_in_flight.is_set())
+        self.assertEqual(4, self.peak)
+        self.assertEqual(['zone', 'domain', 'template'],
+                         [label.split()[0]
+                          for label, _ in report.critical_path])
+
+    def test_failure_skips_dependants(self):
+        def fail(obj_id):
+            raise ValueError(obj_id)
+
+        teardown = vsd_teardown.VSDTeardown()
+        teardown.add({'ID': 'domain'}, self.delete)
+        teardown.add({'ID': 'zone', 'parentID': 'domain'}, fail)
+        teardown.add({'ID': 'other'}, self.delete)
+        error = self.assertRaises(ValueError, teardown.run)
+        report = error.teardown_report
+        self.assertEqual(['object other'], report.deleted)
+        self.assertEqual(['object domain'], report.skipped)
+        self.assertEqual(['other'], self.deleted)